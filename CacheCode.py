@@ -0,0 +1,324 @@
+# -*- coding: utf-8 -*-
+# ==============================================================================
+# TÍTULO: CACHÉ DE ESCENARIOS PARA LOS SLIDERS DISCRETOS
+# ==============================================================================
+"""
+Caché de Escenarios (Equilibrios e Imágenes)
+
+Cada slider de los dashboards tiene mínimo, máximo y paso fijos, así que el
+conjunto de estados posibles es finito. Este módulo cuantiza el estado de los
+sliders a una tupla de índices y la usa como clave para guardar tanto el
+equilibrio calculado como la imagen PNG ya codificada:
+
+* En memoria, con una caché LRU limitada por un presupuesto de bytes.
+* Opcionalmente en disco: los equilibrios de toda la malla como arreglos
+  '.npy' abiertos con 'mmap_mode' y las imágenes en un único paquete binario
+  con un índice de desplazamientos.
+"""
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 1: IMPORTACIÓN DE LIBRERÍAS
+# ------------------------------------------------------------------------------
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from ModelCode import (DOMINIOS_BIENES, DOMINIOS_DINERO, valores_dominio,
+                       equilibrio_mercado_bienes, equilibrio_mercado_dinero)
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 2: DESCRIPCIÓN DE LOS MERCADOS
+# ------------------------------------------------------------------------------
+# Para cada mercado: dominios de los sliders (en el orden de los argumentos),
+# función de equilibrio y variables que devuelve.
+MERCADOS = {
+    'bienes': (DOMINIOS_BIENES, equilibrio_mercado_bienes, ('alpha', 'A', 'Y_eq')),
+    'dinero': (DOMINIOS_DINERO, equilibrio_mercado_dinero, ('Ms_real', 'i_eq')),
+}
+
+
+def cuantizar(estado, dominios):
+    """
+    Convierte los valores de los sliders en una tupla de índices de la malla.
+
+    Devuelve None si algún valor cae fuera del dominio o no coincide con un
+    paso del slider (ese estado no se puede guardar en la caché).
+    """
+    indices = []
+    for valor, (minimo, maximo, paso) in zip(estado, dominios.values()):
+        posicion = (valor - minimo) / paso
+        indice = int(round(posicion))
+        n = int(round((maximo - minimo) / paso)) + 1
+        if abs(posicion - indice) > 1e-6 or not 0 <= indice < n:
+            return None
+        indices.append(indice)
+    return tuple(indices)
+
+
+def forma_malla(dominios):
+    """Número de valores de cada slider, es decir, la forma de la malla completa."""
+    return tuple(len(valores_dominio(d)) for d in dominios.values())
+
+
+def opciones_imagen(figsize=(10, 7), dpi=100, formato='png'):
+    """
+    Opciones de render que forman parte de la clave de una imagen: el mismo
+    estado a otro tamaño, dpi o formato es otra imagen.
+
+    Returns:
+        tuple: (formato, ancho, alto, dpi), con el tamaño en pulgadas.
+    """
+    ancho, alto = figsize
+    return (formato, round(float(ancho), 4), round(float(alto), 4), round(float(dpi), 4))
+
+
+def _etiqueta(opciones):
+    # Sufijo de los archivos del almacén para unas opciones de render.
+    formato, ancho, alto, dpi = opciones
+    return f'{formato}_{ancho:g}x{alto:g}_{dpi:g}'
+
+
+def _tamano(valor):
+    # Estimación del espacio que ocupa una entrada de la caché.
+    if isinstance(valor, (bytes, bytearray)):
+        return len(valor)
+    if isinstance(valor, np.ndarray):
+        return valor.nbytes
+    if isinstance(valor, dict):
+        return sys.getsizeof(valor) + sum(_tamano(v) for v in valor.values())
+    return sys.getsizeof(valor)
+
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 3: CACHÉ LRU EN MEMORIA CON PRESUPUESTO DE BYTES
+# ------------------------------------------------------------------------------
+class CacheLRU:
+    """
+    Caché LRU que expulsa las entradas menos usadas cuando el total de bytes
+    supera 'max_bytes'. Es segura para usarse desde el hilo del planificador.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._datos = OrderedDict()
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.expulsiones = 0
+
+    def __len__(self):
+        return len(self._datos)
+
+    def obtener(self, clave):
+        """Devuelve el valor guardado (y lo marca como reciente) o None."""
+        with self._lock:
+            if clave not in self._datos:
+                self.fallos += 1
+                return None
+            self._datos.move_to_end(clave)
+            self.aciertos += 1
+            return self._datos[clave][0]
+
+    def guardar(self, clave, valor):
+        """Inserta o reemplaza una entrada y expulsa las más antiguas si hace falta."""
+        tamano = _tamano(valor)
+        if tamano > self.max_bytes:
+            return
+        with self._lock:
+            if clave in self._datos:
+                self.bytes -= self._datos.pop(clave)[1]
+            self._datos[clave] = (valor, tamano)
+            self.bytes += tamano
+            while self.bytes > self.max_bytes:
+                _, (_, tamano_viejo) = self._datos.popitem(last=False)
+                self.bytes -= tamano_viejo
+                self.expulsiones += 1
+
+    def estadisticas(self):
+        """Contadores de aciertos, fallos y expulsiones, y ocupación actual."""
+        return {'aciertos': self.aciertos, 'fallos': self.fallos,
+                'expulsiones': self.expulsiones, 'entradas': len(self._datos),
+                'bytes': self.bytes, 'max_bytes': self.max_bytes}
+
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 4: ALMACÉN PRECALCULADO EN DISCO
+# ------------------------------------------------------------------------------
+# Estructura del directorio para un mercado 'm':
+#   m_<variable>.npy         -> equilibrio en toda la malla (forma de la malla)
+#   m_imagenes_<opciones>.bin         -> imágenes concatenadas
+#   m_imagenes_<opciones>_indice.npy  -> (n_estados, 2) int64: desplazamiento y
+#                                        longitud de cada imagen; longitud -1
+#                                        si no se generó.
+# '<opciones>' identifica formato, tamaño y dpi (p. ej. 'png_10x7_100'), así
+# que paquetes con distintas opciones de render conviven en el directorio.
+def precalcular_equilibrios(directorio, mercado):
+    """
+    Resuelve el mercado en todos los estados posibles de los sliders con una
+    sola llamada vectorizada y guarda cada variable como arreglo '.npy'.
+    """
+    dominios, funcion, variables = MERCADOS[mercado]
+    os.makedirs(directorio, exist_ok=True)
+    ejes = np.meshgrid(*(valores_dominio(d) for d in dominios.values()),
+                       indexing='ij', sparse=True)
+    equilibrio = funcion(*ejes)
+    for variable in variables:
+        np.save(os.path.join(directorio, f'{mercado}_{variable}.npy'), equilibrio[variable])
+
+
+def precalcular_imagenes(directorio, mercado, render, opciones, estados=None):
+    """
+    Genera el paquete de imágenes de un mercado.
+
+    Args:
+        render (callable): Recibe una tupla de valores de los sliders y
+                           devuelve los bytes de la imagen.
+        opciones (tuple): Opciones con que 'render' dibuja (ver
+                          'opciones_imagen'); identifican el paquete.
+        estados (iterable): Tuplas de valores a renderizar. Por defecto se
+                            recorre la malla completa.
+
+    Las imágenes se escriben a disco a medida que se generan, de modo que la
+    memoria no crece con el número de estados.
+    """
+    dominios = MERCADOS[mercado][0]
+    forma = forma_malla(dominios)
+    if estados is None:
+        ejes = [valores_dominio(d) for d in dominios.values()]
+        estados = (tuple(float(e[i]) for e, i in zip(ejes, idx)) for idx in np.ndindex(*forma))
+
+    os.makedirs(directorio, exist_ok=True)
+    indice = np.full((int(np.prod(forma)), 2), -1, dtype=np.int64)
+    base = os.path.join(directorio, f'{mercado}_imagenes_{_etiqueta(opciones)}')
+    with open(base + '.bin', 'wb') as paquete:
+        for estado in estados:
+            clave = cuantizar(estado, dominios)
+            if clave is None:
+                continue
+            png = render(estado)
+            indice[np.ravel_multi_index(clave, forma)] = (paquete.tell(), len(png))
+            paquete.write(png)
+    np.save(base + '_indice.npy', indice)
+
+
+class AlmacenEscenarios:
+    """Lectura del almacén en disco mediante arreglos mapeados en memoria."""
+
+    def __init__(self, directorio, mercado):
+        dominios, _, variables = MERCADOS[mercado]
+        self.forma = forma_malla(dominios)
+        self.equilibrios = {}
+        for variable in variables:
+            ruta = os.path.join(directorio, f'{mercado}_{variable}.npy')
+            if os.path.exists(ruta):
+                self.equilibrios[variable] = np.load(ruta, mmap_mode='r')
+
+        self.directorio = directorio
+        self.mercado = mercado
+        # Paquetes de imágenes abiertos, por opciones de render: (índice, datos) o None.
+        self._paquetes = {}
+
+    def equilibrio(self, clave):
+        if len(self.equilibrios) == 0:
+            return None
+        return {v: float(arr[clave]) for v, arr in self.equilibrios.items()}
+
+    def _paquete(self, opciones):
+        if opciones not in self._paquetes:
+            base = os.path.join(self.directorio, f'{self.mercado}_imagenes_{_etiqueta(opciones)}')
+            paquete = None
+            if (os.path.exists(base + '_indice.npy') and os.path.exists(base + '.bin')
+                    and os.path.getsize(base + '.bin') > 0):
+                paquete = (np.load(base + '_indice.npy', mmap_mode='r'),
+                           np.memmap(base + '.bin', dtype=np.uint8, mode='r'))
+            self._paquetes[opciones] = paquete
+        return self._paquetes[opciones]
+
+    def imagen(self, clave, opciones):
+        paquete = self._paquete(opciones)
+        if paquete is None:
+            return None
+        indice, datos = paquete
+        inicio, longitud = indice[np.ravel_multi_index(clave, self.forma)]
+        if longitud < 0:
+            return None
+        return datos[inicio:inicio + longitud].tobytes()
+
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 5: CACHÉ COMBINADA (MEMORIA + DISCO)
+# ------------------------------------------------------------------------------
+class CacheEscenarios:
+    """
+    Caché de equilibrios e imágenes para un mercado ('bienes' o 'dinero').
+
+    Primero consulta la LRU en memoria, luego el almacén en disco (si se
+    indicó 'directorio') y, para los equilibrios, en último caso los calcula.
+
+    Args:
+        mercado (str): 'bienes' o 'dinero'.
+        max_bytes (int): Presupuesto de la LRU en memoria.
+        directorio (str): Directorio con el almacén precalculado (opcional).
+    """
+
+    def __init__(self, mercado, max_bytes=64 * 1024 * 1024, directorio=None):
+        if mercado not in MERCADOS:
+            raise ValueError(f"Mercado desconocido: {mercado!r}. Use 'bienes' o 'dinero'.")
+        self.mercado = mercado
+        self.dominios, self._funcion, _ = MERCADOS[mercado]
+        self.memoria = CacheLRU(max_bytes)
+        self.disco = AlmacenEscenarios(directorio, mercado) if directorio else None
+        self.aciertos_disco = 0
+        self.calculos = 0
+
+    def equilibrio(self, estado):
+        """Equilibrio del estado de los sliders como diccionario de floats."""
+        clave = cuantizar(estado, self.dominios)
+        if clave is not None:
+            guardado = self.memoria.obtener(('eq', clave))
+            if guardado is not None:
+                return guardado
+            if self.disco is not None:
+                guardado = self.disco.equilibrio(clave)
+                if guardado is not None:
+                    self.aciertos_disco += 1
+                    self.memoria.guardar(('eq', clave), guardado)
+                    return guardado
+
+        self.calculos += 1
+        resultado = {v: float(a) for v, a in self._funcion(*estado).items()}
+        if clave is not None:
+            self.memoria.guardar(('eq', clave), resultado)
+        return resultado
+
+    def obtener_imagen(self, estado, opciones):
+        """
+        Imagen ya renderizada para el estado con las 'opciones' de render
+        dadas (ver 'opciones_imagen'), o None si no está en la caché.
+        """
+        clave = cuantizar(estado, self.dominios)
+        if clave is None:
+            return None
+        png = self.memoria.obtener(('img', opciones, clave))
+        if png is None and self.disco is not None:
+            png = self.disco.imagen(clave, opciones)
+            if png is not None:
+                self.aciertos_disco += 1
+                self.memoria.guardar(('img', opciones, clave), png)
+        return png
+
+    def guardar_imagen(self, estado, png, opciones):
+        """Guarda en memoria la imagen renderizada para el estado y las opciones."""
+        clave = cuantizar(estado, self.dominios)
+        if clave is not None:
+            self.memoria.guardar(('img', opciones, clave), png)
+
+    def estadisticas(self):
+        """Contadores de la LRU más los aciertos en disco y los cálculos."""
+        resultado = self.memoria.estadisticas()
+        resultado.update(aciertos_disco=self.aciertos_disco, calculos=self.calculos)
+        return resultado
@@ -1,4 +1,3 @@
-
 # -*- coding: utf-8 -*-
 # ==============================================================================
 # TÍTULO: MERCADO DE BIENES (CRUZ KEYNESIANA)
@@ -14,23 +13,983 @@ observar su impacto en el Ingreso de Equilibrio de forma interactiva.
 # ------------------------------------------------------------------------------
 # SECCIÓN 1: IMPORTACIÓN DE LIBRERÍAS
 # ------------------------------------------------------------------------------
-# Se importan las librerías necesarias para los cálculos numéricos (numpy),
-# la creación de gráficos (matplotlib) y los componentes interactivos (ipywidgets).
-import numpy as np
-import matplotlib.pyplot as plt
-import ipywidgets as widgets
-from IPython.display import display
+# Al importar este módulo solo se cargan librerías estándar. Las librerías
+# pesadas (numpy, matplotlib, ipywidgets e IPython) se importan la primera vez
+# que se construye un dashboard, mediante '_cargar_dependencias()'.
+import io
+import json
+import threading
+import time
+from collections import deque
+
+_DEPENDENCIAS_CARGADAS = False
+_INTERFAZ_CARGADA = False
+
+
+def _cargar_dependencias(interfaz=True):
+    """
+    Importa las librerías de cálculo, gráficos y widgets una sola vez por
+    kernel y las publica como variables globales del módulo ('np', 'plt',
+    'widgets', ...), de modo que el resto del código las usa como si se
+    hubieran importado al inicio.
+
+    Con 'interfaz=False' no se importan ipywidgets ni IPython (p. ej. en los
+    procesos de render por lotes de 'RenderCode.py').
+    """
+    global _DEPENDENCIAS_CARGADAS, _INTERFAZ_CARGADA
+    global np, matplotlib, plt, Figure, FigureCanvasAgg, widgets, display
+    global C0_BASE, C1_BASE, K_BASE, H_BASE, B_BASE, MODELO_PARAMS, crear_grafo_is_lm
+    global equilibrio_mercado_bienes, demanda_agregada, equilibrio_mercado_dinero, demanda_dinero
+    global calcular_modelo, curva_uip, curva_dd, curva_aa, demanda_agregada_abierta, simular_ajuste
+    if not _DEPENDENCIAS_CARGADAS:
+        import numpy as np
+        import matplotlib
+        import matplotlib.pyplot as plt
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        # La matemática de los modelos vive en 'ModelCode.py', sin widgets ni gráficos.
+        from ModelCode import (C0_BASE, C1_BASE, K_BASE, H_BASE, B_BASE, MODELO_PARAMS,
+                               crear_grafo_is_lm,
+                               equilibrio_mercado_bienes, demanda_agregada,
+                               equilibrio_mercado_dinero, demanda_dinero,
+                               calcular_modelo, curva_uip, curva_dd, curva_aa,
+                               demanda_agregada_abierta, simular_ajuste)
+
+        _DEPENDENCIAS_CARGADAS = True
+
+    if interfaz and not _INTERFAZ_CARGADA:
+        import ipywidgets as widgets
+        from IPython.display import display
+
+        _INTERFAZ_CARGADA = True
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 1.1: FIGURA PERSISTENTE PARA EL MODO RÁPIDO
+# ------------------------------------------------------------------------------
+# En el modo 'rapido' la figura y los ejes se crean una sola vez. Todo lo que no
+# cambia con los sliders (rejilla, línea de 45°, etiquetas, límites fijos y
+# leyenda) se rasteriza como "fondo", y en cada tick solo se actualizan los
+# artistas dinámicos con 'set_data' y blitting.
+class _FiguraPersistente:
+    """
+    Figura de matplotlib reutilizable entre ticks de los sliders.
+
+    Si el backend activo es interactivo (ipympl, '%matplotlib widget') el lienzo
+    se muestra directamente como widget y se usa su blitting nativo. En
+    cualquier otro caso se dibuja con Agg fuera de pantalla y el resultado se
+    envía como PNG a un 'widgets.Image'.
+
+    Con 'interfaz=False' la figura siempre es Agg, no crea widgets ni publica
+    nada: el resultado se lee con 'exportar()' (render por lotes).
+
+    Con 'nrows'/'ncols' mayores que 1, 'ax' es el arreglo de ejes (paneles) y
+    cada panel puede redibujarse por separado (ver 'actualizar').
+    """
+
+    def __init__(self, figsize=(10, 7), dpi=None, interfaz=True, nrows=1, ncols=1):
+        _cargar_dependencias(interfaz)
+        backend = matplotlib.get_backend().lower()
+        self.interfaz = interfaz
+        self.interactivo = interfaz and ('ipympl' in backend or 'widget' in backend)
+        if self.interactivo:
+            with plt.ioff():
+                self.fig, self.ax = plt.subplots(nrows, ncols, figsize=figsize, dpi=dpi)
+            self.widget = self.fig.canvas
+        else:
+            self.fig = Figure(figsize=figsize, dpi=dpi)
+            FigureCanvasAgg(self.fig)
+            self.ax = self.fig.subplots(nrows, ncols)
+            self.widget = widgets.Image(format='png') if interfaz else None
+        self.canvas = self.fig.canvas
+        self.blitting = getattr(self.canvas, 'supports_blit', False)
+
+        self.dinamicos = []
+        self.fondo = None
+        # Artistas dinámicos y fondo de cada panel (eje) registrado por separado.
+        self.paneles = {}
+        self.fondos_panel = {}
+        self.ultima_imagen = None
+
+        # Latencia de cada tick en milisegundos (las últimas 200).
+        self.latencias = deque(maxlen=200)
+        self.etiqueta_latencia = widgets.Label("") if interfaz else None
+
+        # Si el lienzo se vuelve a dibujar completo (p. ej. al cambiar de
+        # tamaño en ipympl), el fondo guardado deja de ser válido.
+        self.canvas.mpl_connect('draw_event', self._capturar_fondo)
+
+    def registrar_dinamicos(self, artistas, panel=None):
+        """
+        Marca los artistas que cambian en cada tick (se excluyen del fondo).
+
+        Si se indica 'panel' (el eje al que pertenecen), esos artistas se
+        pueden redibujar sin tocar el resto de la figura.
+        """
+        for artista in artistas:
+            artista.set_animated(self.blitting)
+        self.dinamicos.extend(artistas)
+        if panel is not None:
+            self.paneles.setdefault(panel, []).extend(artistas)
+
+    def terminar_fondo(self):
+        """Ajusta el layout una única vez y rasteriza el fondo estático."""
+        self.fig.tight_layout()
+        self.canvas.draw()
+
+    def _capturar_fondo(self, event):
+        if self.blitting:
+            self.fondo = self.canvas.copy_from_bbox(self.fig.bbox)
+            self.fondos_panel = {panel: self.canvas.copy_from_bbox(self._region(panel))
+                                 for panel in self.paneles}
+
+    def _region(self, panel):
+        # Celda de la grilla de subplots que ocupa el panel, incluidos su
+        # título y sus etiquetas.
+        from matplotlib.transforms import Bbox
+        spec = panel.get_subplotspec()
+        grilla = spec.get_gridspec()
+        filas, columnas = grilla.get_geometry()
+        ancho, alto = self.fig.bbox.width, self.fig.bbox.height
+        return Bbox.from_extents(ancho * spec.colspan.start / columnas,
+                                 alto * (1 - spec.rowspan.stop / filas),
+                                 ancho * spec.colspan.stop / columnas,
+                                 alto * (1 - spec.rowspan.start / filas))
+
+    def actualizar(self, cancelado=None, medicion=None, paneles=None):
+        """
+        Redibuja solo los artistas dinámicos y publica el resultado.
+
+        'cancelado' es una función opcional sin argumentos; si devuelve True
+        después de dibujar, se omite la codificación y publicación porque ya
+        existe un estado más reciente pendiente de render. 'medicion' es la
+        medición del tick en curso (ver 'Instrumentacion'), si la hay.
+        'paneles' limita el redibujado a esos ejes (registrados con
+        'registrar_dinamicos'); el resto de la figura conserva el último tick.
+        """
+        inicio = time.perf_counter()
+        if self.blitting and self.fondo is not None and paneles is not None:
+            for panel in paneles:
+                self.canvas.restore_region(self.fondos_panel[panel])
+                for artista in self.paneles[panel]:
+                    self.fig.draw_artist(artista)
+                if self.interactivo:
+                    self.canvas.blit(self._region(panel))
+        elif self.blitting and self.fondo is not None:
+            self.canvas.restore_region(self.fondo)
+            for artista in self.dinamicos:
+                self.fig.draw_artist(artista)
+            if self.interactivo:
+                self.canvas.blit(self.fig.bbox)
+        elif self.interactivo:
+            self.canvas.draw_idle()
+        else:
+            self.canvas.draw()
+        if medicion is not None:
+            medicion.marca('dibujo')
+
+        if cancelado is not None and cancelado():
+            return
+        if self.widget is not None and not self.interactivo:
+            self.ultima_imagen = self._codificar_png()
+            if medicion is not None:
+                medicion.marca('codificacion')
+            self.widget.value = self.ultima_imagen
+            if medicion is not None:
+                medicion.marca('salida')
+        self._registrar_latencia(inicio)
+
+    def publicar(self, png, medicion=None):
+        """Muestra un PNG ya renderizado (p. ej. servido desde la caché)."""
+        inicio = time.perf_counter()
+        self.ultima_imagen = png
+        self.widget.value = png
+        if medicion is not None:
+            medicion.marca('salida')
+        self._registrar_latencia(inicio, origen="caché")
+
+    def _registrar_latencia(self, inicio, origen=None):
+        latencia = (time.perf_counter() - inicio) * 1000
+        self.latencias.append(latencia)
+        if self.etiqueta_latencia is not None:
+            sufijo = f" ({origen})" if origen else ""
+            self.etiqueta_latencia.value = f"Redibujado: {latencia:.1f} ms{sufijo}"
+
+    def exportar(self, formato='png'):
+        """
+        Devuelve el último render en 'formato' (sin publicarlo).
+
+        'png' y 'rgba' (bytes crudos del buffer de Agg, para video) leen el
+        buffer ya compuesto por 'actualizar()'. Los formatos vectoriales
+        ('svg', 'pdf') requieren un dibujo completo con 'savefig', para el que
+        los artistas dinámicos dejan de ser animados temporalmente.
+        """
+        if formato == 'png':
+            return self._codificar_png()
+        if formato == 'rgba':
+            return bytes(self.canvas.buffer_rgba())
+        for artista in self.dinamicos:
+            artista.set_animated(False)
+        try:
+            buffer = io.BytesIO()
+            self.fig.savefig(buffer, format=formato)
+            return buffer.getvalue()
+        finally:
+            for artista in self.dinamicos:
+                artista.set_animated(self.blitting)
+            # 'savefig' dispara 'draw_event' con los dinámicos incluidos; el
+            # fondo se vuelve a capturar sin ellos.
+            if self.blitting:
+                self.canvas.draw()
+
+    def _codificar_png(self):
+        # Se codifica directamente el buffer de Agg: 'savefig' volvería a
+        # dibujar la figura completa y anularía el blitting.
+        from PIL import Image
+        rgba = np.asarray(self.canvas.buffer_rgba())
+        buffer = io.BytesIO()
+        Image.fromarray(rgba).convert('RGB').save(buffer, format='png', compress_level=1)
+        return buffer.getvalue()
+
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 1.2: PLANIFICADOR DE RENDERS (AGRUPACIÓN DE EVENTOS)
+# ------------------------------------------------------------------------------
+# Al arrastrar un slider, 'observe' dispara un evento por cada valor intermedio.
+# El planificador guarda solo el último estado, limita la frecuencia de renders
+# y los ejecuta fuera del manejador de mensajes del kernel.
+class _PlanificadorRender:
+    """
+    Agrupa ráfagas de eventos en un único render del estado más reciente.
+
+    Args:
+        render (callable): Función 'render(estado, cancelado)'. 'cancelado' es
+                           una función sin argumentos que devuelve True si el
+                           estado quedó obsoleto durante el render.
+        max_fps (float): Frecuencia máxima de renders por segundo.
+        ejecutor (str): 'asyncio' (tarea en el event loop del kernel),
+                        'hilo' (hilo de trabajo) o 'auto' (asyncio si hay un
+                        event loop en ejecución; si no, un hilo).
+        permitir_hilo (bool): False si el render debe correr en el hilo del
+                        kernel (p. ej. el modo 'clasico', que dibuja dentro
+                        de un widget 'Output': su captura no es fiable desde
+                        otro hilo). Entonces 'hilo' no se acepta y 'auto',
+                        sin event loop, renderiza en el mismo llamador.
+    """
+
+    def __init__(self, render, max_fps=30, ejecutor='auto', permitir_hilo=True):
+        if ejecutor not in ('auto', 'asyncio', 'hilo'):
+            raise ValueError(f"Ejecutor desconocido: {ejecutor!r}. Use 'auto', 'asyncio' o 'hilo'.")
+        if ejecutor == 'hilo' and not permitir_hilo:
+            raise ValueError("Este render debe correr en el hilo del kernel "
+                             "(el modo 'clasico' dibuja en un widget Output); use 'asyncio' o 'auto'.")
+        if max_fps <= 0:
+            raise ValueError("'max_fps' debe ser positivo.")
+        self.render = render
+        self.intervalo = 1.0 / max_fps
+        self.ejecutor = ejecutor
+        self.permitir_hilo = permitir_hilo
+
+        self._lock = threading.Lock()
+        self._estado = None
+        self._generacion = 0
+        self._ultimo_render = 0.0
+
+        # Estado de cada ejecutor (se inicializa en el primer evento).
+        self._pendiente = None   # asyncio.TimerHandle programado
+        self._hilo = None
+        self._despertar = threading.Event()
+
+        # Contadores para diagnosticar la agrupación.
+        self.eventos = 0
+        self.renders = 0
+
+    def solicitar(self, estado):
+        """Registra un nuevo estado; el render se agenda sin bloquear al llamador."""
+        with self._lock:
+            self._estado = estado
+            self._generacion += 1
+            self.eventos += 1
+
+        if self.ejecutor == 'auto':
+            import asyncio
+            try:
+                asyncio.get_running_loop()
+                self.ejecutor = 'asyncio'
+            except RuntimeError:
+                self.ejecutor = 'hilo' if self.permitir_hilo else 'directo'
+
+        if self.ejecutor == 'asyncio':
+            self._agendar_asyncio()
+        elif self.ejecutor == 'hilo':
+            self._agendar_hilo()
+        else:
+            # Sin event loop ni hilo permitido: se renderiza aquí mismo.
+            self._ejecutar()
+
+    def obsoleto(self, generacion):
+        """Indica si llegó un estado más nuevo que 'generacion'."""
+        return generacion != self._generacion
+
+    def _espera(self):
+        return max(0.0, self._ultimo_render + self.intervalo - time.monotonic())
+
+    def _ejecutar(self):
+        with self._lock:
+            estado, generacion = self._estado, self._generacion
+        try:
+            self.render(estado, lambda: self.obsoleto(generacion))
+        except Exception:
+            import traceback
+            traceback.print_exc()
+        finally:
+            self._ultimo_render = time.monotonic()
+            self.renders += 1
+
+    # --- Ejecutor asyncio: un único TimerHandle pendiente a la vez ---
+    def _agendar_asyncio(self):
+        if self._pendiente is not None:
+            return  # Ya hay un render agendado; leerá el estado más reciente.
+        import asyncio
+        loop = asyncio.get_running_loop()
+        self._pendiente = loop.call_later(self._espera(), self._tick_asyncio)
+
+    def _tick_asyncio(self):
+        self._pendiente = None
+        generacion = self._generacion
+        self._ejecutar()
+        # Si llegaron eventos durante el render, se agenda uno más.
+        if self.obsoleto(generacion):
+            self._agendar_asyncio()
+
+    # --- Ejecutor de hilo: un hilo daemon que duerme hasta el próximo evento ---
+    def _agendar_hilo(self):
+        if self._hilo is None:
+            self._hilo = threading.Thread(target=self._bucle_hilo, daemon=True,
+                                          name='planificador-render')
+            self._hilo.start()
+        self._despertar.set()
+
+    def _bucle_hilo(self):
+        while True:
+            self._despertar.wait()
+            # Se respeta la frecuencia máxima; los eventos que lleguen mientras
+            # tanto se agrupan en el mismo render.
+            time.sleep(self._espera())
+            self._despertar.clear()
+            self._ejecutar()
+
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 1.3: CONTENIDO DE LA FIGURA PERSISTENTE
+# ------------------------------------------------------------------------------
+# El dashboard en modo 'rapido' y el render por lotes ('RenderCode.py') dibujan
+# exactamente la misma gráfica a partir de estas funciones.
+def preparar_figura_bienes(figura):
+    """
+    Dibuja el fondo estático de la Cruz Keynesiana en una '_FiguraPersistente'.
+
+    Returns:
+        callable: 'actualizar(estado, eq)', que mueve la curva DA, el punto de
+                  equilibrio, las guías y el título. 'estado' es la tupla
+                  (g0, t1, i0, nx0) y 'eq' el resultado de
+                  'equilibrio_mercado_bienes' para ese estado.
+    """
+    Y_MAX_FIJO = 2500
+    Y_range = np.linspace(0, Y_MAX_FIJO, 100)
+
+    ax = figura.ax
+    ax.plot(Y_range, Y_range, color='black', linestyle='--', alpha=0.7, label='Y = DA (Condición de Equilibrio)')
+    linea_da, = ax.plot([], [], color='deepskyblue', linewidth=3, label='Gasto Agregado (DA)')
+    punto_eq, = ax.plot([], [], 'o', color='red', markersize=10, label='Punto de Equilibrio')
+    guia_v, = ax.plot([], [], color='red', linestyle=':', alpha=0.8)
+    guia_h, = ax.plot([], [], color='red', linestyle=':', alpha=0.8)
+    ax.set_title(" ", fontsize=16)
+    ax.set_xlabel("Ingreso / Producción (Y)", fontsize=12)
+    ax.set_ylabel("Gasto Agregado (DA)", fontsize=12)
+    ax.grid(True, linestyle=':', alpha=0.6)
+    ax.legend(loc="upper left")
+    ax.set_xlim(left=0, right=Y_MAX_FIJO)
+    ax.set_ylim(bottom=0, top=Y_MAX_FIJO)
+    figura.registrar_dinamicos([linea_da, punto_eq, guia_v, guia_h, ax.title])
+    figura.terminar_fondo()
+
+    def actualizar(estado, eq):
+        t1 = estado[1]
+        alpha, A, Y_eq = float(eq['alpha']), float(eq['A']), float(eq['Y_eq'])
+        linea_da.set_data(Y_range, demanda_agregada(Y_range, A, C1_BASE, t1))
+        punto_eq.set_data([Y_eq], [Y_eq])
+        guia_v.set_data([Y_eq, Y_eq], [0, Y_eq])
+        guia_h.set_data([0, Y_eq], [Y_eq, Y_eq])
+        ax.set_title(f"Multiplicador: {alpha:.2f} | Ingreso de Equilibrio: {Y_eq:.1f}", fontsize=16)
+
+    return actualizar
+
+
+def preparar_figura_dinero(figura):
+    """
+    Dibuja el fondo estático del mercado de dinero en una '_FiguraPersistente'.
+
+    Returns:
+        callable: 'actualizar(estado, eq)', que mueve la demanda de dinero, la
+                  oferta real, el punto de equilibrio, la guía y el título.
+                  'estado' es la tupla (Ms, Y, P) y 'eq' el resultado de
+                  'equilibrio_mercado_dinero' para ese estado.
+    """
+    I_MAX_FIJO = 50
+    M_MAX_FIJO = 500
+    i_range = np.linspace(0, I_MAX_FIJO, 100)
+
+    ax = figura.ax
+    linea_md, = ax.plot([], [], color='orange', linewidth=3, label='Demanda de Dinero (Md)')
+    linea_ms = ax.axvline(x=0, color='skyblue', linewidth=3, linestyle='-', label='Oferta Real (Ms/P)')
+    punto_eq, = ax.plot([], [], 'o', color='black', markersize=10, label='Equilibrio')
+    guia_h, = ax.plot([], [], color='black', linestyle=':', alpha=0.8)
+    ax.set_title(" ", fontsize=16)
+    ax.set_xlabel("Cantidad Real de Dinero (M/P)", fontsize=12)
+    ax.set_ylabel("Tasa de Interés (i)", fontsize=12)
+    ax.grid(True, linestyle=':', alpha=0.6)
+    ax.legend(loc="upper right")
+    ax.set_xlim(left=0, right=M_MAX_FIJO)
+    ax.set_ylim(bottom=0, top=I_MAX_FIJO)
+    figura.registrar_dinamicos([linea_md, linea_ms, punto_eq, guia_h, ax.title])
+    figura.terminar_fondo()
+
+    def actualizar(estado, eq):
+        Y = estado[1]
+        Ms_real, i_eq = float(eq['Ms_real']), float(eq['i_eq'])
+        linea_md.set_data(demanda_dinero(i_range, Y, K_BASE, H_BASE), i_range)
+        linea_ms.set_xdata([Ms_real, Ms_real])
+        punto_eq.set_data([Ms_real], [i_eq])
+        guia_h.set_data([0, Ms_real], [i_eq, i_eq])
+        ax.set_title(f"Tasa de Interés de Equilibrio: {i_eq:.2f}%", fontsize=16)
+
+    return actualizar
+
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 1.4: INSTRUMENTACIÓN DEL REDIBUJADO
+# ------------------------------------------------------------------------------
+# Con 'instrumentar' los dashboards miden cada tick por fases: 'modelo'
+# (equilibrio o consulta a la caché), 'dibujo' (artistas de matplotlib),
+# 'layout' ('tight_layout'), 'codificacion' (PNG) y 'salida' (envío al widget).
+# En el modo clásico 'plt.show()' rasteriza, codifica y envía la figura en un
+# solo paso, así que ese tiempo se registra completo como 'salida'.
+# Sin 'instrumentar', 'dibujar_grafica' no se envuelve y cada punto de medición
+# se reduce a comprobar 'medicion is not None'.
+INSTRUMENTACION = {}
+
+
+class _Medicion:
+    """Tiempos por fase de un tick; cada marca cierra la fase que termina."""
+
+    __slots__ = ('inicio', 'ultimo', 'fases')
+
+    def __init__(self):
+        self.inicio = self.ultimo = time.perf_counter()
+        self.fases = {}
+
+    def marca(self, fase):
+        ahora = time.perf_counter()
+        self.fases[fase] = self.fases.get(fase, 0.0) + (ahora - self.ultimo)
+        self.ultimo = ahora
+
+
+class Instrumentacion:
+    """
+    Estadísticas de redibujado de un dashboard.
+
+    Args:
+        nombre (str): Nombre del dashboard; la instancia queda registrada en
+                      'INSTRUMENTACION[nombre]'.
+        ventana (int): Número de ticks recientes sobre los que se calculan los
+                       percentiles.
+        perfilar_lentos (int): Si es mayor que 0, cada tick corre bajo
+                       cProfile y se conservan los perfiles de los
+                       'perfilar_lentos' ticks más lentos (ver 'perfiles()').
+    """
+
+    FASES = ('modelo', 'dibujo', 'layout', 'codificacion', 'salida')
+
+    def __init__(self, nombre, ventana=500, perfilar_lentos=0):
+        self.nombre = nombre
+        self.ventana = ventana
+        self.perfilar_lentos = perfilar_lentos
+        self.widget = None
+        self.reiniciar()
+        INSTRUMENTACION[nombre] = self
+
+    def reiniciar(self):
+        """Descarta los tiempos y los perfiles acumulados."""
+        self._lock = threading.Lock()
+        self.tiempos = {fase: deque(maxlen=self.ventana) for fase in self.FASES + ('total',)}
+        self.ticks = 0
+        self._lentos = []   # heap de (total_ms, número de tick, estado, cProfile.Profile)
+        self._ultima_publicacion = 0.0
+
+    def envolver(self, dibujar):
+        """
+        Devuelve 'dibujar' instrumentada: crea la medición del tick, se la
+        pasa como argumento 'medicion' y registra el resultado al terminar.
+        """
+        def dibujar_instrumentada(*estado, **kwargs):
+            medicion = _Medicion()
+            perfil = self._iniciar_perfil()
+            try:
+                return dibujar(*estado, medicion=medicion, **kwargs)
+            finally:
+                if perfil is not None:
+                    perfil.disable()
+                self.registrar(medicion, estado, perfil)
+        return dibujar_instrumentada
+
+    def _iniciar_perfil(self):
+        if self.perfilar_lentos <= 0:
+            return None
+        import cProfile
+        perfil = cProfile.Profile()
+        try:
+            perfil.enable()
+        except ValueError:
+            return None  # Ya hay otro perfilador activo (p. ej. otro dashboard).
+        return perfil
+
+    def registrar(self, medicion, estado=None, perfil=None):
+        """Agrega los tiempos de un tick terminado (en milisegundos)."""
+        total = (time.perf_counter() - medicion.inicio) * 1000
+        with self._lock:
+            self.ticks += 1
+            self.tiempos['total'].append(total)
+            for fase, segundos in medicion.fases.items():
+                self.tiempos[fase].append(segundos * 1000)
+            if perfil is not None:
+                import heapq
+                entrada = (total, self.ticks, estado, perfil)
+                if len(self._lentos) < self.perfilar_lentos:
+                    heapq.heappush(self._lentos, entrada)
+                elif total > self._lentos[0][0]:
+                    heapq.heapreplace(self._lentos, entrada)
+        # El widget se actualiza como máximo dos veces por segundo para no
+        # sumar mensajes al propio tick que se está midiendo.
+        if self.widget is not None and time.monotonic() - self._ultima_publicacion > 0.5:
+            self.actualizar_widget()
+
+    def percentiles(self, q=(50, 90, 99)):
+        """
+        Percentiles de cada fase sobre la ventana de ticks recientes.
+
+        Returns:
+            dict: fase -> {'n', 'ultimo', 'p50', 'p90', ...} en milisegundos.
+                  Las fases que ningún tick registró se omiten.
+        """
+        _cargar_dependencias(interfaz=False)
+        with self._lock:
+            copias = {fase: list(valores) for fase, valores in self.tiempos.items() if valores}
+        resultado = {}
+        for fase, valores in copias.items():
+            resumen = {'n': len(valores), 'ultimo': valores[-1]}
+            for p, v in zip(q, np.percentile(valores, q)):
+                resumen[f'p{p:g}'] = float(v)
+            resultado[fase] = resumen
+        return resultado
+
+    def perfiles(self):
+        """
+        Perfiles de los ticks más lentos, del más lento al más rápido.
+
+        Returns:
+            list: Diccionarios con 'total_ms', 'tick', 'estado' y 'stats'
+                  ('pstats.Stats', p. ej. 'stats.sort_stats("cumtime").print_stats(15)').
+        """
+        import pstats
+        with self._lock:
+            lentos = sorted(self._lentos, key=lambda e: e[0], reverse=True)
+        return [{'total_ms': total, 'tick': tick, 'estado': estado, 'stats': pstats.Stats(perfil)}
+                for total, tick, estado, perfil in lentos]
+
+    def crear_widget(self):
+        """Tabla HTML con los percentiles, actualizada a medida que llegan ticks."""
+        _cargar_dependencias()
+        if self.widget is None:
+            self.widget = widgets.HTML()
+            self.actualizar_widget()
+        return self.widget
+
+    def actualizar_widget(self):
+        self._ultima_publicacion = time.monotonic()
+        estadisticas = self.percentiles()
+        filas = ''.join(
+            f"<tr><td>{fase}</td><td>{e['p50']:.1f}</td><td>{e['p90']:.1f}</td>"
+            f"<td>{e['p99']:.1f}</td><td>{e['ultimo']:.1f}</td></tr>"
+            for fase, e in estadisticas.items())
+        self.widget.value = (
+            f"<b>Redibujado ({self.ticks} ticks, ms)</b>"
+            "<table><tr><th>fase</th><th>p50</th><th>p90</th><th>p99</th><th>último</th></tr>"
+            f"{filas}</table>")
+
+
+def _instrumentacion(instrumentar, nombre):
+    # 'instrumentar' puede ser None/False, True o una 'Instrumentacion' ya creada.
+    if not instrumentar:
+        return None
+    if instrumentar is True:
+        return Instrumentacion(nombre)
+    INSTRUMENTACION[nombre] = instrumentar
+    return instrumentar
+
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 1.5: GRÁFICA VECTORIAL EN EL NAVEGADOR (MODO 'vector')
+# ------------------------------------------------------------------------------
+# En el modo 'vector' el servidor no rasteriza nada: un widget liviano (basado
+# en 'anywidget', dependencia opcional) dibuja las líneas en un <canvas> del
+# navegador. En cada tick solo viajan, como buffers binarios float32 de un
+# mensaje personalizado, los arreglos que cambiaron respecto del tick anterior,
+# más el título. Cuando una vista nueva se conecta (p. ej. al recargar la
+# página) pide con el mensaje 'listo' el estado completo.
+_ESM_GRAFICA_VECTORIAL = r"""
+function pasoBonito(rango, n) {
+  const bruto = rango / n;
+  const magnitud = Math.pow(10, Math.floor(Math.log10(bruto)));
+  const r = bruto / magnitud;
+  return magnitud * (r < 1.5 ? 1 : r < 3 ? 2 : r < 7 ? 5 : 10);
+}
+
+function render({ model, el }) {
+  const cfg = model.get("config");
+  const dpr = window.devicePixelRatio || 1;
+  const canvas = document.createElement("canvas");
+  canvas.width = cfg.ancho * dpr;
+  canvas.height = cfg.alto * dpr;
+  canvas.style.width = cfg.ancho + "px";
+  canvas.style.height = cfg.alto + "px";
+  el.appendChild(canvas);
+  const ctx = canvas.getContext("2d");
+
+  const m = { izq: 70, der: 20, sup: 45, inf: 55 };
+  const [x0, x1] = cfg.xlim, [y0, y1] = cfg.ylim;
+  const ancho = cfg.ancho - m.izq - m.der, alto = cfg.alto - m.sup - m.inf;
+  const px = (x) => m.izq + ((x - x0) / (x1 - x0)) * ancho;
+  const py = (y) => m.sup + alto - ((y - y0) / (y1 - y0)) * alto;
+  const guiones = { solid: [], dashed: [6, 4], dotted: [2, 3] };
+  const series = {};
+  let titulo = "";
+  let pendiente = false;
+
+  function rejilla() {
+    ctx.font = "12px sans-serif";
+    ctx.lineWidth = 1;
+    ctx.strokeStyle = "#cccccc";
+    ctx.fillStyle = "black";
+    ctx.setLineDash([2, 3]);
+    const dx = pasoBonito(x1 - x0, 5), dy = pasoBonito(y1 - y0, 5);
+    ctx.textAlign = "center";
+    ctx.textBaseline = "top";
+    for (let x = Math.ceil(x0 / dx) * dx; x <= x1 + 1e-9; x += dx) {
+      ctx.beginPath(); ctx.moveTo(px(x), py(y0)); ctx.lineTo(px(x), py(y1)); ctx.stroke();
+      ctx.fillText(String(+x.toFixed(6)), px(x), py(y0) + 5);
+    }
+    ctx.textAlign = "right";
+    ctx.textBaseline = "middle";
+    for (let y = Math.ceil(y0 / dy) * dy; y <= y1 + 1e-9; y += dy) {
+      ctx.beginPath(); ctx.moveTo(px(x0), py(y)); ctx.lineTo(px(x1), py(y)); ctx.stroke();
+      ctx.fillText(String(+y.toFixed(6)), px(x0) - 5, py(y));
+    }
+    ctx.setLineDash([]);
+    ctx.strokeStyle = "black";
+    ctx.strokeRect(m.izq, m.sup, ancho, alto);
+
+    ctx.font = "14px sans-serif";
+    ctx.textAlign = "center";
+    ctx.textBaseline = "bottom";
+    ctx.fillText(cfg.xlabel, m.izq + ancho / 2, cfg.alto - 8);
+    ctx.save();
+    ctx.translate(12, m.sup + alto / 2);
+    ctx.rotate(-Math.PI / 2);
+    ctx.textBaseline = "top";
+    ctx.fillText(cfg.ylabel, 0, 0);
+    ctx.restore();
+    ctx.font = "18px sans-serif";
+    ctx.textBaseline = "middle";
+    ctx.fillText(titulo, cfg.ancho / 2, m.sup / 2);
+  }
+
+  function trazar(s, d, x, y, escala) {
+    ctx.globalAlpha = s.alpha ?? 1;
+    ctx.strokeStyle = ctx.fillStyle = s.color;
+    if (s.tipo === "punto") {
+      for (let j = 0; j < d.x.length; j++) {
+        ctx.beginPath(); ctx.arc(x(d.x[j]), y(d.y[j]), (s.tamano ?? 10) / 2 * escala, 0, 2 * Math.PI); ctx.fill();
+      }
+    } else {
+      ctx.lineWidth = s.ancho ?? 1.5;
+      ctx.setLineDash(guiones[s.estilo ?? "solid"]);
+      ctx.beginPath();
+      for (let j = 0; j < d.x.length; j++) {
+        (j ? ctx.lineTo : ctx.moveTo).call(ctx, x(d.x[j]), y(d.y[j]));
+      }
+      ctx.stroke();
+      ctx.setLineDash([]);
+    }
+    ctx.globalAlpha = 1;
+  }
+
+  function leyenda() {
+    const entradas = cfg.series.filter((s) => s.etiqueta);
+    ctx.font = "12px sans-serif";
+    const w = 30 + Math.max(...entradas.map((s) => ctx.measureText(s.etiqueta).width));
+    const h = 18 * entradas.length + 8;
+    const izq = cfg.leyenda === "upper right" ? m.izq + ancho - w - 10 : m.izq + 10;
+    const sup = m.sup + 10;
+    ctx.fillStyle = "rgba(255, 255, 255, 0.8)";
+    ctx.strokeStyle = "#cccccc";
+    ctx.fillRect(izq, sup, w, h);
+    ctx.strokeRect(izq, sup, w, h);
+    ctx.textAlign = "left";
+    ctx.textBaseline = "middle";
+    entradas.forEach((s, j) => {
+      const yc = sup + 13 + 18 * j;
+      const muestra = s.tipo === "punto" ? { x: [izq + 14], y: [yc] } : { x: [izq + 4, izq + 24], y: [yc, yc] };
+      trazar(s, muestra, (v) => v, (v) => v, 0.8);
+      ctx.fillStyle = "black";
+      ctx.fillText(s.etiqueta, izq + 28, yc);
+    });
+  }
+
+  function dibujar() {
+    pendiente = false;
+    ctx.setTransform(dpr, 0, 0, dpr, 0, 0);
+    ctx.fillStyle = "white";
+    ctx.fillRect(0, 0, cfg.ancho, cfg.alto);
+    rejilla();
+    ctx.save();
+    ctx.beginPath(); ctx.rect(m.izq, m.sup, ancho, alto); ctx.clip();
+    for (const s of cfg.series) {
+      const d = series[s.nombre];
+      if (d && d.x && d.y) trazar(s, d, px, py, 1);
+    }
+    ctx.restore();
+    leyenda();
+  }
+
+  model.on("msg:custom", (msg, buffers) => {
+    if (msg.tipo !== "datos") return;
+    msg.arrays.forEach(([nombre, eje], j) => {
+      const b = buffers[j];
+      // Se copia el buffer: el desplazamiento puede no estar alineado a 4 bytes.
+      const datos = new Float32Array(b.buffer.slice(b.byteOffset, b.byteOffset + b.byteLength));
+      (series[nombre] ??= {})[eje] = datos;
+    });
+    if (msg.titulo !== undefined) titulo = msg.titulo;
+    if (!pendiente) {
+      pendiente = true;
+      requestAnimationFrame(dibujar);
+    }
+  });
+  dibujar();
+  model.send({ tipo: "listo" });
+}
+
+export default { render };
+"""
+
+_CLASE_WIDGET_VECTORIAL = None
+
+
+def _clase_widget_vectorial():
+    # 'anywidget' es opcional: solo se importa (y se exige) en el modo 'vector'.
+    global _CLASE_WIDGET_VECTORIAL
+    if _CLASE_WIDGET_VECTORIAL is None:
+        try:
+            import anywidget
+            import traitlets
+        except ImportError as error:
+            raise ImportError("El modo 'vector' requiere 'anywidget' (pip install anywidget).") from error
+
+        class WidgetGraficaVectorial(anywidget.AnyWidget):
+            _esm = _ESM_GRAFICA_VECTORIAL
+            config = traitlets.Dict().tag(sync=True)
+
+        _CLASE_WIDGET_VECTORIAL = WidgetGraficaVectorial
+    return _CLASE_WIDGET_VECTORIAL
+
+
+class _GraficaVectorial:
+    """
+    Lado Python del widget vectorial: guarda los arreglos vigentes de cada
+    serie y envía al navegador solo los que cambian.
+
+    Args:
+        config (dict): Tamaño ('ancho', 'alto' en px), límites ('xlim',
+                       'ylim'), etiquetas ('xlabel', 'ylabel'), posición de
+                       la leyenda ('leyenda') y lista 'series' con 'nombre',
+                       'color', 'tipo' ('linea' o 'punto'), 'ancho',
+                       'estilo' ('solid', 'dashed', 'dotted'), 'alpha',
+                       'tamano' y 'etiqueta' (opcional) de cada serie.
+    """
+
+    def __init__(self, config):
+        self.widget = _clase_widget_vectorial()(config=config)
+        self.series = {}
+        self.titulo = ""
+        self.bytes_ultimo_envio = 0
+        self.etiqueta_envio = widgets.Label("")
+        self.widget.on_msg(self._recibir)
+
+    def _recibir(self, widget, contenido, buffers):
+        if contenido.get('tipo') == 'listo':
+            self._enviar([(n, e) for n, ejes in self.series.items() for e in ejes], titulo=True)
+
+    def actualizar(self, titulo=None, medicion=None, **series):
+        """
+        Actualiza las series indicadas como 'nombre=(x, y)' y el título, y
+        envía solo los arreglos que cambiaron.
+        """
+        cambios = []
+        for nombre, ejes in series.items():
+            vigentes = self.series.setdefault(nombre, {})
+            for eje, valores in zip('xy', ejes):
+                arreglo = np.ascontiguousarray(valores, dtype=np.float32).ravel()
+                anterior = vigentes.get(eje)
+                if anterior is None or not np.array_equal(anterior, arreglo):
+                    vigentes[eje] = arreglo
+                    cambios.append((nombre, eje))
+        cambio_titulo = titulo is not None and titulo != self.titulo
+        if cambio_titulo:
+            self.titulo = titulo
+        if medicion is not None:
+            medicion.marca('dibujo')
+
+        if cambios or cambio_titulo:
+            self._enviar(cambios, cambio_titulo)
+            self.etiqueta_envio.value = f"Actualización: {self.bytes_ultimo_envio} bytes"
+        if medicion is not None:
+            medicion.marca('salida')
+
+    def _enviar(self, claves, titulo):
+        contenido = {'tipo': 'datos', 'arrays': [list(clave) for clave in claves]}
+        if titulo:
+            contenido['titulo'] = self.titulo
+        buffers = [memoryview(self.series[nombre][eje]) for nombre, eje in claves]
+        self.widget.send(contenido, buffers=buffers)
+        self.bytes_ultimo_envio = len(json.dumps(contenido)) + sum(b.nbytes for b in buffers)
+
+
+def preparar_vector_bienes():
+    """
+    Crea la Cruz Keynesiana del modo 'vector'.
+
+    Returns:
+        tuple: ('_GraficaVectorial', 'actualizar(estado, eq, medicion=None)'),
+               con los mismos argumentos que 'preparar_figura_bienes'.
+    """
+    Y_MAX_FIJO = 2500
+    Y_range = np.linspace(0, Y_MAX_FIJO, 100)
+    grafica = _GraficaVectorial({
+        'ancho': 720, 'alto': 504, 'xlim': [0, Y_MAX_FIJO], 'ylim': [0, Y_MAX_FIJO],
+        'xlabel': "Ingreso / Producción (Y)", 'ylabel': "Gasto Agregado (DA)", 'leyenda': 'upper left',
+        'series': [
+            {'nombre': 'linea_45', 'color': 'black', 'estilo': 'dashed', 'alpha': 0.7,
+             'etiqueta': 'Y = DA (Condición de Equilibrio)'},
+            {'nombre': 'da', 'color': 'deepskyblue', 'ancho': 3, 'etiqueta': 'Gasto Agregado (DA)'},
+            {'nombre': 'guia_v', 'color': 'red', 'estilo': 'dotted', 'alpha': 0.8},
+            {'nombre': 'guia_h', 'color': 'red', 'estilo': 'dotted', 'alpha': 0.8},
+            {'nombre': 'equilibrio', 'color': 'red', 'tipo': 'punto', 'tamano': 10,
+             'etiqueta': 'Punto de Equilibrio'},
+        ],
+    })
+    grafica.actualizar(linea_45=(Y_range, Y_range))
+
+    def actualizar(estado, eq, medicion=None):
+        t1 = estado[1]
+        alpha, A, Y_eq = float(eq['alpha']), float(eq['A']), float(eq['Y_eq'])
+        grafica.actualizar(
+            titulo=f"Multiplicador: {alpha:.2f} | Ingreso de Equilibrio: {Y_eq:.1f}",
+            medicion=medicion,
+            da=(Y_range, demanda_agregada(Y_range, A, C1_BASE, t1)),
+            equilibrio=([Y_eq], [Y_eq]),
+            guia_v=([Y_eq, Y_eq], [0, Y_eq]),
+            guia_h=([0, Y_eq], [Y_eq, Y_eq]))
+
+    return grafica, actualizar
+
+
+def preparar_vector_dinero():
+    """
+    Crea la gráfica del mercado de dinero del modo 'vector'.
+
+    Returns:
+        tuple: ('_GraficaVectorial', 'actualizar(estado, eq, medicion=None)'),
+               con los mismos argumentos que 'preparar_figura_dinero'.
+    """
+    I_MAX_FIJO = 50
+    M_MAX_FIJO = 500
+    i_range = np.linspace(0, I_MAX_FIJO, 100)
+    grafica = _GraficaVectorial({
+        'ancho': 720, 'alto': 504, 'xlim': [0, M_MAX_FIJO], 'ylim': [0, I_MAX_FIJO],
+        'xlabel': "Cantidad Real de Dinero (M/P)", 'ylabel': "Tasa de Interés (i)", 'leyenda': 'upper right',
+        'series': [
+            {'nombre': 'md', 'color': 'orange', 'ancho': 3, 'etiqueta': 'Demanda de Dinero (Md)'},
+            {'nombre': 'ms', 'color': 'skyblue', 'ancho': 3, 'etiqueta': 'Oferta Real (Ms/P)'},
+            {'nombre': 'guia_h', 'color': 'black', 'estilo': 'dotted', 'alpha': 0.8},
+            {'nombre': 'equilibrio', 'color': 'black', 'tipo': 'punto', 'tamano': 10,
+             'etiqueta': 'Equilibrio'},
+        ],
+    })
+
+    def actualizar(estado, eq, medicion=None):
+        Y = estado[1]
+        Ms_real, i_eq = float(eq['Ms_real']), float(eq['i_eq'])
+        # La demanda de dinero solo cambia con Y: si se mueve Ms o P, su
+        # arreglo no se vuelve a enviar.
+        grafica.actualizar(
+            titulo=f"Tasa de Interés de Equilibrio: {i_eq:.2f}%",
+            medicion=medicion,
+            md=(demanda_dinero(i_range, Y, K_BASE, H_BASE), i_range),
+            ms=([Ms_real, Ms_real], [0, I_MAX_FIJO]),
+            equilibrio=([Ms_real], [i_eq]),
+            guia_h=([0, Ms_real], [i_eq, i_eq]))
+
+    return grafica, actualizar
+
 
 # ------------------------------------------------------------------------------
 # SECCIÓN 2: FUNCIÓN PRINCIPAL PARA CREAR LA INTERFAZ
 # ------------------------------------------------------------------------------
 # Se encapsula toda la lógica en una función principal para mantener el código
 # organizado y reutilizable.
-def crear_grafica_mercado_bienes():
+def crear_grafica_mercado_bienes(modo='clasico', max_fps=None, ejecutor='auto', cache=None,
+                                 instrumentar=None):
     """
     Crea y devuelve una interfaz de usuario interactiva para el modelo
     del mercado de bienes y servicios en una economía abierta.
+
+    Args:
+        modo (str): 'clasico' reconstruye la figura en cada cambio de slider;
+                    'rapido' crea la figura una sola vez y solo actualiza
+                    las líneas, el punto de equilibrio y el título;
+                    'vector' dibuja en el navegador y en cada tick envía
+                    solo los arreglos float32 que cambiaron (requiere
+                    'anywidget').
+        max_fps (float): Si se indica, los eventos de los sliders se agrupan
+                         y se renderiza como máximo 'max_fps' veces por
+                         segundo, fuera del manejador de mensajes del kernel.
+        ejecutor (str): 'auto', 'asyncio' o 'hilo' (ver '_PlanificadorRender');
+                        'hilo' no está disponible en el modo 'clasico'.
+        cache (CacheEscenarios | bool): Solo en los modos 'rapido' y 'vector'.
+                         Reutiliza los equilibrios y (en 'rapido') las
+                         imágenes de estados ya visitados (True crea una
+                         caché en memoria con valores por defecto).
+        instrumentar (Instrumentacion | bool): Mide cada redibujado por fases
+                         y muestra los percentiles bajo los controles (ver
+                         'Instrumentacion'; True crea una con valores por defecto).
     """
+    if modo not in ('clasico', 'rapido', 'vector'):
+        raise ValueError(f"Modo desconocido: {modo!r}. Use 'clasico', 'rapido' o 'vector'.")
+    _cargar_dependencias()
+    if cache is True:
+        from CacheCode import CacheEscenarios
+        cache = CacheEscenarios('bienes')
     # --- 2.1. Creación de Widgets de la Interfaz ---
     # Aquí se definen todos los elementos interactivos que el usuario verá.
 
@@ -57,23 +1016,23 @@ def crear_grafica_mercado_bienes():
     # --- 2.2. Función de Dibujo de la Gráfica ---
     # Esta función contiene la lógica económica y de visualización.
     # Se ejecuta cada vez que un slider cambia de valor.
-    def dibujar_grafica(g0, t1, i0, nx0):
+    def dibujar_grafica(g0, t1, i0, nx0, cancelado=None, medicion=None):
         # El bloque 'with' asegura que la gráfica se dibuje en el widget 'plot_output'.
         with plot_output:
             # Limpia la gráfica anterior para evitar superposiciones al actualizar.
             plot_output.clear_output(wait=True)
 
             # Parámetros fijos del modelo.
-            c0 = 50   # Consumo autónomo (asumido)
-            c1 = 0.6  # Propensión Marginal a Consumir
+            c0 = C0_BASE  # Consumo autónomo (asumido)
+            c1 = C1_BASE  # Propensión Marginal a Consumir
 
             # --- Subsección 2.2.1: Cálculos del Modelo Económico ---
-            # 'alpha' es el multiplicador keynesiano.
-            alpha = 1 / (1 - c1 * (1 - t1))
-            # 'A' es la suma de todos los componentes autónomos del gasto.
-            A = c0 + i0 + g0 + nx0
-            # 'Y_eq' es el ingreso de equilibrio, donde la producción iguala al gasto.
-            Y_eq = alpha * A
+            # El motor de 'ModelCode' devuelve el multiplicador ('alpha'),
+            # el gasto autónomo ('A') y el ingreso de equilibrio ('Y_eq').
+            eq = equilibrio_mercado_bienes(g0, t1, i0, nx0, c0, c1)
+            alpha, A, Y_eq = float(eq['alpha']), float(eq['A']), float(eq['Y_eq'])
+            if medicion is not None:
+                medicion.marca('modelo')
 
             # --- Subsección 2.2.2: Creación de la Gráfica con Matplotlib ---
             fig, ax = plt.subplots(figsize=(10, 7))
@@ -83,7 +1042,7 @@ def crear_grafica_mercado_bienes():
             Y_range = np.linspace(0, Y_MAX_FIJO, 100)
             
             # 'DA' es la función de Gasto Agregado (Demanda Agregada).
-            DA = A + c1 * (1 - t1) * Y_range
+            DA = demanda_agregada(Y_range, A, c1, t1)
             
             # Dibujar la línea de 45 grados (condición de equilibrio Y = DA).
             ax.plot(Y_range, Y_range, color='black', linestyle='--', alpha=0.7, label='Y = DA (Condición de Equilibrio)')
@@ -106,14 +1065,91 @@ def crear_grafica_mercado_bienes():
             ax.set_xlim(left=0, right=Y_MAX_FIJO)
             ax.set_ylim(bottom=0, top=Y_MAX_FIJO)
 
+            if medicion is not None:
+                medicion.marca('dibujo')
             plt.tight_layout() # Ajusta el layout para que no se corten las etiquetas.
+            if medicion is not None:
+                medicion.marca('layout')
+
+            # Si ya hay un estado más reciente, se descarta esta figura antes
+            # de la parte más costosa (codificar y enviar la imagen).
+            if cancelado is not None and cancelado():
+                plt.close(fig)
+                return
             plt.show()         # Muestra la gráfica en el output.
+            if medicion is not None:
+                medicion.marca('salida')
+
+    # --- 2.2.b. Modo Rápido: Figura Persistente ---
+    # El fondo (línea de 45°, rejilla, etiquetas y límites fijos) se dibuja una
+    # sola vez; cada tick solo mueve la curva DA, el punto y las guías.
+    if modo == 'rapido':
+        figura = _FiguraPersistente(figsize=(10, 7))
+        actualizar_artistas = preparar_figura_bienes(figura)
+        if cache is not None:
+            # Las imágenes se guardan junto con el tamaño y el dpi de la figura.
+            from CacheCode import opciones_imagen
+            opciones = opciones_imagen(figura.fig.get_size_inches(), figura.fig.dpi)
+
+        def dibujar_grafica(g0, t1, i0, nx0, cancelado=None, medicion=None):
+            estado = (g0, t1, i0, nx0)
+            if cache is None:
+                eq = equilibrio_mercado_bienes(g0, t1, i0, nx0, C0_BASE, C1_BASE)
+            else:
+                # Un estado ya visitado se sirve sin recalcular ni redibujar.
+                png = None if figura.interactivo else cache.obtener_imagen(estado, opciones)
+                if png is not None:
+                    if medicion is not None:
+                        medicion.marca('modelo')
+                    figura.publicar(png, medicion)
+                    return
+                eq = cache.equilibrio(estado)
+            if medicion is not None:
+                medicion.marca('modelo')
+            actualizar_artistas(estado, eq)
+            figura.ultima_imagen = None
+            figura.actualizar(cancelado, medicion)
+            if cache is not None and figura.ultima_imagen is not None:
+                cache.guardar_imagen(estado, figura.ultima_imagen, opciones)
+
+    # --- 2.2.c. Modo Vectorial: Dibujo en el Navegador ---
+    # No se rasteriza en el servidor: cada tick envía al widget solo los
+    # arreglos float32 que cambiaron (unos cientos de bytes) en lugar de un PNG.
+    if modo == 'vector':
+        grafica, actualizar_vector = preparar_vector_bienes()
+
+        def dibujar_grafica(g0, t1, i0, nx0, cancelado=None, medicion=None):
+            estado = (g0, t1, i0, nx0)
+            if cache is None:
+                eq = equilibrio_mercado_bienes(g0, t1, i0, nx0, C0_BASE, C1_BASE)
+            else:
+                eq = cache.equilibrio(estado)
+            if medicion is not None:
+                medicion.marca('modelo')
+            if cancelado is not None and cancelado():
+                return
+            actualizar_vector(estado, eq, medicion)
 
     # --- 2.3. Lógica de Interacción (Observadores) ---
-    # Esta sección conecta los sliders con la función de dibujo.
+    # Esta sección conecta los sliders con la función de dibujo. Con 'max_fps'
+    # los eventos pasan por el planificador, que agrupa las ráfagas.
+    instrumentacion = _instrumentacion(instrumentar, 'bienes')
+    if instrumentacion is not None:
+        dibujar_grafica = instrumentacion.envolver(dibujar_grafica)
+
+    planificador = None
+    if max_fps is not None:
+        planificador = _PlanificadorRender(
+            lambda estado, cancelado: dibujar_grafica(*estado, cancelado=cancelado),
+            max_fps=max_fps, ejecutor=ejecutor, permitir_hilo=modo != 'clasico')
+
     def on_value_change(change):
         # Llama a la función de dibujo con los valores actuales de todos los sliders.
-        dibujar_grafica(gasto_slider.value, tasa_slider.value, inversion_slider.value, nx_slider.value)
+        estado = (gasto_slider.value, tasa_slider.value, inversion_slider.value, nx_slider.value)
+        if planificador is None or change is None:
+            dibujar_grafica(*estado)
+        else:
+            planificador.solicitar(estado)
 
     # Se "observa" cada slider; si su 'value' cambia, se llama a la función 'on_value_change'.
     for slider in [gasto_slider, tasa_slider, inversion_slider, nx_slider]:
@@ -130,6 +1166,18 @@ def crear_grafica_mercado_bienes():
         widgets.VBox([nx_label, nx_slider])
     ], layout=widgets.Layout(width='400px'))
     
+    # En el modo rápido la gráfica es la figura persistente y se informa la
+    # latencia de cada tick debajo de los controles; en el vectorial, el
+    # widget del navegador y el tamaño de cada envío.
+    if modo == 'rapido':
+        controles.children += (figura.etiqueta_latencia,)
+        plot_output = figura.widget
+    elif modo == 'vector':
+        controles.children += (grafica.etiqueta_envio,)
+        plot_output = grafica.widget
+    if instrumentacion is not None:
+        controles.children += (instrumentacion.crear_widget(),)
+
     # Se combinan los controles (izquierda) y la gráfica (derecha) en una caja horizontal.
     ui = widgets.HBox([controles, plot_output], layout=widgets.Layout(align_items='center'))
     
@@ -144,52 +1192,62 @@ def crear_grafica_mercado_bienes():
 # ------------------------------------------------------------------------------
 # SECCIÓN 3: EJECUCIÓN Y VISUALIZACIÓN
 # ------------------------------------------------------------------------------
-# Para mostrar la interfaz interactiva en el cuaderno de Jupyter,
-# simplemente llamamos a la función principal.
-display(crear_grafica_mercado_bienes())
-
-
+# Importar el módulo no construye ni dibuja nada. En el cuaderno basta con
+# llamar a 'crear_grafica_mercado_bienes()' al final de una celda; al ejecutar
+# el archivo directamente (p. ej. '%run GraphsCode.py') se muestran ambos
+# dashboards al final del módulo.
 
-
-
-
-
-
-
-
-# -*- coding: utf-8 -*-
-# ==============================================================================
-# TÍTULO: ANÁLISIS INTERACTIVO DEL MERCADO DE DINERO
-# ==============================================================================
-"""
-Análisis Interactivo del Mercado de Dinero (Modelo LM)
-
-Este script visualiza el modelo de equilibrio en el mercado monetario.
-Permite al usuario manipular la oferta monetaria, el nivel de ingreso y
-el nivel de precios para observar su impacto en la tasa de interés de equilibrio.
-"""
+# ------------------------------------------------------------------------------
+# SECCIÓN 4: ANÁLISIS INTERACTIVO DEL MERCADO DE DINERO
+# ------------------------------------------------------------------------------
+# Este bloque visualiza el modelo de equilibrio en el mercado monetario. Permite
+# al usuario manipular la oferta monetaria, el nivel de ingreso y el nivel de
+# precios para observar su impacto en la tasa de interés de equilibrio.
 
 # ------------------------------------------------------------------------------
-# SECCIÓN 1: IMPORTACIÓN DE LIBRERÍAS
+# SECCIÓN 4.1: IMPORTACIÓN DE LIBRERÍAS
 # ------------------------------------------------------------------------------
-# Se importan las librerías necesarias para los cálculos numéricos (numpy),
-# la creación de gráficos (matplotlib) y los componentes interactivos (ipywidgets).
-import numpy as np
-import matplotlib.pyplot as plt
-import ipywidgets as widgets
-from IPython.display import display
+# Las librerías se cargan de forma diferida con '_cargar_dependencias()'
+# (ver la SECCIÓN 1, al inicio de este archivo).
 
 # ------------------------------------------------------------------------------
-# SECCIÓN 2: FUNCIÓN PRINCIPAL PARA CREAR LA INTERFAZ
+# SECCIÓN 4.2: FUNCIÓN PRINCIPAL PARA CREAR LA INTERFAZ
 # ------------------------------------------------------------------------------
 # Se encapsula toda la lógica en una función principal para mantener el código
 # organizado y reutilizable.
-def crear_grafica_mercado_dinero():
+def crear_grafica_mercado_dinero(modo='clasico', max_fps=None, ejecutor='auto', cache=None,
+                                 instrumentar=None):
     """
     Crea y devuelve una interfaz de usuario interactiva para el modelo
     del mercado de dinero.
+
+    Args:
+        modo (str): 'clasico' reconstruye la figura en cada cambio de slider;
+                    'rapido' crea la figura una sola vez y solo actualiza
+                    las curvas, el punto de equilibrio y el título;
+                    'vector' dibuja en el navegador y en cada tick envía
+                    solo los arreglos float32 que cambiaron (requiere
+                    'anywidget').
+        max_fps (float): Si se indica, los eventos de los sliders se agrupan
+                         y se renderiza como máximo 'max_fps' veces por
+                         segundo, fuera del manejador de mensajes del kernel.
+        ejecutor (str): 'auto', 'asyncio' o 'hilo' (ver '_PlanificadorRender');
+                        'hilo' no está disponible en el modo 'clasico'.
+        cache (CacheEscenarios | bool): Solo en los modos 'rapido' y 'vector'.
+                         Reutiliza los equilibrios y (en 'rapido') las
+                         imágenes de estados ya visitados (True crea una
+                         caché en memoria con valores por defecto).
+        instrumentar (Instrumentacion | bool): Mide cada redibujado por fases
+                         y muestra los percentiles bajo los controles (ver
+                         'Instrumentacion'; True crea una con valores por defecto).
     """
-    # --- 2.1. Creación de Widgets de la Interfaz ---
+    if modo not in ('clasico', 'rapido', 'vector'):
+        raise ValueError(f"Modo desconocido: {modo!r}. Use 'clasico', 'rapido' o 'vector'.")
+    _cargar_dependencias()
+    if cache is True:
+        from CacheCode import CacheEscenarios
+        cache = CacheEscenarios('dinero')
+    # --- 4.2.1. Creación de Widgets de la Interfaz ---
     # Aquí se definen todos los elementos interactivos que el usuario verá.
 
     # 'plot_output' es el lienzo donde se dibujará nuestra gráfica.
@@ -208,24 +1266,26 @@ def crear_grafica_mercado_dinero():
     precio_label = widgets.Label("Nivel de Precios (P):")
     precio_slider = widgets.FloatSlider(value=1, min=0.5, max=2, step=0.1, layout=slider_layout, readout_format='.1f')
 
-    # --- 2.2. Función de Dibujo de la Gráfica ---
+    # --- 4.2.2. Función de Dibujo de la Gráfica ---
     # Esta función contiene la lógica económica y de visualización.
     # Se ejecuta cada vez que un slider cambia de valor.
-    def dibujar_grafica(Ms, Y, P):
+    def dibujar_grafica(Ms, Y, P, cancelado=None, medicion=None):
         # El bloque 'with' asegura que la gráfica se dibuje en el widget 'plot_output'.
         with plot_output:
             # Limpia la gráfica anterior para evitar superposiciones al actualizar.
             plot_output.clear_output(wait=True)
 
             # Parámetros fijos del modelo de demanda de dinero: L = kY - hi
-            k = 0.5   # Sensibilidad de la demanda de dinero al ingreso
-            h = 10    # Sensibilidad de la demanda de dinero a la tasa de interés
+            k = K_BASE  # Sensibilidad de la demanda de dinero al ingreso
+            h = H_BASE  # Sensibilidad de la demanda de dinero a la tasa de interés
 
             # --- Subsección 2.2.1: Cálculos del Modelo Económico ---
-            # La oferta real de dinero es la oferta nominal (Ms) dividida por el nivel de precios (P).
-            Ms_real = Ms / P
-            # Se despeja 'i' de la condición de equilibrio Ms/P = kY - hi.
-            i_eq = (k * Y - Ms_real) / h
+            # El motor de 'ModelCode' devuelve la oferta real (Ms/P) y la tasa
+            # de interés que resuelve Ms/P = kY - hi.
+            eq = equilibrio_mercado_dinero(Ms, Y, P, k, h)
+            Ms_real, i_eq = float(eq['Ms_real']), float(eq['i_eq'])
+            if medicion is not None:
+                medicion.marca('modelo')
 
             # --- Subsección 2.2.2: Creación de la Gráfica con Matplotlib ---
             fig, ax = plt.subplots(figsize=(10, 7))
@@ -236,7 +1296,7 @@ def crear_grafica_mercado_dinero():
             i_range = np.linspace(0, I_MAX_FIJO, 100)
             
             # Se calcula la Demanda de Dinero (Md) para cada nivel de 'i'.
-            Md = k * Y - h * i_range
+            Md = demanda_dinero(i_range, Y, k, h)
             
             # Dibujar la curva de Demanda de Dinero (Md).
             ax.plot(Md, i_range, color='orange', linewidth=3, label=f'Demanda de Dinero (Md)')
@@ -258,20 +1318,97 @@ def crear_grafica_mercado_dinero():
             ax.set_xlim(left=0, right=M_MAX_FIJO)
             ax.set_ylim(bottom=0, top=I_MAX_FIJO)
 
+            if medicion is not None:
+                medicion.marca('dibujo')
             plt.tight_layout()
+            if medicion is not None:
+                medicion.marca('layout')
+
+            # Si ya hay un estado más reciente, se descarta esta figura antes
+            # de la parte más costosa (codificar y enviar la imagen).
+            if cancelado is not None and cancelado():
+                plt.close(fig)
+                return
             plt.show()
+            if medicion is not None:
+                medicion.marca('salida')
+
+    # --- 4.2.2.b. Modo Rápido: Figura Persistente ---
+    # El fondo (rejilla, etiquetas y límites fijos) se dibuja una sola vez;
+    # cada tick solo mueve la demanda, la oferta real, el punto y la guía.
+    if modo == 'rapido':
+        figura = _FiguraPersistente(figsize=(10, 7))
+        actualizar_artistas = preparar_figura_dinero(figura)
+        if cache is not None:
+            # Las imágenes se guardan junto con el tamaño y el dpi de la figura.
+            from CacheCode import opciones_imagen
+            opciones = opciones_imagen(figura.fig.get_size_inches(), figura.fig.dpi)
+
+        def dibujar_grafica(Ms, Y, P, cancelado=None, medicion=None):
+            estado = (Ms, Y, P)
+            if cache is None:
+                eq = equilibrio_mercado_dinero(Ms, Y, P, K_BASE, H_BASE)
+            else:
+                # Un estado ya visitado se sirve sin recalcular ni redibujar.
+                png = None if figura.interactivo else cache.obtener_imagen(estado, opciones)
+                if png is not None:
+                    if medicion is not None:
+                        medicion.marca('modelo')
+                    figura.publicar(png, medicion)
+                    return
+                eq = cache.equilibrio(estado)
+            if medicion is not None:
+                medicion.marca('modelo')
+            actualizar_artistas(estado, eq)
+            figura.ultima_imagen = None
+            figura.actualizar(cancelado, medicion)
+            if cache is not None and figura.ultima_imagen is not None:
+                cache.guardar_imagen(estado, figura.ultima_imagen, opciones)
+
+    # --- 4.2.2.c. Modo Vectorial: Dibujo en el Navegador ---
+    # No se rasteriza en el servidor: cada tick envía al widget solo los
+    # arreglos float32 que cambiaron (unos cientos de bytes) en lugar de un PNG.
+    if modo == 'vector':
+        grafica, actualizar_vector = preparar_vector_dinero()
+
+        def dibujar_grafica(Ms, Y, P, cancelado=None, medicion=None):
+            estado = (Ms, Y, P)
+            if cache is None:
+                eq = equilibrio_mercado_dinero(Ms, Y, P, K_BASE, H_BASE)
+            else:
+                eq = cache.equilibrio(estado)
+            if medicion is not None:
+                medicion.marca('modelo')
+            if cancelado is not None and cancelado():
+                return
+            actualizar_vector(estado, eq, medicion)
+
+    # --- 4.2.3. Lógica de Interacción (Observadores) ---
+    # Esta sección conecta los sliders con la función de dibujo. Con 'max_fps'
+    # los eventos pasan por el planificador, que agrupa las ráfagas.
+    instrumentacion = _instrumentacion(instrumentar, 'dinero')
+    if instrumentacion is not None:
+        dibujar_grafica = instrumentacion.envolver(dibujar_grafica)
+
+    planificador = None
+    if max_fps is not None:
+        planificador = _PlanificadorRender(
+            lambda estado, cancelado: dibujar_grafica(*estado, cancelado=cancelado),
+            max_fps=max_fps, ejecutor=ejecutor, permitir_hilo=modo != 'clasico')
 
-    # --- 2.3. Lógica de Interacción (Observadores) ---
-    # Esta sección conecta los sliders con la función de dibujo.
     def on_value_change(change):
         # Llama a la función de dibujo con los valores actuales de todos los sliders.
-        dibujar_grafica(oferta_slider.value, ingreso_slider.value, precio_slider.value)
+        estado = (oferta_slider.value, ingreso_slider.value, precio_slider.value)
+        if planificador is None or change is None:
+            dibujar_grafica(*estado)
+        else:
+            planificador.solicitar(estado)
 
     # Se "observa" cada slider; si su 'value' cambia, se llama a 'on_value_change'.
     for slider in [oferta_slider, ingreso_slider, precio_slider]:
         slider.observe(on_value_change, names='value')
 
-    # --- 2.4. Organización y Visualización de la Interfaz de Usuario (UI) ---
+    # --- 4.2.4. Organización y Visualización de la Interfaz de Usuario (UI) ---
     # Se agrupan los widgets de forma ordenada para presentarlos al usuario.
     
     # Se crea una caja vertical para los controles.
@@ -281,10 +1418,22 @@ def crear_grafica_mercado_dinero():
         widgets.VBox([precio_label, precio_slider])
     ], layout=widgets.Layout(width='400px'))
     
+    # En el modo rápido la gráfica es la figura persistente y se informa la
+    # latencia de cada tick debajo de los controles; en el vectorial, el
+    # widget del navegador y el tamaño de cada envío.
+    if modo == 'rapido':
+        controles.children += (figura.etiqueta_latencia,)
+        plot_output = figura.widget
+    elif modo == 'vector':
+        controles.children += (grafica.etiqueta_envio,)
+        plot_output = grafica.widget
+    if instrumentacion is not None:
+        controles.children += (instrumentacion.crear_widget(),)
+
     # Se combinan los controles (izquierda) y la gráfica (derecha) en una caja horizontal.
     ui = widgets.HBox([controles, plot_output], layout=widgets.Layout(align_items='center'))
 
-    # --- 2.5. Llamada Inicial para Dibujar la Gráfica ---
+    # --- 4.2.5. Llamada Inicial para Dibujar la Gráfica ---
     # Se llama a la función una vez al principio para que la gráfica aparezca
     # con los valores iniciales de los sliders.
     on_value_change(None)
@@ -293,8 +1442,536 @@ def crear_grafica_mercado_dinero():
     return ui
 
 # ------------------------------------------------------------------------------
-# SECCIÓN 3: EJECUCIÓN Y VISUALIZACIÓN
+# SECCIÓN 4.3: EJECUCIÓN Y VISUALIZACIÓN
+# ------------------------------------------------------------------------------
+# En el cuaderno basta con llamar a 'crear_grafica_mercado_dinero()' al final
+# de una celda (ver el bloque final de este archivo).
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 5: DASHBOARD IS-LM ENLAZADO (MERCADOS DE BIENES Y DE DINERO)
+# ------------------------------------------------------------------------------
+# Enlaza los dos dashboards anteriores: la inversión depende de la tasa de
+# interés y el ingreso del mercado de dinero ya no es un slider, sino el ingreso
+# de equilibrio del mercado de bienes. El modelo es el grafo de dependencias de
+# 'crear_grafo_is_lm' ('ModelCode.py'): cada cambio de slider recalcula solo los
+# nodos que dependen del parámetro movido, y solo se actualizan los artistas y
+# se redibujan los paneles que leen esos nodos.
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 5.1: CONTENIDO DE LA FIGURA (TRES PANELES)
+# ------------------------------------------------------------------------------
+# Cada artista dinámico se enlaza con los nodos del grafo que muestra. Un
+# panel se redibuja solo si alguno de sus enlaces quedó afectado.
+def preparar_figura_is_lm(figura, grafo):
+    """
+    Dibuja el fondo estático de los paneles de bienes, de dinero e IS-LM en
+    una '_FiguraPersistente' de una fila y tres columnas.
+
+    Returns:
+        callable: 'actualizar(afectados=None)', que vuelve a leer del grafo
+                  solo los artistas cuyos nodos están en 'afectados' (el
+                  conjunto que devuelve 'grafo.asignar'; None actualiza todo)
+                  y devuelve el conjunto de paneles que cambiaron.
+    """
+    Y_MAX_FIJO = 2500
+    I_MAX_FIJO = 50
+    M_MAX_FIJO = 500
+    ax_bienes, ax_dinero, ax_is_lm = figura.ax
+
+    # --- Panel 1: Cruz Keynesiana con la inversión evaluada en i_eq ---
+    ax = ax_bienes
+    ax.plot([0, Y_MAX_FIJO], [0, Y_MAX_FIJO], color='black', linestyle='--', alpha=0.7, label='Y = DA')
+    linea_da, = ax.plot([], [], color='deepskyblue', linewidth=3, label='Gasto Agregado (DA)')
+    punto_bienes, = ax.plot([], [], 'o', color='red', markersize=9)
+    guia_bienes, = ax.plot([], [], color='red', linestyle=':', alpha=0.8)
+    ax.set_title(" ", fontsize=12)
+    ax.set_xlabel("Ingreso / Producción (Y)")
+    ax.set_ylabel("Gasto Agregado (DA)")
+    ax.set_xlim(0, Y_MAX_FIJO)
+    ax.set_ylim(0, Y_MAX_FIJO)
+
+    # --- Panel 2: Mercado de dinero con el ingreso de equilibrio ---
+    ax = ax_dinero
+    linea_md, = ax.plot([], [], color='orange', linewidth=3, label='Demanda de Dinero (Md)')
+    linea_ms = ax.axvline(x=0, color='skyblue', linewidth=3, label='Oferta Real (Ms/P)')
+    punto_dinero, = ax.plot([], [], 'o', color='black', markersize=9)
+    guia_dinero, = ax.plot([], [], color='black', linestyle=':', alpha=0.8)
+    ax.set_title(" ", fontsize=12)
+    ax.set_xlabel("Cantidad Real de Dinero (M/P)")
+    ax.set_ylabel("Tasa de Interés (i)")
+    ax.set_xlim(0, M_MAX_FIJO)
+    ax.set_ylim(0, I_MAX_FIJO)
+
+    # --- Panel 3: Curvas IS y LM ---
+    ax = ax_is_lm
+    linea_is, = ax.plot([], [], color='darkorange', linewidth=3, label='IS')
+    linea_lm, = ax.plot([], [], color='darkviolet', linewidth=3, label='LM')
+    punto_is_lm, = ax.plot([], [], 'o', color='black', markersize=9)
+    guia_is_lm, = ax.plot([], [], color='black', linestyle=':', alpha=0.8)
+    ax.set_title(" ", fontsize=12)
+    ax.set_xlabel("Ingreso / Producción (Y)")
+    ax.set_ylabel("Tasa de Interés (i)")
+    ax.set_xlim(0, Y_MAX_FIJO)
+    ax.set_ylim(0, I_MAX_FIJO)
+
+    for ax, ubicacion in ((ax_bienes, 'upper left'), (ax_dinero, 'upper right'), (ax_is_lm, 'upper right')):
+        ax.grid(True, linestyle=':', alpha=0.6)
+        ax.legend(loc=ubicacion)
+    figura.registrar_dinamicos([linea_da, punto_bienes, guia_bienes, ax_bienes.title], panel=ax_bienes)
+    figura.registrar_dinamicos([linea_md, linea_ms, punto_dinero, guia_dinero, ax_dinero.title],
+                               panel=ax_dinero)
+    figura.registrar_dinamicos([linea_is, linea_lm, punto_is_lm, guia_is_lm, ax_is_lm.title],
+                               panel=ax_is_lm)
+    figura.terminar_fondo()
+
+    def ingreso():
+        Y = float(grafo['Y_eq'])
+        punto_bienes.set_data([Y], [Y])
+        guia_bienes.set_data([Y, Y, 0], [0, Y, Y])
+        ax_bienes.set_title(f"Bienes: Y = {Y:.1f} (α = {float(grafo['alpha']):.2f})", fontsize=12)
+
+    def dinero():
+        Ms_real, i = float(grafo['Ms_real']), float(grafo['i_eq'])
+        linea_ms.set_xdata([Ms_real, Ms_real])
+        punto_dinero.set_data([Ms_real], [i])
+        guia_dinero.set_data([0, Ms_real], [i, i])
+        ax_dinero.set_title(f"Dinero: i = {i:.2f}%", fontsize=12)
+
+    def equilibrio():
+        Y, i = float(grafo['Y_eq']), float(grafo['i_eq'])
+        punto_is_lm.set_data([Y], [i])
+        guia_is_lm.set_data([Y, Y, 0], [0, i, i])
+        ax_is_lm.set_title(f"IS-LM: Y = {Y:.1f}, i = {i:.2f}%", fontsize=12)
+
+    # (panel, nodos que lee, función que actualiza sus artistas)
+    enlaces = [
+        (ax_bienes, {'curva_DA', 'Y_range'}, lambda: linea_da.set_data(grafo['Y_range'], grafo['curva_DA'])),
+        (ax_bienes, {'Y_eq', 'alpha'}, ingreso),
+        (ax_dinero, {'curva_Md', 'i_range'}, lambda: linea_md.set_data(grafo['curva_Md'], grafo['i_range'])),
+        (ax_dinero, {'Ms_real', 'i_eq'}, dinero),
+        (ax_is_lm, {'curva_IS', 'Y_range'}, lambda: linea_is.set_data(grafo['Y_range'], grafo['curva_IS'])),
+        (ax_is_lm, {'curva_LM', 'Y_range'}, lambda: linea_lm.set_data(grafo['Y_range'], grafo['curva_LM'])),
+        (ax_is_lm, {'Y_eq', 'i_eq'}, equilibrio),
+    ]
+
+    def actualizar(afectados=None):
+        paneles = set()
+        for panel, nodos, funcion in enlaces:
+            if afectados is None or not nodos.isdisjoint(afectados):
+                funcion()
+                paneles.add(panel)
+        return paneles
+
+    return actualizar
+
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 5.2: FUNCIÓN PRINCIPAL PARA CREAR LA INTERFAZ
+# ------------------------------------------------------------------------------
+def crear_dashboard_is_lm(max_fps=None, ejecutor='auto', instrumentar=None):
+    """
+    Crea y devuelve el dashboard IS-LM enlazado: sliders de los mercados de
+    bienes y de dinero y una figura persistente con tres paneles.
+
+    Args:
+        max_fps (float): Agrupa los eventos de los sliders y renderiza como
+                         máximo 'max_fps' veces por segundo (ver
+                         'crear_grafica_mercado_bienes').
+        ejecutor (str): 'auto', 'asyncio' o 'hilo' (ver '_PlanificadorRender').
+        instrumentar (Instrumentacion | bool): Mide cada redibujado por fases
+                         (ver 'crear_grafica_mercado_bienes').
+    """
+    _cargar_dependencias()
+    grafo = crear_grafo_is_lm()
+
+    # --- 5.2.1. Creación de Widgets de la Interfaz ---
+    slider_layout = widgets.Layout(width='80%')
+    sliders = {
+        'g0': ("Gasto Público (g0):", widgets.FloatSlider(
+            value=200, min=100, max=300, step=10, layout=slider_layout, readout_format='.0f')),
+        't1': ("Tasa Impositiva (t1):", widgets.FloatSlider(
+            value=0.2, min=0.1, max=0.5, step=0.05, layout=slider_layout, readout_format='.2f')),
+        'i0': ("Inversión Autónoma (i0):", widgets.FloatSlider(
+            value=150, min=50, max=250, step=10, layout=slider_layout, readout_format='.0f')),
+        'nx0': ("Export. Netas Autónomas (nx0):", widgets.FloatSlider(
+            value=100, min=-50, max=200, step=10, layout=slider_layout, readout_format='.0f')),
+        'b': ("Sensibilidad de la Inversión a i (b):", widgets.FloatSlider(
+            value=B_BASE, min=1, max=30, step=1, layout=slider_layout, readout_format='.0f')),
+        'Ms': ("Oferta Monetaria (Ms):", widgets.FloatSlider(
+            value=150, min=50, max=250, step=10, layout=slider_layout, readout_format='.0f')),
+        'P': ("Nivel de Precios (P):", widgets.FloatSlider(
+            value=1, min=0.5, max=2, step=0.1, layout=slider_layout, readout_format='.1f')),
+    }
+
+    figura = _FiguraPersistente(figsize=(16, 5.5), ncols=3)
+    actualizar_artistas = preparar_figura_is_lm(figura, grafo)
+
+    # --- 5.2.2. Función de Dibujo ---
+    # 'grafo.asignar' devuelve los nodos afectados por el cambio; solo esos se
+    # recalculan (al leerlos) y solo sus paneles se redibujan. El primer tick
+    # dibuja todo.
+    primer_tick = [True]
+
+    def dibujar(parametros, cancelado=None, medicion=None):
+        afectados = grafo.asignar(**parametros)
+        if primer_tick[0]:
+            primer_tick[0] = False
+            afectados = None
+        elif not afectados:
+            return
+        paneles = actualizar_artistas(afectados)
+        if medicion is not None:
+            medicion.marca('modelo')
+        figura.actualizar(cancelado, medicion, paneles=None if afectados is None else paneles)
+
+    # --- 5.2.3. Lógica de Interacción (Observadores) ---
+    instrumentacion = _instrumentacion(instrumentar, 'is_lm')
+    if instrumentacion is not None:
+        dibujar = instrumentacion.envolver(dibujar)
+
+    planificador = None
+    if max_fps is not None:
+        planificador = _PlanificadorRender(
+            lambda estado, cancelado: dibujar(estado, cancelado=cancelado),
+            max_fps=max_fps, ejecutor=ejecutor)
+
+    def on_value_change(change):
+        estado = {nombre: slider.value for nombre, (_, slider) in sliders.items()}
+        if planificador is None or change is None:
+            dibujar(estado)
+        else:
+            planificador.solicitar(estado)
+
+    for _, slider in sliders.values():
+        slider.observe(on_value_change, names='value')
+
+    # --- 5.2.4. Organización de la Interfaz ---
+    controles = widgets.VBox([widgets.VBox([widgets.Label(etiqueta), slider])
+                              for etiqueta, slider in sliders.values()],
+                             layout=widgets.Layout(width='350px'))
+    controles.children += (figura.etiqueta_latencia,)
+    if instrumentacion is not None:
+        controles.children += (instrumentacion.crear_widget(),)
+    ui = widgets.HBox([controles, figura.widget], layout=widgets.Layout(align_items='center'))
+
+    on_value_change(None)
+    # El grafo queda accesible para inspeccionar valores y recálculos
+    # (p. ej. 'ui.grafo.evaluaciones').
+    ui.grafo = grafo
+    return ui
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 5.3: EJECUCIÓN Y VISUALIZACIÓN
+# ------------------------------------------------------------------------------
+# En el cuaderno basta con llamar a 'crear_dashboard_is_lm()' al final de una
+# celda (ver el bloque final de este archivo).
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 6: DASHBOARD MUNDELL-FLEMING (CUATRO CUADRANTES)
+# ------------------------------------------------------------------------------
+# Visualiza simultáneamente los cuatro mercados de una economía abierta con tipo
+# de cambio flexible y perfecta movilidad de capitales: el mercado cambiario
+# (UIP), el equilibrio DD-AA, el mercado de dinero y la demanda agregada. Los
+# cálculos se hacen con 'calcular_modelo' de 'ModelCode.py'.
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 6.1: CONFIGURACIÓN DEL ESTILO
+# ------------------------------------------------------------------------------
+# Paleta de colores y límites fijos de cada eje para que los cuadrantes no
+# "salten" al mover los sliders.
+COLORES = {
+    'base': 'gray',
+    'uip': 'mediumpurple',
+    'dd': 'deepskyblue',
+    'aa': 'orange',
+    'dinero': 'orange',
+    'oferta': 'skyblue',
+    'da': 'deepskyblue',
+    'equilibrio': 'red',
+    'anotacion': 'darkred',
+}
+LIMITES_MF = {'Y': (700, 1300), 'e': (9, 11), 'i': (0, 10), 'M': (50, 250)}
+
+
+def _escenario(res, j):
+    # Extrae el escenario 'j' de la estructura de arreglos como floats.
+    return {clave: float(valor[j]) for clave, valor in res.items()}
+
+
+def _estilo(base):
+    # Las curvas del equilibrio inicial (A) se dibujan en gris y punteadas.
+    if base:
+        return {'color': COLORES['base'], 'linestyle': '--', 'linewidth': 1.5, 'alpha': 0.7}
+    return {'linewidth': 3}
+
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 6.2: FUNCIONES DE GRÁFICOS (UNA POR CUADRANTE)
+# ------------------------------------------------------------------------------
+def plot_mercado_cambiario(ax, esc, base=False):
+    """Cuadrante 1: paridad de tasas de interés (UIP) en el plano (i, e)."""
+    i_range = np.linspace(*LIMITES_MF['i'], 100)
+    estilo = _estilo(base)
+    ax.plot(i_range, curva_uip(i_range, esc['i_star']), **{'color': COLORES['uip'], **estilo},
+            label=None if base else 'UIP')
+    ax.plot(esc['i'], esc['e'], 'o', markersize=8,
+            color=COLORES['base'] if base else COLORES['equilibrio'])
+    if not base:
+        ax.axvline(esc['i_star'], color='black', linestyle=':', alpha=0.6, label=f"i* = {esc['i_star']:.1f}")
+        ax.set_title("1. Mercado Cambiario (UIP)", fontsize=13)
+        ax.set_xlabel("Tasa de Interés (i)")
+        ax.set_ylabel("Tipo de Cambio (e)")
+        ax.set_xlim(*LIMITES_MF['i'])
+        ax.set_ylim(*LIMITES_MF['e'])
+        ax.grid(True, linestyle=':', alpha=0.6)
+        ax.legend(loc='upper right')
+
+
+def plot_dd_aa(ax, esc, base=False):
+    """Cuadrante 2: equilibrio DD-AA en el plano (Y, e)."""
+    Y_range = np.linspace(*LIMITES_MF['Y'], 100)
+    e_range = np.linspace(*LIMITES_MF['e'], 100)
+    estilo = _estilo(base)
+    ax.plot(curva_dd(e_range, esc['DA_autonoma'], esc['i_star']), e_range,
+            **{'color': COLORES['dd'], **estilo}, label=None if base else 'DD (bienes)')
+    ax.plot(Y_range, curva_aa(Y_range, esc['Ms_real'], esc['i_star']),
+            **{'color': COLORES['aa'], **estilo}, label=None if base else 'AA (activos)')
+    ax.plot(esc['Y'], esc['e'], 'o', markersize=8,
+            color=COLORES['base'] if base else COLORES['equilibrio'])
+    if not base:
+        ax.set_title(f"2. Equilibrio DD-AA (Y={esc['Y']:.1f}, e={esc['e']:.2f})", fontsize=13)
+        ax.set_xlabel("Producción (Y)")
+        ax.set_ylabel("Tipo de Cambio (e)")
+        ax.set_xlim(*LIMITES_MF['Y'])
+        ax.set_ylim(*LIMITES_MF['e'])
+        ax.grid(True, linestyle=':', alpha=0.6)
+        ax.legend(loc='upper left')
+
+
+def plot_mercado_dinero_mf(ax, esc, base=False):
+    """Cuadrante 3: mercado de dinero en el plano (M/P, i)."""
+    i_range = np.linspace(*LIMITES_MF['i'], 100)
+    estilo = _estilo(base)
+    ax.plot(demanda_dinero(i_range, esc['Y'], MODELO_PARAMS['k'], MODELO_PARAMS['h']), i_range,
+            **{'color': COLORES['dinero'], **estilo}, label=None if base else 'Demanda de Dinero (L)')
+    ax.axvline(esc['Ms_real'], **{'color': COLORES['oferta'], **estilo},
+               label=None if base else 'Oferta Real (Ms/P)')
+    ax.plot(esc['Ms_real'], esc['i'], 'o', markersize=8,
+            color=COLORES['base'] if base else COLORES['equilibrio'])
+    if not base:
+        ax.set_title(f"3. Mercado de Dinero (i={esc['i']:.2f}%)", fontsize=13)
+        ax.set_xlabel("Cantidad Real de Dinero (M/P)")
+        ax.set_ylabel("Tasa de Interés (i)")
+        ax.set_xlim(*LIMITES_MF['M'])
+        ax.set_ylim(*LIMITES_MF['i'])
+        ax.grid(True, linestyle=':', alpha=0.6)
+        ax.legend(loc='upper right')
+
+
+def plot_demanda_agregada(ax, esc, base=False):
+    """Cuadrante 4: Cruz Keynesiana de la economía abierta en el plano (Y, DA)."""
+    Y_range = np.linspace(*LIMITES_MF['Y'], 100)
+    estilo = _estilo(base)
+    ax.plot(Y_range, demanda_agregada_abierta(Y_range, esc['DA_autonoma'], esc['i'], esc['e']),
+            **{'color': COLORES['da'], **estilo}, label=None if base else 'Gasto Agregado (DA)')
+    ax.plot(esc['Y'], esc['Y'], 'o', markersize=8,
+            color=COLORES['base'] if base else COLORES['equilibrio'])
+    if not base:
+        ax.plot(Y_range, Y_range, color='black', linestyle='--', alpha=0.7, label='Y = DA')
+        ax.set_title(f"4. Demanda Agregada (NX={esc['NX']:.1f})", fontsize=13)
+        ax.set_xlabel("Ingreso / Producción (Y)")
+        ax.set_ylabel("Gasto Agregado (DA)")
+        ax.set_xlim(*LIMITES_MF['Y'])
+        ax.set_ylim(*LIMITES_MF['Y'])
+        ax.grid(True, linestyle=':', alpha=0.6)
+        ax.legend(loc='upper left')
+
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 6.3: LÓGICA DE AJUSTE Y ANOTACIONES
+# ------------------------------------------------------------------------------
+def _flecha(ax, desde, hasta, texto, posicion_texto):
+    # Flecha del equilibrio A al B con una caja de texto numerada.
+    ax.annotate('', xy=hasta, xytext=desde,
+                arrowprops=dict(arrowstyle='->', color=COLORES['anotacion'], lw=2))
+    ax.text(*posicion_texto, texto, transform=ax.transAxes, fontsize=9, va='bottom',
+            bbox=dict(boxstyle='round', facecolor='lightyellow', edgecolor=COLORES['anotacion']))
+
+
+def anotar_ajuste(axs, base, final, tolerancia=1e-6):
+    """
+    Dibuja flechas del equilibrio inicial (A) al final (B) en cada cuadrante
+    y cajas numeradas que explican la secuencia del ajuste.
+
+    Args:
+        axs: Matriz 2x2 de ejes en el orden de los cuadrantes 1-4.
+        base, final (dict): Escenarios devueltos por '_escenario'.
+    """
+    ax_cambiario, ax_dd_aa = axs[0]
+    ax_dinero, ax_da = axs[1]
+    di, de, dY = final['i'] - base['i'], final['e'] - base['e'], final['Y'] - base['Y']
+    if max(abs(di), abs(de), abs(dY)) < tolerancia:
+        return
+
+    def signo(x):
+        # Un cambio dentro de la tolerancia no es una subida ni una bajada.
+        if abs(x) <= tolerancia:
+            return '='
+        return '↑' if x > 0 else '↓'
+
+    # 1. Mercado de dinero: un cambio en Ms/P (o en Y) mueve la tasa de interés.
+    dM = final['Ms_real'] - base['Ms_real']
+    causas = []
+    if abs(dM) > tolerancia:
+        causas.append(f"{signo(dM)}Ms/P")
+    if abs(dY) > tolerancia:
+        causas.append(f"{signo(dY)}Y → {signo(dY)}L")
+    _flecha(ax_dinero, (base['Ms_real'], base['i']), (final['Ms_real'], final['i']),
+            f"1. {' y '.join(causas)} → {signo(di)}i ({base['i']:.2f}% → {final['i']:.2f}%)", (0.03, 0.03))
+
+    # 2. Mercado cambiario: el diferencial con i* genera flujos de capital.
+    salida = final['i'] < final['i_star']
+    if abs(de) <= tolerancia:
+        movimiento = 'sin cambio'
+    else:
+        movimiento = 'depreciación' if de > 0 else 'apreciación'
+    _flecha(ax_cambiario, (base['i'], base['e']), (final['i'], final['e']),
+            f"2. i {'<' if salida else '>'} i* → {'salida' if salida else 'entrada'} de capitales\n"
+            f"   → {signo(de)}e ({movimiento})", (0.03, 0.03))
+
+    # 3. DD-AA: el nuevo tipo de cambio (vía NX) y el shock de demanda fijan
+    #    la producción.
+    causas = []
+    dG = final['shock_demanda'] - base['shock_demanda']
+    if abs(dG) > tolerancia:
+        causas.append(f"{signo(dG)}G")
+    if abs(de) > tolerancia:
+        causas.append(f"{signo(de)}e → {signo(de)}NX")
+    _flecha(ax_dd_aa, (base['Y'], base['e']), (final['Y'], final['e']),
+            f"3. {' y '.join(causas)} → {signo(dY)}Y", (0.45, 0.03))
+
+    # 4. Demanda agregada: nuevo equilibrio en la Cruz Keynesiana.
+    _flecha(ax_da, (base['Y'], base['Y']), (final['Y'], final['Y']),
+            f"4. Nuevo equilibrio: Y = {base['Y']:.1f} → {final['Y']:.1f}", (0.45, 0.03))
+
+
+def plot_trayectoria_ajuste(ax, final, pasos=60):
+    """
+    Dibuja en el cuadrante DD-AA el camino que sigue la economía de A a B,
+    paso a paso, según 'simular_ajuste'.
+    """
+    trayectoria = simular_ajuste(final['shock_demanda'], final['shock_monetario'], final['i_star'],
+                                 pasos=pasos, tolerancia=1e-3)
+    puntos = [(float(estado['Y']), float(estado['e'])) for estado in trayectoria]
+    Y, e = zip(*puntos)
+    ax.plot(Y, e, linestyle=':', marker='.', markersize=4, color=COLORES['anotacion'],
+            alpha=0.6, label='Trayectoria de ajuste')
+    ax.legend(loc='upper left')
+
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 6.4: FUNCIÓN PRINCIPAL DEL DASHBOARD
+# ------------------------------------------------------------------------------
+def dibujar_dashboard_mundell_fleming(shock_demanda=0.0, shock_monetario=0.0,
+                                      i_star=None, mostrar_ajuste=False, medicion=None):
+    """
+    Calcula el equilibrio inicial (A) y el final (B) con una sola llamada a
+    'calcular_modelo' y dibuja los cuatro cuadrantes. 'medicion' es la
+    medición del tick en curso (ver 'Instrumentacion'), si la hay.
+
+    Returns:
+        matplotlib.figure.Figure: La figura con los cuatro cuadrantes.
+    """
+    _cargar_dependencias()
+    i_star_base = MODELO_PARAMS['i_star']
+    if i_star is None:
+        i_star = i_star_base
+    res = calcular_modelo([0.0, shock_demanda], [0.0, shock_monetario], [i_star_base, i_star])
+    base, final = _escenario(res, 0), _escenario(res, 1)
+    if medicion is not None:
+        medicion.marca('modelo')
+
+    fig, axs = plt.subplots(2, 2, figsize=(14, 10))
+    funciones = [plot_mercado_cambiario, plot_dd_aa, plot_mercado_dinero_mf, plot_demanda_agregada]
+    for ax, funcion in zip(axs.flat, funciones):
+        if mostrar_ajuste:
+            funcion(ax, base, base=True)
+        funcion(ax, final)
+    if mostrar_ajuste:
+        anotar_ajuste(axs, base, final)
+        plot_trayectoria_ajuste(axs[0][1], final)
+
+    fig.suptitle("Modelo Mundell-Fleming (Tipo de Cambio Flexible)", fontsize=16)
+    if medicion is not None:
+        medicion.marca('dibujo')
+    fig.tight_layout()
+    if medicion is not None:
+        medicion.marca('layout')
+    return fig
+
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 6.5: CREACIÓN DE LA INTERFAZ
+# ------------------------------------------------------------------------------
+def crear_dashboard_mundell_fleming(instrumentar=None):
+    """
+    Crea y devuelve el dashboard interactivo del modelo Mundell-Fleming con
+    sliders para los shocks y una casilla para el mecanismo de ajuste.
+
+    Args:
+        instrumentar (Instrumentacion | bool): Mide cada redibujado por fases
+                         (ver 'crear_grafica_mercado_bienes').
+    """
+    _cargar_dependencias()
+    slider_layout = widgets.Layout(width='95%')
+    estilo = {'description_width': '120px'}
+
+    demanda_slider = widgets.FloatSlider(value=0, min=-100, max=100, step=10, description="Shock Demanda",
+                                         layout=slider_layout, style=estilo, readout_format='.0f')
+    monetario_slider = widgets.FloatSlider(value=0, min=-50, max=50, step=5, description="Shock Monetario",
+                                           layout=slider_layout, style=estilo, readout_format='.0f')
+    i_star_slider = widgets.FloatSlider(value=MODELO_PARAMS['i_star'], min=2, max=8, step=0.5,
+                                        description="Tasa Mundial (i*)", layout=slider_layout,
+                                        style=estilo, readout_format='.1f')
+    ajuste_checkbox = widgets.Checkbox(value=False, description="⚙️ Mostrar Mecanismo de Ajuste")
+
+    def dibujar(shock_demanda, shock_monetario, i_star, mostrar_ajuste, medicion=None):
+        dibujar_dashboard_mundell_fleming(shock_demanda, shock_monetario, i_star, mostrar_ajuste,
+                                          medicion)
+        plt.show()
+        if medicion is not None:
+            medicion.marca('salida')
+
+    instrumentacion = _instrumentacion(instrumentar, 'mundell_fleming')
+    if instrumentacion is not None:
+        # 'interactive_output' llama a la función con argumentos por nombre.
+        dibujar_instrumentada = instrumentacion.envolver(dibujar)
+
+        def dibujar(shock_demanda, shock_monetario, i_star, mostrar_ajuste):
+            dibujar_instrumentada(shock_demanda, shock_monetario, i_star, mostrar_ajuste)
+
+    # 'interactive_output' conecta los widgets con la función de dibujo (como
+    # 'interact'), pero permite ubicar los controles libremente.
+    salida = widgets.interactive_output(dibujar, {
+        'shock_demanda': demanda_slider,
+        'shock_monetario': monetario_slider,
+        'i_star': i_star_slider,
+        'mostrar_ajuste': ajuste_checkbox,
+    })
+    controles = widgets.VBox([demanda_slider, monetario_slider, i_star_slider, ajuste_checkbox],
+                             layout=widgets.Layout(width='500px'))
+    if instrumentacion is not None:
+        controles.children += (instrumentacion.crear_widget(),)
+    return widgets.VBox([controles, salida])
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 6.6: EJECUCIÓN Y VISUALIZACIÓN
 # ------------------------------------------------------------------------------
-# Para mostrar la interfaz interactiva en el cuaderno de Jupyter,
-# simplemente llamamos a la función principal.
-display(crear_grafica_mercado_dinero())
+# Para mostrar las interfaces al ejecutar el archivo como script (p. ej.
+# '%run GraphsCode.py'). Importar el módulo no tiene efectos.
+if __name__ == '__main__':
+    _cargar_dependencias()
+    display(crear_grafica_mercado_bienes())
+    display(crear_grafica_mercado_dinero())
+    display(crear_dashboard_is_lm())
+    display(crear_dashboard_mundell_fleming())
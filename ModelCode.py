@@ -0,0 +1,571 @@
+# -*- coding: utf-8 -*-
+# ==============================================================================
+# TÍTULO: MOTOR DE EQUILIBRIO (CÁLCULOS SIN INTERFAZ)
+# ==============================================================================
+"""
+Motor de Equilibrio para los Mercados de Bienes y de Dinero
+
+Este módulo contiene únicamente la matemática de los modelos que se visualizan
+en 'GraphsCode.py'. No importa widgets ni matplotlib: todas las funciones
+reciben arreglos de NumPy (o escalares) y devuelven arreglos de equilibrio,
+de modo que miles o millones de escenarios se resuelven en una sola llamada
+vectorizada.
+"""
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 1: IMPORTACIÓN DE LIBRERÍAS
+# ------------------------------------------------------------------------------
+import numpy as np
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 2: PARÁMETROS FIJOS DE LOS MODELOS
+# ------------------------------------------------------------------------------
+# Valores que los dashboards asumen constantes (no tienen slider propio).
+C0_BASE = 50   # Consumo autónomo (asumido)
+C1_BASE = 0.6  # Propensión Marginal a Consumir
+K_BASE = 0.5   # Sensibilidad de la demanda de dinero al ingreso
+H_BASE = 10    # Sensibilidad de la demanda de dinero a la tasa de interés
+B_BASE = 10    # Sensibilidad de la inversión a la tasa de interés (modelo IS-LM)
+
+# Dominios (mínimo, máximo, paso) de los sliders de 'GraphsCode.py'. El orden
+# de las claves es el orden de los argumentos de las funciones de equilibrio.
+DOMINIOS_BIENES = {
+    'g0': (100, 300, 10),
+    't1': (0.1, 0.5, 0.05),
+    'i0': (50, 250, 10),
+    'nx0': (-50, 200, 10),
+}
+DOMINIOS_DINERO = {
+    'Ms': (50, 250, 10),
+    'Y': (500, 1500, 25),
+    'P': (0.5, 2, 0.1),
+}
+
+
+def valores_dominio(dominio):
+    """Devuelve los valores discretos (mínimo, mínimo + paso, ..., máximo) de un slider."""
+    minimo, maximo, paso = dominio
+    n = int(round((maximo - minimo) / paso)) + 1
+    return np.round(minimo + paso * np.arange(n), 10)
+
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 3: MERCADO DE BIENES (CRUZ KEYNESIANA)
+# ------------------------------------------------------------------------------
+def equilibrio_mercado_bienes(g0, t1, i0, nx0, c0=C0_BASE, c1=C1_BASE):
+    """
+    Calcula el equilibrio de la Cruz Keynesiana para uno o muchos escenarios.
+
+    Todos los argumentos pueden ser escalares o arreglos; se combinan con las
+    reglas de broadcasting de NumPy.
+
+    Returns:
+        dict: 'alpha' (multiplicador), 'A' (gasto autónomo) e 'Y_eq'
+              (ingreso de equilibrio), cada uno como arreglo de NumPy.
+    """
+    g0, t1, i0, nx0, c0, c1 = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (g0, t1, i0, nx0, c0, c1))
+    )
+    # 'alpha' es el multiplicador keynesiano.
+    alpha = 1.0 / (1.0 - c1 * (1.0 - t1))
+    # 'A' es la suma de todos los componentes autónomos del gasto.
+    A = c0 + i0 + g0 + nx0
+    # 'Y_eq' es el ingreso de equilibrio, donde la producción iguala al gasto.
+    Y_eq = alpha * A
+    return {'alpha': alpha, 'A': A, 'Y_eq': Y_eq}
+
+
+def demanda_agregada(Y_range, A, c1, t1):
+    """
+    Evalúa la función de Gasto Agregado DA = A + c1(1 - t1)Y sobre 'Y_range'.
+
+    Si 'A', 'c1' o 't1' son arreglos de n escenarios, devuelve una matriz
+    (n, len(Y_range)) con una curva por fila.
+    """
+    Y_range = np.asarray(Y_range, dtype=float)
+    A = np.asarray(A, dtype=float)[..., None]
+    pendiente = (np.asarray(c1, dtype=float) * (1.0 - np.asarray(t1, dtype=float)))[..., None]
+    return A + pendiente * Y_range
+
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 4: MERCADO DE DINERO (MODELO LM)
+# ------------------------------------------------------------------------------
+def equilibrio_mercado_dinero(Ms, Y, P, k=K_BASE, h=H_BASE):
+    """
+    Calcula el equilibrio del mercado de dinero Ms/P = kY - hi para uno o
+    muchos escenarios (escalares o arreglos con broadcasting).
+
+    Returns:
+        dict: 'Ms_real' (oferta real de dinero) e 'i_eq' (tasa de interés
+              de equilibrio), cada uno como arreglo de NumPy.
+    """
+    Ms, Y, P, k, h = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (Ms, Y, P, k, h))
+    )
+    # La oferta real de dinero es la oferta nominal (Ms) dividida por el nivel de precios (P).
+    Ms_real = Ms / P
+    # Se despeja 'i' de la condición de equilibrio Ms/P = kY - hi.
+    i_eq = (k * Y - Ms_real) / h
+    return {'Ms_real': Ms_real, 'i_eq': i_eq}
+
+
+def demanda_dinero(i_range, Y, k=K_BASE, h=H_BASE):
+    """
+    Evalúa la Demanda de Dinero Md = kY - hi sobre 'i_range'.
+
+    Si 'Y', 'k' o 'h' son arreglos de n escenarios, devuelve una matriz
+    (n, len(i_range)) con una curva por fila.
+    """
+    i_range = np.asarray(i_range, dtype=float)
+    Y = np.asarray(Y, dtype=float)[..., None]
+    k = np.asarray(k, dtype=float)[..., None]
+    h = np.asarray(h, dtype=float)[..., None]
+    return k * Y - h * i_range
+
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 5: MODELO MUNDELL-FLEMING (TIPO DE CAMBIO FLEXIBLE)
+# ------------------------------------------------------------------------------
+# Parámetros base de la economía abierta. Las ecuaciones (lineales) son:
+#   Bienes (DD):  Y = c0 + c1(1 - t1)Y + I0 - b·i + G + nx0 + n·e - m·Y
+#   Dinero (LM):  Ms/P = k·Y - h·i
+#   UIP:          i = i* + phi·(e_esperado - e)
+# donde 'e' es el tipo de cambio (moneda local por unidad extranjera; un
+# aumento es una depreciación). Con estos valores el equilibrio base es
+# Y = 1000, i = i* = 5 y e = e_esperado = 10.
+MODELO_PARAMS = {
+    'c0': 50,           # Consumo autónomo
+    'c1': 0.6,          # Propensión Marginal a Consumir
+    't1': 0.2,          # Tasa impositiva
+    'I0': 150,          # Inversión autónoma
+    'b': 10,            # Sensibilidad de la inversión a la tasa de interés
+    'G': 200,           # Gasto público
+    'nx0': 100,         # Exportaciones netas autónomas
+    'n': 17,            # Sensibilidad de las exportaciones netas al tipo de cambio
+    'm': 0.1,           # Propensión marginal a importar
+    'Ms': 150,          # Oferta monetaria nominal
+    'P': 1,             # Nivel de precios (fijo en el corto plazo)
+    'k': 0.2,           # Sensibilidad de la demanda de dinero al ingreso
+    'h': 10,            # Sensibilidad de la demanda de dinero a la tasa de interés
+    'i_star': 5,        # Tasa de interés mundial (%)
+    'e_esperado': 10,   # Tipo de cambio esperado
+    'phi': 10,          # Pendiente de la UIP: 100/e_esperado puntos por unidad de 'e'
+}
+
+
+def _parametros(params):
+    # Combina los parámetros base con los que se indiquen (escalares o arreglos).
+    completos = dict(MODELO_PARAMS)
+    if params:
+        desconocidos = set(params) - set(MODELO_PARAMS)
+        if desconocidos:
+            raise KeyError(f"Parámetros desconocidos: {sorted(desconocidos)}")
+        completos.update(params)
+    return {clave: np.asarray(valor, dtype=float) for clave, valor in completos.items()}
+
+
+def calcular_modelo(shock_demanda=0.0, shock_monetario=0.0, i_star=None, params=None):
+    """
+    Resuelve el modelo Mundell-Fleming para uno o muchos vectores de shocks.
+
+    Para cada escenario se arma el sistema lineal 3x3 en (Y, i, e) de las
+    ecuaciones DD, LM y UIP y todos los sistemas se resuelven con una sola
+    llamada a 'np.linalg.solve'. Si los parámetros estructurales son
+    escalares, la matriz es común y se factoriza una única vez para todos
+    los lados derechos.
+
+    Args:
+        shock_demanda: Cambio en el gasto autónomo (política fiscal).
+        shock_monetario: Cambio en la oferta monetaria nominal.
+        i_star: Tasa de interés mundial (por defecto la de MODELO_PARAMS).
+        params (dict): Reemplazos de MODELO_PARAMS; también admiten arreglos.
+
+    Todos los argumentos se combinan con broadcasting.
+
+    Returns:
+        dict: Estructura de arreglos con la forma común de los escenarios:
+              'Y', 'i', 'e' (equilibrio), 'NX' (exportaciones netas),
+              'DA_autonoma' (gasto autónomo total), 'Ms_real', y los shocks
+              'shock_demanda', 'shock_monetario', 'i_star'.
+    """
+    p = _parametros(params)
+    if i_star is None:
+        i_star = p['i_star']
+    shock_demanda, shock_monetario, i_star = (np.asarray(v, dtype=float)
+                                              for v in (shock_demanda, shock_monetario, i_star))
+
+    # --- Matriz de coeficientes A·[Y, i, e] = d ---
+    s = 1.0 - p['c1'] * (1.0 - p['t1']) + p['m']
+    cero, uno = np.zeros_like(s), np.ones_like(s)
+    A = np.stack(np.broadcast_arrays(
+        s, p['b'], -p['n'],
+        p['k'], -p['h'], cero,
+        cero, uno, p['phi'],
+    ), axis=-1)
+    A = A.reshape(A.shape[:-1] + (3, 3))
+
+    # --- Lado derecho para cada vector de shocks ---
+    DA_autonoma = p['c0'] + p['I0'] + p['G'] + p['nx0'] + shock_demanda
+    Ms_real = (p['Ms'] + shock_monetario) / p['P']
+    d = np.stack(np.broadcast_arrays(DA_autonoma, Ms_real,
+                                     i_star + p['phi'] * p['e_esperado']), axis=-1)
+
+    if A.ndim == 2:
+        # Una sola factorización para todos los escenarios.
+        forma = d.shape[:-1]
+        x = np.linalg.solve(A, d.reshape(-1, 3).T).T.reshape(forma + (3,))
+    else:
+        A, d = np.broadcast_arrays(A, d[..., None])
+        x = np.linalg.solve(A, d)[..., 0]
+
+    Y, i, e = x[..., 0], x[..., 1], x[..., 2]
+    forma = Y.shape
+    return {
+        'Y': Y,
+        'i': i,
+        'e': e,
+        'NX': np.broadcast_to(p['nx0'] + p['n'] * e - p['m'] * Y, forma),
+        'DA_autonoma': np.broadcast_to(DA_autonoma, forma),
+        'Ms_real': np.broadcast_to(Ms_real, forma),
+        'shock_demanda': np.broadcast_to(shock_demanda, forma),
+        'shock_monetario': np.broadcast_to(shock_monetario, forma),
+        'i_star': np.broadcast_to(i_star, forma),
+    }
+
+
+def curva_uip(i_range, i_star, params=None):
+    """Tipo de cambio compatible con la UIP para cada tasa de interés: e(i)."""
+    p = _parametros(params)
+    return p['e_esperado'] - (np.asarray(i_range, dtype=float) - i_star) / p['phi']
+
+
+def curva_dd(e_range, DA_autonoma, i_star, params=None):
+    """
+    Curva DD: ingreso que equilibra el mercado de bienes para cada tipo de
+    cambio, con la tasa de interés dada por la UIP.
+    """
+    p = _parametros(params)
+    e_range = np.asarray(e_range, dtype=float)
+    s = 1.0 - p['c1'] * (1.0 - p['t1']) + p['m']
+    i = i_star + p['phi'] * (p['e_esperado'] - e_range)
+    return (DA_autonoma - p['b'] * i + p['n'] * e_range) / s
+
+
+def curva_aa(Y_range, Ms_real, i_star, params=None):
+    """
+    Curva AA: tipo de cambio que equilibra el mercado de activos (dinero y
+    UIP) para cada nivel de ingreso.
+    """
+    p = _parametros(params)
+    i = (p['k'] * np.asarray(Y_range, dtype=float) - Ms_real) / p['h']
+    return curva_uip(i, i_star, params)
+
+
+def demanda_agregada_abierta(Y_range, DA_autonoma, i, e, params=None):
+    """Gasto agregado DA(Y) de la economía abierta dados 'i' y 'e'."""
+    p = _parametros(params)
+    Y_range = np.asarray(Y_range, dtype=float)
+    pendiente = p['c1'] * (1.0 - p['t1']) - p['m']
+    return DA_autonoma - p['b'] * i + p['n'] * e + pendiente * Y_range
+
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 6: MECANISMO DE AJUSTE (SIMULACIÓN DINÁMICA)
+# ------------------------------------------------------------------------------
+# El ajuste de A a B se modela como un sistema en diferencias. En cada paso:
+#   1. El mercado de dinero se vacía con el ingreso del paso anterior:
+#        i_t = (k·Y_{t-1} - Ms/P) / h
+#   2. El diferencial i_t - i* mueve capitales y el tipo de cambio se acerca
+#      al valor compatible con la UIP:
+#        e_t = e_{t-1} + vel_e·(e_UIP(i_t) - e_{t-1})
+#   3. La producción se ajusta hacia el gasto agregado:
+#        Y_t = Y_{t-1} + vel_y·(DA(Y_{t-1}, i_t, e_t) - Y_{t-1})
+# El punto fijo del sistema es el equilibrio de 'calcular_modelo'.
+def simular_ajuste(shock_demanda=0.0, shock_monetario=0.0, i_star=None, params=None,
+                   pasos=50, vel_e=0.5, vel_y=0.3, estado_inicial=None, tolerancia=None):
+    """
+    Generador que recorre paso a paso el ajuste tras uno o muchos shocks.
+
+    Todos los shocks se simulan a la vez (vectorizado); en cada paso solo se
+    mantienen en memoria los arreglos del estado actual, así que horizontes
+    largos y conjuntos grandes de shocks se pueden volcar a gráficos o a
+    disco sin guardar toda la trayectoria.
+
+    Args:
+        shock_demanda, shock_monetario, i_star, params: Igual que en
+            'calcular_modelo' (se combinan con broadcasting).
+        pasos (int): Número máximo de pasos.
+        vel_e, vel_y (float): Velocidades de ajuste del tipo de cambio y de
+            la producción, entre 0 y 1.
+        estado_inicial (dict): 'Y' y 'e' iniciales; por defecto el
+            equilibrio base sin shocks (punto A).
+        tolerancia (float): Si se indica, la simulación termina cuando todos
+            los escenarios cambian menos que este valor en 'Y' y en 'e'.
+
+    Yields:
+        dict: 't' (paso) y los arreglos 'Y', 'i', 'e', 'NX' y 'diferencial'
+              (i - i*, que determina la dirección de los flujos de capital).
+              El paso 0 es el estado inicial (punto A), con la tasa y el
+              diferencial previos al shock.
+    """
+    p = _parametros(params)
+    if i_star is None:
+        i_star = p['i_star']
+    shock_demanda, shock_monetario, i_star = (np.asarray(v, dtype=float)
+                                              for v in (shock_demanda, shock_monetario, i_star))
+    # Como en 'calcular_modelo', los parámetros estructurales también pueden
+    # ser arreglos: el estado tiene la forma común de shocks y parámetros.
+    forma = np.broadcast_shapes(shock_demanda.shape, shock_monetario.shape, i_star.shape,
+                                *(valor.shape for valor in p.values()))
+
+    if estado_inicial is None:
+        estado_inicial = calcular_modelo(params=params)
+    Y = np.array(np.broadcast_to(estado_inicial['Y'], forma), dtype=float)
+    e = np.array(np.broadcast_to(estado_inicial['e'], forma), dtype=float)
+
+    DA_autonoma = p['c0'] + p['I0'] + p['G'] + p['nx0'] + shock_demanda
+    Ms_real = (p['Ms'] + shock_monetario) / p['P']
+    pendiente = p['c1'] * (1.0 - p['t1']) - p['m']
+
+    # El paso 0 es el punto A, antes del shock: la tasa sale de la oferta
+    # monetaria y la tasa externa sin shock.
+    i = (p['k'] * Y - p['Ms'] / p['P']) / p['h']
+    diferencial = i - p['i_star']
+    for t in range(pasos + 1):
+        if t > 0:
+            Y_anterior, e_anterior = Y, e
+            # 1. Mercado de dinero con el ingreso del paso anterior.
+            i = (p['k'] * Y_anterior - Ms_real) / p['h']
+            # 2. Flujos de capital: el tipo de cambio se mueve hacia la UIP.
+            e = e_anterior + vel_e * (p['e_esperado'] - (i - i_star) / p['phi'] - e_anterior)
+            # 3. La producción se acerca al gasto agregado.
+            DA = DA_autonoma - p['b'] * i + p['n'] * e + pendiente * Y_anterior
+            Y = Y_anterior + vel_y * (DA - Y_anterior)
+            diferencial = i - i_star
+
+        yield {
+            't': t,
+            'Y': Y,
+            'i': i,
+            'e': e,
+            'NX': p['nx0'] + p['n'] * e - p['m'] * Y,
+            'diferencial': diferencial,
+        }
+
+        if t > 0 and tolerancia is not None:
+            cambio = max(np.max(np.abs(Y - Y_anterior), initial=0.0),
+                         np.max(np.abs(e - e_anterior), initial=0.0))
+            if cambio < tolerancia:
+                return
+
+
+def guardar_trayectoria(directorio, trayectoria, pasos, variables=('Y', 'i', 'e')):
+    """
+    Vuelca un generador de 'simular_ajuste' a disco paso a paso.
+
+    Cada variable se guarda en '<directorio>/<variable>.npy' con forma
+    (pasos + 1, *forma_de_los_shocks), escrita mediante un arreglo mapeado en
+    memoria; los pasos no simulados (si hubo parada temprana) quedan en NaN.
+
+    Returns:
+        int: Número de pasos escritos.
+    """
+    import os
+    os.makedirs(directorio, exist_ok=True)
+    archivos = {}
+    escritos = 0
+    for estado in trayectoria:
+        if not archivos:
+            for variable in variables:
+                archivos[variable] = np.lib.format.open_memmap(
+                    os.path.join(directorio, f'{variable}.npy'), mode='w+', dtype=np.float64,
+                    shape=(pasos + 1,) + np.shape(estado[variable]))
+                archivos[variable][:] = np.nan
+        for variable in variables:
+            archivos[variable][estado['t']] = estado[variable]
+        escritos += 1
+    for archivo in archivos.values():
+        archivo.flush()
+    return escritos
+
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 7: MODELO IS-LM (MERCADOS DE BIENES Y DE DINERO ENLAZADOS)
+# ------------------------------------------------------------------------------
+# La inversión pasa a depender de la tasa de interés, I = i0 - b·i, y el
+# ingreso del mercado de dinero es el que equilibra el mercado de bienes:
+#   IS:  Y = alpha·(A - b·i)
+#   LM:  Ms/P = k·Y - h·i
+# Con b = 0 el ingreso es el de la Cruz Keynesiana (Y = alpha·A).
+def equilibrio_is_lm(g0, t1, i0, nx0, Ms, P, c0=C0_BASE, c1=C1_BASE, b=B_BASE, k=K_BASE, h=H_BASE):
+    """
+    Calcula el equilibrio conjunto IS-LM para uno o muchos escenarios
+    (escalares o arreglos con broadcasting).
+
+    Returns:
+        dict: 'alpha', 'A', 'Ms_real', 'Y_eq' e 'i_eq', cada uno como
+              arreglo de NumPy.
+    """
+    bienes = equilibrio_mercado_bienes(g0, t1, i0, nx0, c0, c1)
+    Ms_real = np.asarray(Ms, dtype=float) / np.asarray(P, dtype=float)
+    Y_eq = ingreso_is_lm(bienes['A'], bienes['alpha'], Ms_real, b, k, h)
+    i_eq = (np.asarray(k, dtype=float) * Y_eq - Ms_real) / np.asarray(h, dtype=float)
+    return {'alpha': bienes['alpha'], 'A': bienes['A'], 'Ms_real': Ms_real, 'Y_eq': Y_eq, 'i_eq': i_eq}
+
+
+def ingreso_is_lm(A, alpha, Ms_real, b=B_BASE, k=K_BASE, h=H_BASE):
+    """Ingreso que resuelve IS y LM a la vez: alpha·(A + b·Ms_real/h) / (1 + alpha·b·k/h)."""
+    A, alpha, Ms_real, b, k, h = (np.asarray(v, dtype=float) for v in (A, alpha, Ms_real, b, k, h))
+    return alpha * (A + b * Ms_real / h) / (1.0 + alpha * b * k / h)
+
+
+def curva_is(Y_range, A, alpha, b=B_BASE):
+    """Curva IS: tasa de interés que equilibra el mercado de bienes para cada Y (requiere b > 0)."""
+    return (np.asarray(A, dtype=float) - np.asarray(Y_range, dtype=float) / alpha) / b
+
+
+def curva_lm(Y_range, Ms_real, k=K_BASE, h=H_BASE):
+    """Curva LM: tasa de interés que equilibra el mercado de dinero para cada Y."""
+    return (k * np.asarray(Y_range, dtype=float) - Ms_real) / h
+
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 8: GRAFO DE DEPENDENCIAS (RECÁLCULO INCREMENTAL)
+# ------------------------------------------------------------------------------
+# Un dashboard con varios paneles no necesita recalcular todo en cada tick: el
+# modelo se describe como un grafo de nodos (parámetros y valores derivados) y
+# al cambiar un parámetro solo se invalidan los nodos que dependen de él. Los
+# paneles consultan qué nodos se invalidaron y redibujan solo lo afectado.
+class GrafoDependencias:
+    """
+    Grafo acíclico de valores con invalidación hacia adelante y cálculo
+    perezoso.
+
+    Los parámetros se crean con 'parametro()' y los valores derivados con
+    'nodo()', que solo acepta dependencias ya existentes (así el grafo no
+    puede tener ciclos). 'asignar()' marca como sucios los descendientes de
+    los parámetros que cambiaron; cada nodo sucio se recalcula una sola vez,
+    la próxima vez que se lee.
+    """
+
+    def __init__(self):
+        self._funciones = {}      # nodo -> (función, dependencias); los parámetros no tienen
+        self._dependientes = {}   # nodo -> nodos que lo usan directamente
+        self._valores = {}
+        self._sucios = set()
+        # Número de veces que se calculó cada nodo (para diagnosticar el recálculo).
+        self.evaluaciones = {}
+
+    def parametro(self, nombre, valor):
+        """Agrega un parámetro (nodo hoja) con su valor inicial."""
+        self._agregar(nombre)
+        self._valores[nombre] = valor
+
+    def nodo(self, nombre, funcion, dependencias):
+        """
+        Agrega un nodo calculado como 'funcion(*valores de las dependencias)'.
+
+        Args:
+            dependencias (tuple): Nombres de parámetros o nodos ya definidos.
+        """
+        faltantes = [d for d in dependencias if d not in self._dependientes]
+        if faltantes:
+            raise KeyError(f"Dependencias desconocidas para {nombre!r}: {faltantes}")
+        self._agregar(nombre)
+        self._funciones[nombre] = (funcion, tuple(dependencias))
+        for dependencia in dependencias:
+            self._dependientes[dependencia].append(nombre)
+        self._sucios.add(nombre)
+        self.evaluaciones[nombre] = 0
+
+    def _agregar(self, nombre):
+        if nombre in self._dependientes:
+            raise ValueError(f"El nodo {nombre!r} ya existe.")
+        self._dependientes[nombre] = []
+
+    def asignar(self, **valores):
+        """
+        Cambia uno o más parámetros.
+
+        Returns:
+            set: Nombres de los parámetros que cambiaron de valor y de todos
+                 sus descendientes (vacío si ningún valor cambió).
+        """
+        cambiados = set()
+        for nombre, valor in valores.items():
+            if nombre in self._funciones or nombre not in self._dependientes:
+                raise KeyError(f"{nombre!r} no es un parámetro del grafo.")
+            if not np.array_equal(self._valores[nombre], valor):
+                self._valores[nombre] = valor
+                cambiados.add(nombre)
+        descendientes = self.descendientes(cambiados)
+        self._sucios |= descendientes
+        return cambiados | descendientes
+
+    def __getitem__(self, nombre):
+        if nombre in self._sucios:
+            funcion, dependencias = self._funciones[nombre]
+            self._valores[nombre] = funcion(*(self[d] for d in dependencias))
+            self._sucios.discard(nombre)
+            self.evaluaciones[nombre] += 1
+        return self._valores[nombre]
+
+    def __contains__(self, nombre):
+        return nombre in self._dependientes
+
+    def descendientes(self, nombres):
+        """Nodos que dependen (directa o indirectamente) de alguno de 'nombres'."""
+        resultado, pendientes = set(), list(nombres)
+        while pendientes:
+            for dependiente in self._dependientes[pendientes.pop()]:
+                if dependiente not in resultado:
+                    resultado.add(dependiente)
+                    pendientes.append(dependiente)
+        return resultado
+
+
+def crear_grafo_is_lm(Y_range=None, i_range=None, **params):
+    """
+    Construye el grafo de dependencias del modelo IS-LM.
+
+    Parámetros: 'g0', 't1', 'i0', 'nx0', 'c0', 'c1', 'b', 'Ms', 'P', 'k',
+    'h' (por defecto los valores iniciales de los sliders y las constantes
+    de la SECCIÓN 2) y las mallas 'Y_range' e 'i_range' de las curvas.
+
+    Nodos: 'A', 'alpha', 'Ms_real', 'Y_eq', 'i_eq' y las curvas 'curva_IS',
+    'curva_LM' (i sobre Y_range), 'curva_DA' (gasto agregado con la
+    inversión evaluada en i_eq) y 'curva_Md' (demanda de dinero con Y_eq
+    sobre i_range).
+
+    Returns:
+        GrafoDependencias: El grafo, con todos los nodos pendientes de calcular.
+    """
+    valores = {'g0': 200, 't1': 0.2, 'i0': 150, 'nx0': 100, 'c0': C0_BASE, 'c1': C1_BASE,
+               'b': B_BASE, 'Ms': 150, 'P': 1.0, 'k': K_BASE, 'h': H_BASE}
+    desconocidos = set(params) - set(valores)
+    if desconocidos:
+        raise KeyError(f"Parámetros desconocidos: {sorted(desconocidos)}")
+    valores.update(params)
+    valores['Y_range'] = np.linspace(0, 2500, 100) if Y_range is None else np.asarray(Y_range, dtype=float)
+    valores['i_range'] = np.linspace(0, 50, 100) if i_range is None else np.asarray(i_range, dtype=float)
+
+    grafo = GrafoDependencias()
+    for nombre, valor in valores.items():
+        grafo.parametro(nombre, valor)
+
+    # --- Mercado de bienes ---
+    grafo.nodo('A', lambda c0, i0, g0, nx0: c0 + i0 + g0 + nx0, ('c0', 'i0', 'g0', 'nx0'))
+    grafo.nodo('alpha', lambda c1, t1: 1.0 / (1.0 - c1 * (1.0 - t1)), ('c1', 't1'))
+    # --- Mercado de dinero ---
+    grafo.nodo('Ms_real', lambda Ms, P: Ms / P, ('Ms', 'P'))
+    # --- Equilibrio conjunto ---
+    grafo.nodo('Y_eq', ingreso_is_lm, ('A', 'alpha', 'Ms_real', 'b', 'k', 'h'))
+    grafo.nodo('i_eq', lambda Y, Ms_real, k, h: (k * Y - Ms_real) / h, ('Y_eq', 'Ms_real', 'k', 'h'))
+    # --- Curvas ---
+    grafo.nodo('curva_IS', curva_is, ('Y_range', 'A', 'alpha', 'b'))
+    grafo.nodo('curva_LM', curva_lm, ('Y_range', 'Ms_real', 'k', 'h'))
+    grafo.nodo('curva_DA', lambda Y_range, A, b, i, c1, t1: demanda_agregada(Y_range, A - b * i, c1, t1),
+               ('Y_range', 'A', 'b', 'i_eq', 'c1', 't1'))
+    grafo.nodo('curva_Md', demanda_dinero, ('i_range', 'Y_eq', 'k', 'h'))
+    return grafo
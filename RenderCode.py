@@ -0,0 +1,283 @@
+# -*- coding: utf-8 -*-
+# ==============================================================================
+# TÍTULO: RENDER POR LOTES DE ESCENARIOS (SIN INTERFAZ)
+# ==============================================================================
+"""
+Render por Lotes de las Gráficas de los Mercados de Bienes y de Dinero
+
+Genera, sin Jupyter ni widgets, las mismas gráficas que los dashboards en modo
+'rapido' para una lista de escenarios o un barrido de parámetros. El trabajo
+se reparte en un pool de procesos; cada proceso crea una sola figura Agg y la
+reutiliza para todos sus escenarios. El resultado se escribe como archivos
+PNG/SVG o se envía cuadro a cuadro a ffmpeg para producir un GIF o un MP4.
+
+Ejemplos:
+    python RenderCode.py bienes --barrido g0=100:300:10 --salida cuadros/
+    python RenderCode.py dinero --barrido Ms=50:250:10 --barrido P=0.5:2:0.5 --formato svg
+    python RenderCode.py bienes --escenarios escenarios.csv --salida cuadros/
+    python RenderCode.py bienes --barrido t1=0.1:0.5:0.05 --video multiplicador.gif --fps 5
+"""
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 1: IMPORTACIÓN DE LIBRERÍAS
+# ------------------------------------------------------------------------------
+import argparse
+import csv
+import itertools
+import json
+import multiprocessing
+import os
+import shutil
+import subprocess
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 2: ESCENARIOS
+# ------------------------------------------------------------------------------
+# Valores iniciales de los sliders de cada dashboard, en el orden de los
+# argumentos de la función de equilibrio. Los parámetros que no se barren
+# toman estos valores.
+VALORES_INICIALES = {
+    'bienes': {'g0': 200, 't1': 0.2, 'i0': 150, 'nx0': 100},
+    'dinero': {'Ms': 150, 'Y': 800, 'P': 1.0},
+}
+
+
+def _valores_barrido(especificacion):
+    """
+    Interpreta 'nombre=inicio:fin:paso' (fin incluido) o 'nombre=v1,v2,...'.
+    """
+    nombre, _, valores = especificacion.partition('=')
+    if not valores:
+        raise ValueError(f"Barrido inválido: {especificacion!r}. Use 'nombre=inicio:fin:paso'.")
+    if ':' in valores:
+        inicio, fin, paso = (float(v) for v in valores.split(':'))
+        if paso <= 0:
+            raise ValueError(f"El paso del barrido {nombre!r} debe ser positivo.")
+        n = int(round((fin - inicio) / paso)) + 1
+        return nombre.strip(), [round(inicio + j * paso, 10) for j in range(n)]
+    return nombre.strip(), [float(v) for v in valores.split(',')]
+
+
+def generar_escenarios(mercado, barridos=(), escenarios=None):
+    """
+    Devuelve la lista de estados (tuplas de valores de los sliders) a renderizar.
+
+    Args:
+        mercado (str): 'bienes' o 'dinero'.
+        barridos (list): Especificaciones 'nombre=inicio:fin:paso'. Si hay
+                         varias se recorre su producto cartesiano (el último
+                         barrido varía más rápido).
+        escenarios (list): Diccionarios con valores explícitos; los parámetros
+                           que falten toman el valor inicial del slider.
+    """
+    if mercado not in VALORES_INICIALES:
+        raise ValueError(f"Mercado desconocido: {mercado!r}. Use 'bienes' o 'dinero'.")
+    base = VALORES_INICIALES[mercado]
+
+    def _estado(valores):
+        desconocidos = set(valores) - set(base)
+        if desconocidos:
+            raise KeyError(f"Parámetros desconocidos para {mercado!r}: {sorted(desconocidos)}")
+        return tuple(float(valores.get(nombre, defecto)) for nombre, defecto in base.items())
+
+    estados = [_estado(e) for e in (escenarios or [])]
+    if barridos:
+        ejes = [_valores_barrido(b) for b in barridos]
+        nombres = [nombre for nombre, _ in ejes]
+        for combinacion in itertools.product(*(valores for _, valores in ejes)):
+            estados.append(_estado(dict(zip(nombres, combinacion))))
+    if not estados:
+        estados.append(_estado({}))
+    return estados
+
+
+def leer_escenarios(ruta):
+    """Lee escenarios de un archivo JSON (lista de objetos) o CSV (con encabezado)."""
+    with open(ruta, newline='', encoding='utf-8') as archivo:
+        if ruta.lower().endswith('.json'):
+            return json.load(archivo)
+        return [{k: float(v) for k, v in fila.items() if v not in (None, '')}
+                for fila in csv.DictReader(archivo)]
+
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 3: PROCESOS DE TRABAJO
+# ------------------------------------------------------------------------------
+# Cada proceso construye sus figuras una sola vez en el inicializador del pool;
+# las tareas solo mueven los artistas dinámicos y exportan el resultado, así que
+# la memoria de cada proceso no crece con el número de escenarios. También los
+# usa el servidor de 'ServerCode.py'.
+_TRABAJADORES = {}
+
+
+def iniciar_trabajador(mercados=('bienes', 'dinero'), figsize=(10, 7), dpi=100):
+    """Crea en este proceso una figura Agg persistente por cada mercado indicado."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import GraphsCode
+    from ModelCode import equilibrio_mercado_bienes, equilibrio_mercado_dinero
+
+    if isinstance(mercados, str):
+        mercados = (mercados,)
+    for mercado in mercados:
+        figura = GraphsCode._FiguraPersistente(figsize=figsize, dpi=dpi, interfaz=False)
+        if mercado == 'bienes':
+            actualizar = GraphsCode.preparar_figura_bienes(figura)
+            equilibrio = equilibrio_mercado_bienes
+        else:
+            actualizar = GraphsCode.preparar_figura_dinero(figura)
+            equilibrio = equilibrio_mercado_dinero
+        _TRABAJADORES[mercado] = (figura, actualizar, equilibrio)
+
+
+def renderizar_escenario(mercado, estado, formato='png'):
+    """Renderiza un estado con la figura del proceso y devuelve los bytes."""
+    figura, actualizar, equilibrio = _TRABAJADORES[mercado]
+    actualizar(estado, equilibrio(*estado))
+    figura.actualizar()
+    return figura.exportar(formato)
+
+
+def _renderizar(tarea):
+    """
+    Renderiza un escenario. Si 'ruta' no es None el archivo se escribe desde
+    el propio proceso y solo se devuelve la ruta; si no, se devuelven los bytes
+    (cuadros de video).
+    """
+    mercado, estado, formato, ruta = tarea
+    datos = renderizar_escenario(mercado, estado, formato)
+    if ruta is None:
+        return datos
+    with open(ruta, 'wb') as archivo:
+        archivo.write(datos)
+    return ruta
+
+
+def _en_orden(pool, funcion, tareas, max_pendientes):
+    """
+    Como 'pool.map', pero con a lo sumo 'max_pendientes' tareas en vuelo:
+    los resultados se consumen en orden sin acumularse en memoria si el
+    consumidor (p. ej. ffmpeg) es más lento que los procesos.
+    """
+    pendientes = deque()
+    for tarea in tareas:
+        pendientes.append(pool.submit(funcion, tarea))
+        if len(pendientes) >= max_pendientes:
+            yield pendientes.popleft().result()
+    while pendientes:
+        yield pendientes.popleft().result()
+
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 4: SALIDA A ARCHIVOS Y A VIDEO
+# ------------------------------------------------------------------------------
+def _comando_ffmpeg(ruta, ancho, alto, fps):
+    comando = ['ffmpeg', '-loglevel', 'error', '-y',
+               '-f', 'rawvideo', '-pix_fmt', 'rgba', '-s', f'{ancho}x{alto}',
+               '-r', str(fps), '-i', '-']
+    if ruta.lower().endswith('.gif'):
+        # Paleta calculada cuadro a cuadro: ffmpeg no necesita guardar todo
+        # el video para generar una paleta global.
+        comando += ['-vf', 'split[a][b];[a]palettegen=stats_mode=single[p];[b][p]paletteuse=new=1']
+    else:
+        # H.264 con yuv420p exige dimensiones pares.
+        comando += ['-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-c:v', 'libx264', '-pix_fmt', 'yuv420p']
+    return comando + [ruta]
+
+
+def renderizar_lote(mercado, estados, salida=None, formato='png', video=None, fps=10,
+                    procesos=None, figsize=(10, 7), dpi=100, prefijo=None):
+    """
+    Renderiza una lista de escenarios en paralelo.
+
+    Args:
+        mercado (str): 'bienes' o 'dinero'.
+        estados (list): Tuplas de valores de los sliders ('generar_escenarios').
+        salida (str): Directorio para los archivos (modo archivos).
+        formato (str): 'png' o 'svg' (modo archivos).
+        video (str): Ruta '.gif' o '.mp4'. Si se indica, los cuadros se envían
+                     en orden a ffmpeg en lugar de escribirse como archivos.
+        fps (float): Cuadros por segundo del video.
+        procesos (int): Tamaño del pool (por defecto, número de CPUs).
+
+    Returns:
+        list | str: Rutas de los archivos generados, o la ruta del video.
+    """
+    if (salida is None) == (video is None):
+        raise ValueError("Indique exactamente uno de 'salida' o 'video'.")
+    if video is None and formato not in ('png', 'svg'):
+        raise ValueError(f"Formato desconocido: {formato!r}. Use 'png' o 'svg'.")
+    if video is not None and not video.lower().endswith(('.gif', '.mp4')):
+        raise ValueError("El video debe tener extensión '.gif' o '.mp4'.")
+    procesos = procesos or os.cpu_count() or 1
+    max_pendientes = 2 * procesos
+
+    # Con 'spawn' los procesos no heredan los descriptores del proceso
+    # principal; con 'fork' heredarían la tubería hacia ffmpeg y este nunca
+    # recibiría el fin de archivo.
+    contexto = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(procesos, mp_context=contexto, initializer=iniciar_trabajador,
+                             initargs=(mercado, figsize, dpi)) as pool:
+        if video is None:
+            os.makedirs(salida, exist_ok=True)
+            prefijo = prefijo or mercado
+            digitos = len(str(len(estados)))
+            tareas = ((mercado, estado, formato, os.path.join(salida, f'{prefijo}_{j:0{digitos}d}.{formato}'))
+                      for j, estado in enumerate(estados))
+            return list(_en_orden(pool, _renderizar, tareas, max_pendientes))
+
+        if shutil.which('ffmpeg') is None:
+            raise RuntimeError("No se encontró 'ffmpeg' en el PATH; es necesario para generar GIF/MP4.")
+        ancho, alto = int(round(figsize[0] * dpi)), int(round(figsize[1] * dpi))
+        ffmpeg = subprocess.Popen(_comando_ffmpeg(video, ancho, alto, fps), stdin=subprocess.PIPE)
+        try:
+            tareas = ((mercado, estado, 'rgba', None) for estado in estados)
+            for cuadro in _en_orden(pool, _renderizar, tareas, max_pendientes):
+                ffmpeg.stdin.write(cuadro)
+        finally:
+            ffmpeg.stdin.close()
+            codigo = ffmpeg.wait()
+        if codigo != 0:
+            raise RuntimeError(f"ffmpeg terminó con código {codigo}.")
+        return video
+
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 5: LÍNEA DE COMANDOS
+# ------------------------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Renderiza en paralelo las gráficas de los mercados de bienes y de dinero.")
+    parser.add_argument('mercado', choices=sorted(VALORES_INICIALES))
+    parser.add_argument('--barrido', action='append', default=[],
+                        help="Parámetro a barrer, 'nombre=inicio:fin:paso' o 'nombre=v1,v2' (repetible).")
+    parser.add_argument('--escenarios', help="Archivo JSON o CSV con escenarios explícitos.")
+    parser.add_argument('--salida', help="Directorio de salida para PNG/SVG.")
+    parser.add_argument('--formato', choices=('png', 'svg'), default='png')
+    parser.add_argument('--video', help="Archivo '.gif' o '.mp4' a generar con ffmpeg.")
+    parser.add_argument('--fps', type=float, default=10)
+    parser.add_argument('--procesos', type=int, default=None)
+    parser.add_argument('--dpi', type=int, default=100)
+    args = parser.parse_args(argv)
+
+    if args.salida is None and args.video is None:
+        parser.error("indique '--salida' o '--video'.")
+    escenarios = leer_escenarios(args.escenarios) if args.escenarios else None
+    try:
+        estados = generar_escenarios(args.mercado, args.barrido, escenarios)
+        resultado = renderizar_lote(args.mercado, estados, salida=args.salida,
+                                    formato=args.formato, video=args.video, fps=args.fps,
+                                    procesos=args.procesos, dpi=args.dpi)
+    except (ValueError, KeyError, RuntimeError) as error:
+        print(f"Error: {error}", file=sys.stderr)
+        return 1
+    n = len(resultado) if isinstance(resultado, list) else len(estados)
+    print(f"{n} escenarios renderizados -> {args.video or args.salida}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,407 @@
+# -*- coding: utf-8 -*-
+# ==============================================================================
+# TÍTULO: SERVIDOR LOCAL DE EQUILIBRIOS E IMÁGENES (ASYNCIO)
+# ==============================================================================
+"""
+Servidor HTTP Local para los Mercados de Bienes y de Dinero
+
+Expone la matemática de los dashboards ('crear_grafica_mercado_bienes' y
+'crear_grafica_mercado_dinero') a una página web interna sin un kernel de
+Jupyter por espectador. Está construido solo con 'asyncio.start_server' de la
+librería estándar:
+
+* Los equilibrios se resuelven en el event loop (son operaciones vectorizadas
+  de microsegundos) y pasan por la caché compartida de 'CacheCode.py'. Los
+  lotes POST grandes se leen, resuelven y serializan completos en un hilo.
+* Las imágenes se renderizan en un pool de procesos; cada proceso reutiliza
+  una figura Agg por mercado (ver 'RenderCode.iniciar_trabajador').
+* Las solicitudes idénticas que llegan mientras otra igual está en curso
+  esperan ese mismo resultado en lugar de repetir el trabajo.
+
+Endpoints ('<mercado>' es 'bienes' o 'dinero'; los parámetros que falten toman
+el valor inicial del slider):
+
+    GET  /equilibrio/<mercado>?g0=200&t1=0.2         -> JSON {"alpha": ..., ...}
+    GET  /equilibrio/<mercado>?...&formato=binario   -> arreglo (1, k)
+    POST /equilibrio/<mercado>                       -> lote de estados
+         cuerpo JSON: {"estados": [{"g0": 200}, [210, 0.2, 150, 100], ...]}
+         respuesta: {"variables": [...], "valores": [[...], ...]} o, con
+         '?formato=binario', un arreglo (n, k)
+    GET  /imagen/<mercado>?g0=200&...                -> PNG ('formato=svg' para SVG)
+    GET  /estadisticas                               -> contadores y cachés
+
+Las respuestas binarias son arreglos C little-endian ('dtype=float64' por
+defecto, o 'float32'); las cabeceras 'X-Variables', 'X-Forma' y 'X-Dtype'
+describen su contenido. Los parámetros o equilibrios no finitos (p. ej. P=0)
+se rechazan con 400.
+
+Uso:
+    python ServerCode.py --puerto 8765 --procesos 2
+"""
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 1: IMPORTACIÓN DE LIBRERÍAS
+# ------------------------------------------------------------------------------
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import multiprocessing
+import os
+import signal
+import sys
+import urllib.parse
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from CacheCode import MERCADOS, CacheEscenarios, opciones_imagen
+from RenderCode import VALORES_INICIALES, iniciar_trabajador, renderizar_escenario
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 2: CONFIGURACIÓN
+# ------------------------------------------------------------------------------
+MAX_CUERPO = 16 * 1024 * 1024     # Tamaño máximo del cuerpo de un POST (bytes).
+MAX_LOTE = 1_000_000              # Máximo de estados por lote.
+CUERPO_EN_HILO = 256 * 1024       # Lotes con cuerpos más grandes se procesan fuera del event loop.
+DTYPES = {'float64': '<f8', 'float32': '<f4'}
+
+_RAZONES = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+            413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+
+def _estado(mercado, valores):
+    """
+    Convierte un diccionario (o una secuencia en el orden de los sliders) en la
+    tupla de valores del mercado, completando con los valores iniciales.
+    """
+    base = VALORES_INICIALES[mercado]
+    if not isinstance(valores, dict):
+        if len(valores) != len(base):
+            raise ValueError(f"Se esperaban {len(base)} valores ({', '.join(base)}).")
+        estado = tuple(float(v) for v in valores)
+    else:
+        desconocidos = set(valores) - set(base)
+        if desconocidos:
+            raise ValueError(f"Parámetros desconocidos para {mercado!r}: {sorted(desconocidos)}")
+        estado = tuple(float(valores.get(nombre, defecto)) for nombre, defecto in base.items())
+    if not all(math.isfinite(v) for v in estado):
+        raise ValueError(f"Los parámetros deben ser números finitos: {estado}")
+    return estado
+
+
+def _respuesta(codigo, tipo, cuerpo, cabeceras=None, mantener=True):
+    lineas = [f'HTTP/1.1 {codigo} {_RAZONES.get(codigo, "")}',
+              f'Content-Type: {tipo}',
+              f'Content-Length: {len(cuerpo)}',
+              'Access-Control-Allow-Origin: *',
+              'Access-Control-Expose-Headers: X-Variables, X-Forma, X-Dtype',
+              'Connection: ' + ('keep-alive' if mantener else 'close')]
+    lineas += [f'{k}: {v}' for k, v in (cabeceras or {}).items()]
+    return ('\r\n'.join(lineas) + '\r\n\r\n').encode('latin-1') + cuerpo
+
+
+def _json(codigo, objeto):
+    # 'allow_nan=False': nunca se envía 'NaN'/'Infinity', que no son JSON válido.
+    return codigo, 'application/json', json.dumps(objeto, allow_nan=False).encode(), None
+
+
+def _binario(variables, valores, dtype):
+    if dtype not in DTYPES:
+        raise ValueError(f"dtype desconocido: {dtype!r}. Use 'float64' o 'float32'.")
+    arreglo = np.ascontiguousarray(valores, dtype=DTYPES[dtype])
+    cabeceras = {'X-Variables': ','.join(variables),
+                 'X-Forma': ','.join(str(n) for n in arreglo.shape), 'X-Dtype': dtype}
+    return 200, 'application/octet-stream', arreglo.tobytes(), cabeceras
+
+
+def _verificar_finitos(valores):
+    """
+    Lanza ValueError (respuesta 400) si algún equilibrio no es finito, p. ej.
+    con P=0 en el mercado de dinero.
+    """
+    finitos = np.isfinite(valores)
+    if not finitos.all():
+        fila = int(np.flatnonzero(~finitos.all(axis=-1))[0])
+        raise ValueError(f"El equilibrio no es finito para el estado {fila} (¿P=0?).")
+
+
+def resolver_lote(mercado, estados):
+    """
+    Resuelve un lote de estados con una sola llamada vectorizada.
+
+    Returns:
+        tuple: (variables, arreglo (n, k) float64).
+    """
+    if len(estados) > MAX_LOTE:
+        raise ValueError(f"El lote supera el máximo de {MAX_LOTE} estados.")
+    _, funcion, variables = MERCADOS[mercado]
+    matriz = np.array([_estado(mercado, e) for e in estados], dtype=np.float64)
+    matriz = matriz.reshape(-1, len(VALORES_INICIALES[mercado]))
+    resultado = funcion(*matriz.T)
+    valores = np.column_stack([np.broadcast_to(resultado[v], len(matriz)) for v in variables])
+    _verificar_finitos(valores)
+    return variables, valores
+
+
+def _procesar_lote(mercado, cuerpo, formato, dtype):
+    """
+    Lee el cuerpo JSON de un POST, resuelve el lote y codifica la respuesta.
+    Con cuerpos de hasta MAX_CUERPO, 'json.loads', la conversión de los estados
+    y la serialización cuestan mucho más que el cálculo, por eso todo el
+    proceso corre junto fuera del event loop.
+
+    Returns:
+        tuple: (codigo, tipo, datos, cabeceras) para '_respuesta'.
+    """
+    solicitud = json.loads(cuerpo or b'[]')
+    estados = solicitud.get('estados', []) if isinstance(solicitud, dict) else solicitud
+    variables, valores = resolver_lote(mercado, estados)
+    if formato == 'binario':
+        return _binario(variables, valores, dtype)
+    return _json(200, {'variables': list(variables), 'valores': valores.tolist()})
+
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 3: SERVIDOR
+# ------------------------------------------------------------------------------
+class ServidorEquilibrios:
+    """
+    Servidor asyncio de equilibrios e imágenes.
+
+    Args:
+        host (str): Dirección de escucha (por defecto solo la máquina local).
+        puerto (int): Puerto TCP; 0 elige uno libre (ver 'self.puerto').
+        procesos (int): Procesos del pool de render (por defecto, CPUs).
+        max_bytes (int): Presupuesto de la LRU en memoria de cada mercado.
+        directorio_cache (str): Almacén precalculado de 'CacheCode' (opcional).
+        dpi (int): Resolución de las imágenes.
+    """
+
+    def __init__(self, host='127.0.0.1', puerto=8765, procesos=None,
+                 max_bytes=64 * 1024 * 1024, directorio_cache=None, dpi=100):
+        self.host = host
+        self.puerto = puerto
+        self.procesos = procesos or os.cpu_count() or 1
+        self.dpi = dpi
+        self.caches = {m: CacheEscenarios(m, max_bytes, directorio_cache) for m in MERCADOS}
+        self.contadores = {'solicitudes': 0, 'coalescidas': 0, 'renders': 0, 'errores': 0}
+        self._en_vuelo = {}
+        self._pool = None
+        self._servidor = None
+
+    async def iniciar(self):
+        """Arranca el pool de render (con una figura lista por proceso) y el socket."""
+        contexto = multiprocessing.get_context('spawn')
+        self._pool = ProcessPoolExecutor(self.procesos, mp_context=contexto,
+                                         initializer=iniciar_trabajador,
+                                         initargs=(tuple(MERCADOS), (10, 7), self.dpi))
+        # Un render por proceso: así el primer cliente no paga el arranque de
+        # matplotlib.
+        loop = asyncio.get_running_loop()
+        estado = tuple(VALORES_INICIALES['bienes'].values())
+        await asyncio.gather(*(loop.run_in_executor(self._pool, renderizar_escenario, 'bienes', estado)
+                               for _ in range(self.procesos)))
+        self._servidor = await asyncio.start_server(self._atender, self.host, self.puerto,
+                                                    backlog=1024)
+        self.puerto = self._servidor.sockets[0].getsockname()[1]
+        return self
+
+    async def servir(self):
+        """Atiende solicitudes hasta que se cancele la tarea."""
+        if self._servidor is None:
+            await self.iniciar()
+        try:
+            async with self._servidor:
+                await self._servidor.serve_forever()
+        finally:
+            self._pool.shutdown(cancel_futures=True)
+
+    async def cerrar(self):
+        self._servidor.close()
+        await self._servidor.wait_closed()
+        self._pool.shutdown(cancel_futures=True)
+
+    # --- 3.1. Operaciones ---
+    async def _coalescer(self, clave, fabrica):
+        """
+        Ejecuta 'fabrica()' una sola vez por clave en vuelo: quien llegue
+        mientras tanto espera el mismo futuro. 'shield' evita que la
+        desconexión de un cliente cancele el trabajo compartido.
+        """
+        futuro = self._en_vuelo.get(clave)
+        if futuro is not None:
+            self.contadores['coalescidas'] += 1
+        else:
+            futuro = asyncio.ensure_future(fabrica())
+            self._en_vuelo[clave] = futuro
+            futuro.add_done_callback(lambda _: self._en_vuelo.pop(clave, None))
+        return await asyncio.shield(futuro)
+
+    def equilibrio(self, mercado, estado):
+        """Equilibrio de un estado como diccionario (vía la caché compartida)."""
+        return self.caches[mercado].equilibrio(estado)
+
+    async def lote(self, mercado, cuerpo, formato=None, dtype='float64'):
+        """
+        Respuesta a un POST de lote a partir de su cuerpo crudo.
+
+        Los cuerpos pequeños se procesan en el event loop. Los grandes se
+        coalescen por el hash del cuerpo crudo, antes de leerlo, y la lectura,
+        el cálculo y la serialización corren juntos en el pool de hilos.
+
+        Returns:
+            tuple: (codigo, tipo, datos, cabeceras) para '_respuesta'.
+        """
+        if len(cuerpo) < CUERPO_EN_HILO:
+            return _procesar_lote(mercado, cuerpo, formato, dtype)
+        loop = asyncio.get_running_loop()
+        huella = await loop.run_in_executor(None, lambda: hashlib.blake2b(cuerpo, digest_size=16).digest())
+        return await self._coalescer(
+            ('lote', mercado, formato, dtype, huella),
+            lambda: loop.run_in_executor(None, _procesar_lote, mercado, cuerpo, formato, dtype))
+
+    async def imagen(self, mercado, estado, formato='png'):
+        """Imagen del estado: desde la caché compartida o renderizada en el pool."""
+        if formato not in ('png', 'svg'):
+            raise ValueError(f"Formato de imagen desconocido: {formato!r}. Use 'png' o 'svg'.")
+        cache = self.caches[mercado]
+        opciones = opciones_imagen(dpi=self.dpi, formato=formato)
+        if formato == 'png':
+            png = cache.obtener_imagen(estado, opciones)
+            if png is not None:
+                return png
+
+        async def renderizar():
+            self.contadores['renders'] += 1
+            loop = asyncio.get_running_loop()
+            datos = await loop.run_in_executor(self._pool, renderizar_escenario, mercado, estado, formato)
+            if formato == 'png':
+                cache.guardar_imagen(estado, datos, opciones)
+            return datos
+
+        return await self._coalescer(('imagen', mercado, estado, formato), renderizar)
+
+    def estadisticas(self):
+        return {'contadores': dict(self.contadores), 'en_vuelo': len(self._en_vuelo),
+                'procesos': self.procesos,
+                'caches': {m: c.estadisticas() for m, c in self.caches.items()}}
+
+    # --- 3.2. Protocolo HTTP ---
+    async def _atender(self, reader, writer):
+        # Una conexión puede traer varias solicitudes (keep-alive).
+        try:
+            while True:
+                try:
+                    cabecera = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                    break
+                lineas = cabecera.decode('latin-1').split('\r\n')
+                try:
+                    metodo, objetivo, version = lineas[0].split(' ', 2)
+                    cabeceras = {}
+                    for linea in lineas[1:]:
+                        if ':' in linea:
+                            nombre, valor = linea.split(':', 1)
+                            cabeceras[nombre.strip().lower()] = valor.strip()
+                    largo = int(cabeceras.get('content-length', 0))
+                except ValueError:
+                    writer.write(_respuesta(400, 'text/plain', b'Solicitud mal formada', mantener=False))
+                    break
+                if largo > MAX_CUERPO:
+                    writer.write(_respuesta(413, 'text/plain', b'Cuerpo demasiado grande', mantener=False))
+                    break
+                cuerpo = await reader.readexactly(largo) if largo else b''
+
+                codigo, tipo, datos, extra = await self._despachar(metodo, objetivo, cuerpo)
+                mantener = (version.strip() == 'HTTP/1.1'
+                            and cabeceras.get('connection', '').lower() != 'close')
+                writer.write(_respuesta(codigo, tipo, datos, extra, mantener))
+                await writer.drain()
+                if not mantener:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _despachar(self, metodo, objetivo, cuerpo):
+        self.contadores['solicitudes'] += 1
+        url = urllib.parse.urlsplit(objetivo)
+        partes = url.path.strip('/').split('/')
+        consulta = dict(urllib.parse.parse_qsl(url.query))
+        formato = consulta.pop('formato', None)
+        dtype = consulta.pop('dtype', 'float64')
+        try:
+            if partes == ['estadisticas']:
+                return _json(200, self.estadisticas())
+            if len(partes) != 2 or partes[0] not in ('equilibrio', 'imagen') or partes[1] not in MERCADOS:
+                return _json(404, {'error': f"Ruta desconocida: {url.path}"})
+            recurso, mercado = partes
+
+            if recurso == 'imagen':
+                if metodo != 'GET':
+                    return _json(405, {'error': "Use GET."})
+                formato = formato or 'png'
+                datos = await self.imagen(mercado, _estado(mercado, consulta), formato)
+                tipo = 'image/png' if formato == 'png' else 'image/svg+xml'
+                return 200, tipo, datos, None
+
+            variables = MERCADOS[mercado][2]
+            if metodo == 'GET':
+                resultado = self.equilibrio(mercado, _estado(mercado, consulta))
+                valores = np.array([[resultado[v] for v in variables]])
+                _verificar_finitos(valores)
+                if formato == 'binario':
+                    return _binario(variables, valores, dtype)
+                return _json(200, resultado)
+            if metodo == 'POST':
+                return await self.lote(mercado, cuerpo, formato, dtype)
+            return _json(405, {'error': "Use GET o POST."})
+        except (ValueError, TypeError, KeyError, AttributeError) as error:
+            self.contadores['errores'] += 1
+            return _json(400, {'error': str(error)})
+        except Exception as error:  # El servidor sigue atendiendo a los demás clientes.
+            self.contadores['errores'] += 1
+            return _json(500, {'error': f"{type(error).__name__}: {error}"})
+
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 4: LÍNEA DE COMANDOS
+# ------------------------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor local de equilibrios e imágenes.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--puerto', type=int, default=8765, help="0 elige un puerto libre.")
+    parser.add_argument('--procesos', type=int, default=None)
+    parser.add_argument('--max-mb', type=float, default=64, help="LRU en memoria por mercado (MB).")
+    parser.add_argument('--directorio-cache', default=None,
+                        help="Almacén precalculado con 'CacheCode.precalcular_*'.")
+    parser.add_argument('--dpi', type=int, default=100)
+    args = parser.parse_args(argv)
+
+    async def ejecutar():
+        servidor = ServidorEquilibrios(args.host, args.puerto, args.procesos,
+                                       int(args.max_mb * 1024 * 1024), args.directorio_cache, args.dpi)
+        await servidor.iniciar()
+        # Con SIGINT/SIGTERM se cancela la tarea y 'servir' cierra el pool, de
+        # modo que no quedan procesos de render huérfanos.
+        loop = asyncio.get_running_loop()
+        for senal in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(senal, asyncio.current_task().cancel)
+            except (NotImplementedError, RuntimeError):
+                pass  # Windows: solo KeyboardInterrupt.
+        print(f"Escuchando en http://{servidor.host}:{servidor.puerto}", flush=True)
+        await servidor.servir()
+
+    try:
+        asyncio.run(ejecutar())
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
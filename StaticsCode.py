@@ -0,0 +1,352 @@
+# -*- coding: utf-8 -*-
+# ==============================================================================
+# TÍTULO: ESTÁTICA COMPARATIVA SOBRE MALLAS COMPLETAS DE PARÁMETROS
+# ==============================================================================
+"""
+Estática Comparativa de los Mercados de Bienes y de Dinero
+
+Calcula de una sola vez, sobre toda la malla de los sliders, los niveles de
+equilibrio, sus derivadas respecto de cada parámetro y las elasticidades
+correspondientes. Para los mercados de bienes y de dinero las derivadas son
+analíticas, obtenidas de las mismas fórmulas de 'ModelCode.py':
+
+    alpha = 1 / (1 - c1(1 - t1)),   Y_eq = alpha·A
+        dY/dg0 = dY/di0 = dY/dnx0 = dY/dc0 = alpha
+        dY/dt1 = -alpha²·c1·A,      dY/dc1 = alpha²·(1 - t1)·A
+
+    i_eq = (kY - Ms/P) / h
+        di/dMs = -1/(hP),  di/dY = k/h,  di/dP = Ms/(hP²),
+        di/dk = Y/h,       di/dh = -i/h
+
+Los modelos sin derivadas analíticas programadas ('is_lm' y
+'mundell_fleming', que resuelve un sistema lineal por escenario) usan
+diferencias finitas centradas, también vectorizadas sobre toda la malla.
+El resultado se guarda como un '.npz' comprimido en float32, listo para
+dibujar mapas de calor de sensibilidad sin recalcular nada.
+
+Uso:
+    python StaticsCode.py bienes --salida sensibilidades_bienes.npz
+    python StaticsCode.py dinero --eje Ms --eje P --fijo Y=1000 --salida dinero.npz
+    python StaticsCode.py mundell_fleming --salida mf.npz
+"""
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 1: IMPORTACIÓN DE LIBRERÍAS
+# ------------------------------------------------------------------------------
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from ModelCode import (C0_BASE, C1_BASE, K_BASE, H_BASE, B_BASE, MODELO_PARAMS,
+                       DOMINIOS_BIENES, DOMINIOS_DINERO, valores_dominio,
+                       equilibrio_mercado_bienes, equilibrio_mercado_dinero,
+                       equilibrio_is_lm, calcular_modelo)
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 2: DERIVADAS ANALÍTICAS
+# ------------------------------------------------------------------------------
+# Cada función recibe los parámetros (arreglos con broadcasting) y los niveles
+# de equilibrio, y devuelve {variable: {parámetro: derivada}}.
+def _derivadas_bienes(p, eq):
+    alpha, A = eq['alpha'], eq['A']
+    cero, uno = np.zeros_like(alpha), np.ones_like(alpha)
+    # Derivadas del multiplicador; el resto sale de la regla del producto.
+    d_alpha_t1 = -alpha ** 2 * p['c1']
+    d_alpha_c1 = alpha ** 2 * (1.0 - p['t1'])
+    return {
+        'alpha': {'g0': cero, 't1': d_alpha_t1, 'i0': cero, 'nx0': cero, 'c0': cero, 'c1': d_alpha_c1},
+        'A': {'g0': uno, 't1': cero, 'i0': uno, 'nx0': uno, 'c0': uno, 'c1': cero},
+        'Y_eq': {'g0': alpha, 't1': d_alpha_t1 * A, 'i0': alpha, 'nx0': alpha, 'c0': alpha,
+                 'c1': d_alpha_c1 * A},
+    }
+
+
+def _derivadas_dinero(p, eq):
+    Ms, Y, P, k, h = (p[nombre] for nombre in ('Ms', 'Y', 'P', 'k', 'h'))
+    cero = np.zeros_like(eq['i_eq'])
+    return {
+        'Ms_real': {'Ms': cero + 1.0 / P, 'Y': cero, 'P': cero - Ms / P ** 2, 'k': cero, 'h': cero},
+        'i_eq': {'Ms': cero - 1.0 / (h * P), 'Y': cero + k / h, 'P': cero + Ms / (h * P ** 2),
+                 'k': cero + Y / h, 'h': -eq['i_eq'] / h},
+    }
+
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 3: DESCRIPCIÓN DE LOS MODELOS
+# ------------------------------------------------------------------------------
+# Para cada modelo: función de equilibrio (argumentos por nombre), valores por
+# defecto de todos sus parámetros, dominios de los sliders (ejes por defecto
+# de la malla), variables que se derivan y derivadas analíticas (None si solo
+# se dispone de diferencias finitas).
+def _mundell_fleming(shock_demanda, shock_monetario, i_star, **params):
+    return calcular_modelo(shock_demanda, shock_monetario, i_star, params)
+
+
+MODELOS = {
+    'bienes': {
+        'funcion': equilibrio_mercado_bienes,
+        'parametros': {'g0': 200, 't1': 0.2, 'i0': 150, 'nx0': 100, 'c0': C0_BASE, 'c1': C1_BASE},
+        'dominios': DOMINIOS_BIENES,
+        'variables': ('alpha', 'A', 'Y_eq'),
+        'analiticas': _derivadas_bienes,
+    },
+    'dinero': {
+        'funcion': equilibrio_mercado_dinero,
+        'parametros': {'Ms': 150, 'Y': 800, 'P': 1.0, 'k': K_BASE, 'h': H_BASE},
+        'dominios': DOMINIOS_DINERO,
+        'variables': ('Ms_real', 'i_eq'),
+        'analiticas': _derivadas_dinero,
+    },
+    'is_lm': {
+        'funcion': equilibrio_is_lm,
+        'parametros': {'g0': 200, 't1': 0.2, 'i0': 150, 'nx0': 100, 'Ms': 150, 'P': 1.0,
+                       'c0': C0_BASE, 'c1': C1_BASE, 'b': B_BASE, 'k': K_BASE, 'h': H_BASE},
+        'dominios': {'g0': DOMINIOS_BIENES['g0'], 't1': DOMINIOS_BIENES['t1'],
+                     'Ms': DOMINIOS_DINERO['Ms'], 'P': DOMINIOS_DINERO['P']},
+        'variables': ('Y_eq', 'i_eq'),
+        'analiticas': None,
+    },
+    'mundell_fleming': {
+        'funcion': _mundell_fleming,
+        'parametros': dict(MODELO_PARAMS, shock_demanda=0.0, shock_monetario=0.0),
+        # Los mismos rangos que los sliders de 'crear_dashboard_mundell_fleming'.
+        'dominios': {'shock_demanda': (-100, 100, 10), 'shock_monetario': (-50, 50, 5),
+                     'i_star': (2, 8, 0.5)},
+        'variables': ('Y', 'i', 'e', 'NX'),
+        'analiticas': None,
+    },
+}
+
+
+def _modelo(nombre):
+    try:
+        return MODELOS[nombre]
+    except KeyError:
+        raise ValueError(f"Modelo desconocido: {nombre!r}. Use uno de {sorted(MODELOS)}.") from None
+
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 4: MALLA Y DIFERENCIAS FINITAS
+# ------------------------------------------------------------------------------
+def _malla(modelo, ejes, fijos):
+    """
+    Arma los parámetros como arreglos abiertos: el eje j varía a lo largo de
+    la dimensión j y el resto de los parámetros son escalares, de modo que
+    el broadcasting genera la malla completa sin materializar las entradas.
+    """
+    parametros = dict(modelo['parametros'])
+    desconocidos = (set(ejes) | set(fijos)) - set(parametros)
+    if desconocidos:
+        raise KeyError(f"Parámetros desconocidos: {sorted(desconocidos)}")
+    repetidos = set(ejes) & set(fijos)
+    if repetidos:
+        raise ValueError(f"Los parámetros {sorted(repetidos)} no pueden ser eje y fijo a la vez.")
+    no_escalares = sorted(nombre for nombre, valor in fijos.items() if np.ndim(valor) != 0)
+    if no_escalares:
+        raise ValueError(f"Los valores fijos deben ser escalares: {no_escalares}. "
+                         f"Para recorrer varios valores páselos como ejes (ejes={{nombre: arreglo}}).")
+    parametros.update(fijos)
+    p = {nombre: np.asarray(valor, dtype=float) for nombre, valor in parametros.items()}
+    for j, (nombre, valores) in enumerate(ejes.items()):
+        forma = [1] * len(ejes)
+        forma[j] = -1
+        p[nombre] = valores.reshape(forma)
+    return p
+
+
+def _niveles(modelo, p):
+    eq = modelo['funcion'](**p)
+    forma = np.broadcast_shapes(*(np.shape(v) for v in p.values()))
+    return {variable: np.broadcast_to(eq[variable], forma) for variable in modelo['variables']}
+
+
+def derivadas_numericas(modelo, p, paso_relativo=6e-6):
+    """
+    Derivadas por diferencias finitas centradas de todas las variables
+    respecto de todos los parámetros, vectorizadas sobre la malla.
+
+    El paso para el parámetro x es 'paso_relativo'·max(|x|, 1) (≈ eps^(1/3),
+    que equilibra el error de truncamiento y el de redondeo).
+
+    Returns:
+        dict: {variable: {parámetro: derivada}} con la forma de la malla.
+    """
+    modelo = _modelo(modelo) if isinstance(modelo, str) else modelo
+    forma = np.broadcast_shapes(*(np.shape(v) for v in p.values()))
+    derivadas = {variable: {} for variable in modelo['variables']}
+    for nombre, valor in p.items():
+        paso = paso_relativo * np.maximum(np.abs(valor), 1.0)
+        arriba = modelo['funcion'](**dict(p, **{nombre: valor + paso}))
+        abajo = modelo['funcion'](**dict(p, **{nombre: valor - paso}))
+        for variable in modelo['variables']:
+            derivadas[variable][nombre] = np.broadcast_to(
+                (arriba[variable] - abajo[variable]) / (2.0 * paso), forma)
+    return derivadas
+
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 5: ESTÁTICA COMPARATIVA
+# ------------------------------------------------------------------------------
+def estatica_comparativa(modelo, ejes=None, metodo='auto', **fijos):
+    """
+    Niveles, derivadas y elasticidades de equilibrio sobre una malla completa.
+
+    Args:
+        modelo (str): 'bienes', 'dinero', 'is_lm' o 'mundell_fleming'.
+        ejes: Parámetros que forman la malla. Una secuencia de nombres usa
+              los valores de su slider; un dict {nombre: valores} permite
+              valores arbitrarios. Por defecto, todos los sliders del modelo.
+        metodo (str): 'analitico', 'numerico' (diferencias finitas) o 'auto'
+                      (analítico si el modelo lo tiene).
+        **fijos: Valores escalares de los parámetros que no son ejes (por
+                 defecto, los valores iniciales de los sliders y las
+                 constantes del modelo). Para variar un parámetro, páselo en
+                 'ejes'.
+
+    Returns:
+        dict: 'modelo', 'metodo', 'ejes' ({nombre: valores}, en el orden de
+              las dimensiones), 'fijos', 'niveles' ({variable: arreglo}),
+              'derivadas' y 'elasticidades' ({variable: {parámetro:
+              arreglo}}). Todos los arreglos tienen la forma de la malla.
+              La elasticidad es (dv/dx)·x/v; es NaN donde la variable vale 0.
+    """
+    nombre_modelo = modelo
+    modelo = _modelo(modelo)
+    if metodo not in ('auto', 'analitico', 'numerico'):
+        raise ValueError(f"Método desconocido: {metodo!r}. Use 'auto', 'analitico' o 'numerico'.")
+    if metodo == 'auto':
+        metodo = 'numerico' if modelo['analiticas'] is None else 'analitico'
+    if metodo == 'analitico' and modelo['analiticas'] is None:
+        raise ValueError(f"El modelo {nombre_modelo!r} no tiene derivadas analíticas; use metodo='numerico'.")
+
+    if ejes is None:
+        ejes = tuple(modelo['dominios'])
+    if not isinstance(ejes, dict):
+        sin_slider = [nombre for nombre in ejes if nombre not in modelo['dominios']]
+        if sin_slider:
+            raise ValueError(f"{sin_slider} no tienen slider; indique sus valores con ejes={{nombre: valores}}.")
+        ejes = {nombre: valores_dominio(modelo['dominios'][nombre]) for nombre in ejes}
+    ejes = {nombre: np.asarray(valores, dtype=float).ravel() for nombre, valores in ejes.items()}
+
+    p = _malla(modelo, ejes, fijos)
+    niveles = _niveles(modelo, p)
+    if metodo == 'analitico':
+        forma = next(iter(niveles.values())).shape
+        derivadas = {variable: {parametro: np.broadcast_to(d, forma) for parametro, d in por_parametro.items()}
+                     for variable, por_parametro in modelo['analiticas'](p, niveles).items()}
+    else:
+        derivadas = derivadas_numericas(modelo, p)
+
+    elasticidades = {}
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for variable, por_parametro in derivadas.items():
+            nivel = niveles[variable]
+            elasticidades[variable] = {
+                parametro: np.where(nivel != 0, d * p[parametro] / nivel, np.nan)
+                for parametro, d in por_parametro.items()}
+
+    return {
+        'modelo': nombre_modelo,
+        'metodo': metodo,
+        'ejes': ejes,
+        'fijos': {nombre: float(p[nombre]) for nombre in p if nombre not in ejes},
+        'niveles': niveles,
+        'derivadas': derivadas,
+        'elasticidades': elasticidades,
+    }
+
+
+def corte(resultado, arreglo, **valores):
+    """
+    Extrae de un arreglo de la malla el corte con los ejes indicados fijos
+    (p. ej. el plano g0 x t1 de un mapa de calor con i0=150, nx0=100). Se
+    toma el valor de la malla más cercano a cada valor pedido.
+    """
+    indices = []
+    for nombre, eje in resultado['ejes'].items():
+        if nombre in valores:
+            indices.append(int(np.argmin(np.abs(eje - valores[nombre]))))
+        else:
+            indices.append(slice(None))
+    return np.asarray(arreglo)[tuple(indices)]
+
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 6: EXPORTACIÓN COMPACTA
+# ------------------------------------------------------------------------------
+# Cada arreglo se guarda con su propio nombre dentro de un '.npz' comprimido:
+#   'eje__<parámetro>', 'nivel__<variable>',
+#   'derivada__<variable>__<parámetro>', 'elasticidad__<variable>__<parámetro>'
+# y 'metadatos' (JSON con el modelo, el método, el orden de los ejes y los
+# valores fijos). Las derivadas idénticamente nulas ocupan casi nada una vez
+# comprimidas.
+def guardar_sensibilidades(resultado, ruta, dtype=np.float32):
+    """Guarda el resultado de 'estatica_comparativa' en 'ruta' ('.npz')."""
+    metadatos = {clave: resultado[clave] for clave in ('modelo', 'metodo', 'fijos')}
+    metadatos['ejes'] = list(resultado['ejes'])
+    arreglos = {'metadatos': np.array(json.dumps(metadatos))}
+    for nombre, eje in resultado['ejes'].items():
+        arreglos[f'eje__{nombre}'] = eje.astype(dtype)
+    for variable, nivel in resultado['niveles'].items():
+        arreglos[f'nivel__{variable}'] = nivel.astype(dtype)
+    for tipo, clave in (('derivada', 'derivadas'), ('elasticidad', 'elasticidades')):
+        for variable, por_parametro in resultado[clave].items():
+            for parametro, valores in por_parametro.items():
+                arreglos[f'{tipo}__{variable}__{parametro}'] = valores.astype(dtype)
+    np.savez_compressed(ruta, **arreglos)
+
+
+def cargar_sensibilidades(ruta):
+    """Lee un archivo de 'guardar_sensibilidades' con la misma estructura de 'estatica_comparativa'."""
+    with np.load(ruta, allow_pickle=False) as datos:
+        metadatos = json.loads(str(datos['metadatos']))
+        resultado = dict(metadatos, ejes={nombre: datos[f'eje__{nombre}'] for nombre in metadatos['ejes']},
+                         niveles={}, derivadas={}, elasticidades={})
+        tipos = {'nivel': 'niveles', 'derivada': 'derivadas', 'elasticidad': 'elasticidades'}
+        for clave in datos.files:
+            partes = clave.split('__')
+            if partes[0] == 'nivel':
+                resultado['niveles'][partes[1]] = datos[clave]
+            elif partes[0] in tipos:
+                resultado[tipos[partes[0]]].setdefault(partes[1], {})[partes[2]] = datos[clave]
+    return resultado
+
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 7: EJECUCIÓN DESDE LA LÍNEA DE COMANDOS
+# ------------------------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Estática comparativa sobre la malla de los sliders.")
+    parser.add_argument('modelo', choices=sorted(MODELOS))
+    parser.add_argument('--eje', action='append', default=None,
+                        help="Parámetro que forma la malla (repetible; por defecto todos los sliders).")
+    parser.add_argument('--fijo', action='append', default=[], metavar='NOMBRE=VALOR',
+                        help="Valor de un parámetro que no es eje (repetible).")
+    parser.add_argument('--metodo', choices=('auto', 'analitico', 'numerico'), default='auto')
+    parser.add_argument('--salida', help="Archivo '.npz' de salida.")
+    parser.add_argument('--float64', action='store_true', help="Guarda en float64 en lugar de float32.")
+    args = parser.parse_args(argv)
+
+    fijos = {}
+    for especificacion in args.fijo:
+        nombre, _, valor = especificacion.partition('=')
+        fijos[nombre.strip()] = float(valor)
+
+    inicio = time.perf_counter()
+    resultado = estatica_comparativa(args.modelo, args.eje, args.metodo, **fijos)
+    duracion = time.perf_counter() - inicio
+    forma = tuple(len(eje) for eje in resultado['ejes'].values())
+    n_derivadas = sum(len(d) for d in resultado['derivadas'].values())
+    print(f"{args.modelo}: malla {' x '.join(resultado['ejes'])} = {forma} ({int(np.prod(forma)):,} puntos), "
+          f"{n_derivadas} derivadas ({resultado['metodo']}) en {duracion * 1000:.1f} ms")
+    if args.salida:
+        guardar_sensibilidades(resultado, args.salida, np.float64 if args.float64 else np.float32)
+        print(f"Guardado en {args.salida}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+# ==============================================================================
+# TÍTULO: BENCHMARK DEL TIEMPO DE IMPORTACIÓN DE GraphsCode
+# ==============================================================================
+"""
+Mide cuánto cuesta 'from GraphsCode import crear_grafica_mercado_bienes' en un
+intérprete limpio y verifica que la importación no cargue librerías pesadas
+ni construya dashboards.
+
+Uso:
+    python benchmarks/bench_import.py [--repeticiones 7] [--max-ms 50]
+
+Termina con código 1 si la mediana supera '--max-ms' o si alguna librería
+pesada quedó cargada tras la importación (regresión).
+"""
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 1: IMPORTACIÓN DE LIBRERÍAS
+# ------------------------------------------------------------------------------
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 2: CONFIGURACIÓN
+# ------------------------------------------------------------------------------
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Librerías que no deben cargarse al importar el módulo.
+MODULOS_PESADOS = ['numpy', 'matplotlib', 'ipywidgets', 'IPython', 'ModelCode']
+
+# Código que se ejecuta en cada subproceso: mide la importación y reporta los
+# módulos pesados presentes en 'sys.modules'.
+_SONDA = """
+import json, sys, time
+inicio = time.perf_counter()
+from GraphsCode import crear_grafica_mercado_bienes
+ms = (time.perf_counter() - inicio) * 1000
+print(json.dumps({'ms': ms, 'cargados': [m for m in %r if m in sys.modules]}))
+""" % (MODULOS_PESADOS,)
+
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 3: MEDICIÓN
+# ------------------------------------------------------------------------------
+def medir_importacion(repeticiones=7):
+    """
+    Importa GraphsCode en 'repeticiones' intérpretes nuevos.
+
+    Returns:
+        dict: 'tiempos_ms' (lista), 'mediana_ms', 'minimo_ms' y 'cargados'
+              (módulos pesados encontrados en alguna repetición).
+    """
+    entorno = dict(os.environ, PYTHONPATH=RAIZ)
+    tiempos, cargados = [], set()
+    for _ in range(repeticiones):
+        salida = subprocess.run([sys.executable, '-c', _SONDA], cwd=RAIZ, env=entorno,
+                                capture_output=True, text=True, check=True)
+        resultado = json.loads(salida.stdout.strip().splitlines()[-1])
+        tiempos.append(resultado['ms'])
+        cargados.update(resultado['cargados'])
+    return {
+        'tiempos_ms': tiempos,
+        'mediana_ms': statistics.median(tiempos),
+        'minimo_ms': min(tiempos),
+        'cargados': sorted(cargados),
+    }
+
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 4: EJECUCIÓN
+# ------------------------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeticiones', type=int, default=7)
+    parser.add_argument('--max-ms', type=float, default=50.0,
+                        help="Presupuesto para la mediana del tiempo de importación.")
+    args = parser.parse_args(argv)
+
+    resultado = medir_importacion(args.repeticiones)
+    print(f"import GraphsCode: mediana {resultado['mediana_ms']:.1f} ms, "
+          f"mínimo {resultado['minimo_ms']:.1f} ms ({args.repeticiones} repeticiones)")
+
+    fallas = []
+    if resultado['cargados']:
+        fallas.append(f"librerías pesadas cargadas al importar: {', '.join(resultado['cargados'])}")
+    if resultado['mediana_ms'] > args.max_ms:
+        fallas.append(f"la mediana supera el presupuesto de {args.max_ms:.0f} ms")
+    for falla in fallas:
+        print(f"REGRESIÓN: {falla}")
+    return 1 if fallas else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
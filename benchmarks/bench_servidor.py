@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+# ==============================================================================
+# TÍTULO: PRUEBA DE CARGA DEL SERVIDOR DE EQUILIBRIOS
+# ==============================================================================
+"""
+Prueba de carga de 'ServerCode.py' en localhost.
+
+Abre '--clientes' conexiones keep-alive concurrentes; cada cliente envía
+'--solicitudes' solicitudes con una mezcla de equilibrios individuales (JSON y
+binario), lotes e imágenes sobre estados aleatorios de la malla de los
+sliders. Al final informa el throughput y la latencia (p50/p90/p99/máx) por
+tipo de solicitud, junto con los contadores del servidor (coalescidas,
+renders y aciertos de la caché).
+
+Uso:
+    python benchmarks/bench_servidor.py                       # inicia su propio servidor
+    python benchmarks/bench_servidor.py --clientes 500 --solicitudes 40
+    python benchmarks/bench_servidor.py --url http://127.0.0.1:8765   # servidor ya iniciado
+"""
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 1: IMPORTACIÓN DE LIBRERÍAS
+# ------------------------------------------------------------------------------
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import urllib.parse
+
+import numpy as np
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+
+from ModelCode import DOMINIOS_BIENES, DOMINIOS_DINERO, valores_dominio  # noqa: E402
+
+DOMINIOS = {'bienes': DOMINIOS_BIENES, 'dinero': DOMINIOS_DINERO}
+
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 2: CLIENTE HTTP MÍNIMO (KEEP-ALIVE)
+# ------------------------------------------------------------------------------
+async def _solicitar(reader, writer, host, metodo, ruta, cuerpo=b''):
+    """Envía una solicitud por la conexión abierta y devuelve (código, cuerpo)."""
+    cabecera = (f'{metodo} {ruta} HTTP/1.1\r\nHost: {host}\r\n'
+                f'Content-Length: {len(cuerpo)}\r\n\r\n').encode('latin-1')
+    writer.write(cabecera + cuerpo)
+    await writer.drain()
+    respuesta = (await reader.readuntil(b'\r\n\r\n')).decode('latin-1').split('\r\n')
+    codigo = int(respuesta[0].split(' ', 2)[1])
+    largo = 0
+    for linea in respuesta[1:]:
+        if linea.lower().startswith('content-length:'):
+            largo = int(linea.split(':', 1)[1])
+    return codigo, await reader.readexactly(largo)
+
+
+def _estado_aleatorio(rng, mercado):
+    return {nombre: float(rng.choice(valores_dominio(dominio)))
+            for nombre, dominio in DOMINIOS[mercado].items()}
+
+
+def _siguiente(rng, mezcla, tam_lote):
+    """Elige el tipo de la próxima solicitud y arma (tipo, método, ruta, cuerpo)."""
+    mercado = rng.choice(('bienes', 'dinero'))
+    tipo = rng.choices(list(mezcla), weights=list(mezcla.values()))[0]
+    consulta = urllib.parse.urlencode(_estado_aleatorio(rng, mercado))
+    if tipo == 'equilibrio':
+        return tipo, 'GET', f'/equilibrio/{mercado}?{consulta}', b''
+    if tipo == 'binario':
+        return tipo, 'GET', f'/equilibrio/{mercado}?{consulta}&formato=binario', b''
+    if tipo == 'imagen':
+        return tipo, 'GET', f'/imagen/{mercado}?{consulta}', b''
+    estados = [_estado_aleatorio(rng, mercado) for _ in range(tam_lote)]
+    return tipo, 'POST', f'/equilibrio/{mercado}?formato=binario', json.dumps({'estados': estados}).encode()
+
+
+async def _cliente(host, puerto, n, mezcla, tam_lote, semilla, latencias, errores):
+    rng = random.Random(semilla)
+    reader, writer = await asyncio.open_connection(host, puerto)
+    try:
+        for _ in range(n):
+            tipo, metodo, ruta, cuerpo = _siguiente(rng, mezcla, tam_lote)
+            inicio = time.perf_counter()
+            codigo, _ = await _solicitar(reader, writer, host, metodo, ruta, cuerpo)
+            latencias.setdefault(tipo, []).append(time.perf_counter() - inicio)
+            if codigo != 200:
+                errores[tipo] = errores.get(tipo, 0) + 1
+    finally:
+        writer.close()
+
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 3: PRUEBA DE CARGA
+# ------------------------------------------------------------------------------
+async def prueba_carga(host, puerto, clientes=200, solicitudes=20, mezcla=None, tam_lote=100, semilla=0):
+    """
+    Ejecuta la prueba y devuelve el resumen.
+
+    Args:
+        mezcla (dict): Peso de cada tipo de solicitud ('equilibrio',
+                       'binario', 'lote', 'imagen').
+
+    Returns:
+        dict: 'total', 'duracion_s', 'por_segundo', 'errores' y, por tipo y
+              en conjunto ('todas'), 'n' y los percentiles en milisegundos.
+    """
+    mezcla = mezcla or {'equilibrio': 60, 'binario': 20, 'lote': 10, 'imagen': 10}
+    latencias, errores = {}, {}
+    inicio = time.perf_counter()
+    await asyncio.gather(*(_cliente(host, puerto, solicitudes, mezcla, tam_lote, semilla + j,
+                                    latencias, errores) for j in range(clientes)))
+    duracion = time.perf_counter() - inicio
+
+    todas = [t for valores in latencias.values() for t in valores]
+    resumen = {'total': len(todas), 'duracion_s': duracion, 'por_segundo': len(todas) / duracion,
+               'errores': errores}
+    for tipo, valores in list(latencias.items()) + [('todas', todas)]:
+        ms = np.asarray(valores) * 1000
+        p50, p90, p99 = np.percentile(ms, [50, 90, 99])
+        resumen[tipo] = {'n': len(ms), 'p50': p50, 'p90': p90, 'p99': p99, 'max': ms.max()}
+    return resumen
+
+
+async def _estadisticas_servidor(host, puerto):
+    reader, writer = await asyncio.open_connection(host, puerto)
+    try:
+        _, cuerpo = await _solicitar(reader, writer, host, 'GET', '/estadisticas')
+        return json.loads(cuerpo)
+    finally:
+        writer.close()
+
+
+def _iniciar_servidor(procesos):
+    """Lanza 'ServerCode.py' en un puerto libre y devuelve (proceso, puerto)."""
+    comando = [sys.executable, os.path.join(RAIZ, 'ServerCode.py'), '--puerto', '0']
+    if procesos:
+        comando += ['--procesos', str(procesos)]
+    proceso = subprocess.Popen(comando, cwd=RAIZ, stdout=subprocess.PIPE, text=True)
+    linea = proceso.stdout.readline()
+    if not linea.startswith('Escuchando'):
+        proceso.kill()
+        raise RuntimeError(f"El servidor no arrancó: {linea!r}")
+    return proceso, int(linea.rsplit(':', 1)[1])
+
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 4: EJECUCIÓN
+# ------------------------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prueba de carga del servidor de equilibrios.")
+    parser.add_argument('--url', help="Servidor ya iniciado (por defecto se lanza uno local).")
+    parser.add_argument('--clientes', type=int, default=200)
+    parser.add_argument('--solicitudes', type=int, default=20, help="Solicitudes por cliente.")
+    parser.add_argument('--lote', type=int, default=100, help="Estados por solicitud de lote.")
+    parser.add_argument('--imagenes', type=float, default=10,
+                        help="Peso de las solicitudes de imagen en la mezcla (0 las omite).")
+    parser.add_argument('--procesos', type=int, default=None, help="Procesos del servidor lanzado.")
+    args = parser.parse_args(argv)
+
+    proceso = None
+    if args.url:
+        url = urllib.parse.urlsplit(args.url)
+        host, puerto = url.hostname, url.port
+    else:
+        proceso, puerto = _iniciar_servidor(args.procesos)
+        host = '127.0.0.1'
+    try:
+        mezcla = {'equilibrio': 60, 'binario': 20, 'lote': 10, 'imagen': args.imagenes}
+        resumen = asyncio.run(prueba_carga(host, puerto, args.clientes, args.solicitudes,
+                                           mezcla, args.lote))
+        servidor = asyncio.run(_estadisticas_servidor(host, puerto))
+    finally:
+        if proceso is not None:
+            proceso.terminate()  # El servidor cierra su pool al recibir SIGTERM.
+            try:
+                proceso.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                proceso.kill()
+
+    print(f"{resumen['total']} solicitudes de {args.clientes} clientes en {resumen['duracion_s']:.2f} s "
+          f"-> {resumen['por_segundo']:,.0f} solicitudes/s")
+    print(f"{'tipo':<12}{'n':>8}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'máx ms':>10}")
+    for tipo in ('equilibrio', 'binario', 'lote', 'imagen', 'todas'):
+        if tipo in resumen:
+            r = resumen[tipo]
+            print(f"{tipo:<12}{r['n']:>8}{r['p50']:>10.1f}{r['p90']:>10.1f}{r['p99']:>10.1f}{r['max']:>10.1f}")
+    contadores = servidor['contadores']
+    print(f"Servidor: {contadores['renders']} renders, {contadores['coalescidas']} solicitudes "
+          f"coalescidas, {contadores['errores']} errores")
+    for mercado, cache in servidor['caches'].items():
+        print(f"  caché {mercado}: {cache['aciertos']} aciertos, {cache['fallos']} fallos, "
+              f"{cache['entradas']} entradas, {cache['bytes'] / 1e6:.1f} MB")
+    return 1 if resumen['errores'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,508 @@
+# -*- coding: utf-8 -*-
+# ==============================================================================
+# TÍTULO: SUITE DE BENCHMARKS (MODELOS, REDIBUJADO, IMPORTACIÓN Y TAREA 3)
+# ==============================================================================
+"""
+Suite de benchmarks con datos sintéticos.
+
+Mide, para varios tamaños de entrada, el throughput de los solucionadores de
+'ModelCode.py', la latencia de un tick de redibujado de los dashboards (en los
+modos clásico y rápido), el tiempo de importación de GraphsCode y las rutinas
+de 'tarea 3.py' (load_mean, ols_estimation, simular_puntos_curry,
+logistic/stable_values y las consultas de pandas). No necesita red ni los
+archivos de datos del curso: todos los insumos se generan con semilla fija.
+
+Cada ejecución se agrega como una línea a un historial JSONL y, si existe una
+línea base guardada, se compara contra ella y se marcan las regresiones.
+
+Uso:
+    python benchmarks/bench_suite.py                      # todos los benchmarks
+    python benchmarks/bench_suite.py --solo logistic      # solo algunos
+    python benchmarks/bench_suite.py --rapido             # tamaños pequeños
+    python benchmarks/bench_suite.py --guardar-linea-base # fija la referencia
+    python benchmarks/bench_suite.py --listar
+
+Termina con código 1 si algún benchmark es más lento que la línea base en más
+de '--tolerancia' (por defecto 25 %).
+"""
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 1: IMPORTACIÓN DE LIBRERÍAS
+# ------------------------------------------------------------------------------
+import argparse
+import datetime
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+AQUI = os.path.dirname(os.path.abspath(__file__))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+
+HISTORIAL = os.path.join(AQUI, 'historial.jsonl')
+LINEA_BASE = os.path.join(AQUI, 'linea_base.json')
+
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 2: GENERADORES DE DATOS SINTÉTICOS
+# ------------------------------------------------------------------------------
+def generar_arreglo(ruta, n, semilla=0):
+    """Guarda en 'ruta' un .npy de 'n' números (como 'data.npy' de la tarea)."""
+    rng = np.random.default_rng(semilla)
+    np.save(ruta, rng.normal(316.8, 50.0, size=n))
+    return ruta
+
+
+def generar_regresion(n, k=5, semilla=0):
+    """
+    Devuelve (X, y) con 'n' observaciones y 'k' regresores, donde
+    y = 1 + X @ (1, ..., k) + ruido (como 'admission.npy').
+    """
+    rng = np.random.default_rng(semilla)
+    X = rng.normal(size=(n, k))
+    y = 1.0 + X @ np.arange(1.0, k + 1) + rng.normal(scale=0.1, size=n)
+    return X, y[:, None]
+
+
+def generar_bigmac(n_filas, n_paises=70, semilla=0):
+    """
+    DataFrame con las columnas del índice Big Mac que usan las consultas del
+    Ejercicio 5: 'name', 'date' (texto 'AAAA-MM-DD'), 'local_price',
+    'dollar_price' y 'adj_price'. Las fechas son semestrales, como en los
+    datos originales, e incluyen julio de 2024.
+    """
+    import pandas as pd
+    rng = np.random.default_rng(semilla)
+    paises = np.array([f'Pais {j:03d}' for j in range(n_paises)])
+    fechas = pd.date_range('2000-01-01', '2024-07-01', freq='6MS').strftime('%Y-%m-%d').to_numpy()
+    dolar = rng.lognormal(1.3, 0.4, size=n_filas)
+    return pd.DataFrame({
+        'name': paises[rng.integers(0, n_paises, size=n_filas)],
+        'date': fechas[rng.integers(0, len(fechas), size=n_filas)],
+        'local_price': dolar * rng.lognormal(2.0, 1.5, size=n_filas),
+        'dollar_price': dolar,
+        'adj_price': dolar * rng.uniform(0.8, 1.2, size=n_filas),
+    })
+
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 3: REGISTRO DE BENCHMARKS
+# ------------------------------------------------------------------------------
+# Cada benchmark es una función 'preparar(tamano, directorio)' que genera sus
+# datos (fuera del tiempo medido) y devuelve la función sin argumentos que se
+# cronometra. 'tamanos' son los tamaños de entrada; con '--rapido' solo se
+# usan los dos primeros. Si 'escala' es False, el tamaño es un parámetro (p. ej.
+# los dpi) y el throughput se reporta en ejecuciones por segundo.
+BENCHMARKS = {}
+
+
+def _registrar(nombre, tamanos, unidad, escala=True):
+    def decorador(preparar):
+        BENCHMARKS[nombre] = {'preparar': preparar, 'tamanos': tamanos, 'unidad': unidad,
+                              'escala': escala, 'descripcion': preparar.__doc__.strip()}
+        return preparar
+    return decorador
+
+
+_TAREA3 = None
+
+
+def cargar_tarea3():
+    """Importa 'tarea 3.py' (su nombre tiene un espacio) como módulo 'tarea3'."""
+    global _TAREA3
+    if _TAREA3 is None:
+        spec = importlib.util.spec_from_file_location('tarea3', os.path.join(RAIZ, 'tarea 3.py'))
+        modulo = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(modulo)
+        _TAREA3 = modulo
+    return _TAREA3
+
+
+@_registrar('modelo_bienes', [1_000, 100_000, 1_000_000], 'estados')
+def _bench_modelo_bienes(n, directorio):
+    """Equilibrio del mercado de bienes vectorizado sobre n estados."""
+    from ModelCode import equilibrio_mercado_bienes
+    rng = np.random.default_rng(0)
+    g0, i0, nx0 = rng.uniform(100, 300, size=(3, n))
+    t1 = rng.uniform(0.1, 0.5, size=n)
+    return lambda: equilibrio_mercado_bienes(g0, t1, i0, nx0)
+
+
+@_registrar('modelo_dinero', [1_000, 100_000, 1_000_000], 'estados')
+def _bench_modelo_dinero(n, directorio):
+    """Equilibrio del mercado de dinero vectorizado sobre n estados."""
+    from ModelCode import equilibrio_mercado_dinero
+    rng = np.random.default_rng(0)
+    Ms, Y = rng.uniform(50, 250, size=n), rng.uniform(500, 1500, size=n)
+    P = rng.uniform(0.5, 2, size=n)
+    return lambda: equilibrio_mercado_dinero(Ms, Y, P)
+
+
+@_registrar('modelo_mundell_fleming', [1_000, 100_000, 1_000_000], 'escenarios')
+def _bench_modelo_mf(n, directorio):
+    """Sistema DD/AA/UIP (calcular_modelo) para n pares de shocks."""
+    from ModelCode import calcular_modelo
+    rng = np.random.default_rng(0)
+    shock_demanda, shock_monetario = rng.uniform(-100, 100, size=n), rng.uniform(-50, 50, size=n)
+    return lambda: calcular_modelo(shock_demanda, shock_monetario)
+
+
+def _bench_redibujado(mercado, dpi):
+    import matplotlib
+    matplotlib.use('Agg')
+    import GraphsCode
+    from ModelCode import equilibrio_mercado_bienes, equilibrio_mercado_dinero
+    figura = GraphsCode._FiguraPersistente(figsize=(10, 7), dpi=dpi, interfaz=False)
+    if mercado == 'bienes':
+        actualizar = GraphsCode.preparar_figura_bienes(figura)
+        equilibrio, estados = equilibrio_mercado_bienes, [(g0, 0.2, 150, 100) for g0 in range(100, 310, 10)]
+    else:
+        actualizar = GraphsCode.preparar_figura_dinero(figura)
+        equilibrio, estados = equilibrio_mercado_dinero, [(Ms, 800, 1.0) for Ms in range(50, 260, 10)]
+    posicion = [0]
+
+    def tick():
+        # Un tick de 'dibujar_grafica' en modo rápido: equilibrio, artistas,
+        # blitting y codificación del PNG que se envía al navegador.
+        estado = estados[posicion[0] % len(estados)]
+        posicion[0] += 1
+        actualizar(estado, equilibrio(*estado))
+        figura.actualizar()
+        return figura.exportar('png')
+    return tick
+
+
+def _bench_redibujado_clasico(mercado, dpi):
+    import contextlib
+    import io
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import GraphsCode
+    # Fuera de un kernel, 'clear_output' del widget escribe códigos de control
+    # en la terminal; se descartan para no ensuciar el reporte.
+    silencio = io.StringIO()
+    with matplotlib.rc_context({'figure.dpi': dpi}), contextlib.redirect_stdout(silencio):
+        if mercado == 'bienes':
+            ui = GraphsCode.crear_grafica_mercado_bienes(modo='clasico')
+        else:
+            ui = GraphsCode.crear_grafica_mercado_dinero(modo='clasico')
+    plt.close('all')
+    # Primer slider de los controles (gasto 'g0' u oferta monetaria 'Ms').
+    slider = ui.children[0].children[0].children[1]
+    valores = np.arange(slider.min, slider.max + slider.step / 2, slider.step)
+    posicion = [0]
+
+    def tick():
+        # Un tick de 'dibujar_grafica' en modo clásico, disparado por el slider:
+        # equilibrio, figura nueva y 'tight_layout'. Con Agg 'plt.show()' no
+        # rasteriza, así que la figura se codifica aquí como lo hace el backend
+        # inline del cuaderno (PNG con bbox_inches='tight') y luego se cierra.
+        posicion[0] += 1
+        with matplotlib.rc_context({'figure.dpi': dpi}), contextlib.redirect_stdout(silencio):
+            slider.value = float(valores[posicion[0] % len(valores)])
+            buffer = io.BytesIO()
+            plt.gcf().savefig(buffer, format='png', bbox_inches='tight')
+        plt.close('all')
+        silencio.seek(0)
+        silencio.truncate()
+        return buffer.getvalue()
+    return tick
+
+
+@_registrar('redibujado_bienes_clasico', [72, 100, 150], 'ticks', escala=False)
+def _bench_redibujado_bienes_clasico(dpi, directorio):
+    """Tick de la Cruz Keynesiana en modo clásico (figura nueva 10x7 a 'dpi' por tick)."""
+    return _bench_redibujado_clasico('bienes', dpi)
+
+
+@_registrar('redibujado_bienes_rapido', [72, 100, 150], 'ticks', escala=False)
+def _bench_redibujado_bienes(dpi, directorio):
+    """Tick de la Cruz Keynesiana en modo rápido (figura Agg 10x7 a 'dpi')."""
+    return _bench_redibujado('bienes', dpi)
+
+
+@_registrar('redibujado_dinero_clasico', [72, 100, 150], 'ticks', escala=False)
+def _bench_redibujado_dinero_clasico(dpi, directorio):
+    """Tick del mercado de dinero en modo clásico (figura nueva 10x7 a 'dpi' por tick)."""
+    return _bench_redibujado_clasico('dinero', dpi)
+
+
+@_registrar('redibujado_dinero_rapido', [72, 100, 150], 'ticks', escala=False)
+def _bench_redibujado_dinero(dpi, directorio):
+    """Tick del mercado de dinero en modo rápido (figura Agg 10x7 a 'dpi')."""
+    return _bench_redibujado('dinero', dpi)
+
+
+@_registrar('redibujado_is_lm', [72, 100, 150], 'ticks', escala=False)
+def _bench_redibujado_is_lm(dpi, directorio):
+    """Tick del dashboard IS-LM enlazado (grafo de dependencias, tres paneles a 'dpi')."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import GraphsCode
+    from ModelCode import crear_grafo_is_lm
+    figura = GraphsCode._FiguraPersistente(figsize=(16, 5.5), dpi=dpi, interfaz=False, ncols=3)
+    grafo = crear_grafo_is_lm()
+    actualizar = GraphsCode.preparar_figura_is_lm(figura, grafo)
+    actualizar()
+    figura.actualizar()
+    estados = [{'g0': g0} for g0 in range(100, 310, 10)] + [{'Ms': Ms} for Ms in range(50, 260, 10)]
+    posicion = [0]
+
+    def tick():
+        # Solo se recalculan los nodos afectados y se redibujan sus paneles.
+        estado = estados[posicion[0] % len(estados)]
+        posicion[0] += 1
+        figura.actualizar(paneles=actualizar(grafo.asignar(**estado)))
+        return figura.exportar('png')
+    return tick
+
+
+@_registrar('importacion_graphscode', [1], 'importaciones', escala=False)
+def _bench_importacion(n, directorio):
+    """'import GraphsCode' en un intérprete nuevo (incluye el arranque de Python)."""
+    entorno = dict(os.environ, PYTHONPATH=RAIZ)
+    comando = [sys.executable, '-c', 'import GraphsCode']
+    return lambda: subprocess.run(comando, cwd=RAIZ, env=entorno, check=True)
+
+
+@_registrar('load_mean', [100_000, 10_000_000, 50_000_000], 'elementos')
+def _bench_load_mean(n, directorio):
+    """load_mean sobre un .npy sintético de n elementos."""
+    tarea3 = cargar_tarea3()
+    ruta = generar_arreglo(os.path.join(directorio, f'datos_{n}.npy'), n)
+    return lambda: tarea3.load_mean(ruta)
+
+
+@_registrar('ols_estimation', [10_000, 1_000_000, 5_000_000], 'observaciones')
+def _bench_ols(n, directorio):
+    """ols_estimation con 5 regresores y n observaciones."""
+    tarea3 = cargar_tarea3()
+    X, y = generar_regresion(n)
+    return lambda: tarea3.ols_estimation(X, y)
+
+
+@_registrar('simular_puntos_curry', [10_000, 1_000_000, 10_000_000], 'simulaciones')
+def _bench_curry(n, directorio):
+    """Monte Carlo de Curry (simular_puntos_curry) con n simulaciones."""
+    tarea3 = cargar_tarea3()
+    return lambda: tarea3.simular_puntos_curry(num_simulaciones=n, semilla=0)
+
+
+@_registrar('logistic', [100, 10_000, 1_000_000], 'iteraciones')
+def _bench_logistic(n, directorio):
+    """Trayectoria del mapa logístico (logistic) de n pasos en r = 3.7."""
+    tarea3 = cargar_tarea3()
+    return lambda: tarea3.logistic(0.25, 3.7, n)
+
+
+@_registrar('stable_values', [10, 100, 1_000], 'valores de r')
+def _bench_stable_values(n, directorio):
+    """stable_values para n valores de r entre 2.5 y 4."""
+    tarea3 = cargar_tarea3()
+    valores_r = np.linspace(2.5, 4.0, n)
+    return lambda: [tarea3.stable_values(r) for r in valores_r]
+
+
+@_registrar('atractores_logisticos', [1_000, 10_000, 100_000], 'valores de r')
+def _bench_atractores(n, directorio):
+    """Motor por lotes de atractores (atractores_logisticos) para n valores de r."""
+    tarea3 = cargar_tarea3()
+    valores_r = np.linspace(2.5, 4.0, n)
+    return lambda: tarea3.atractores_logisticos(valores_r)
+
+
+@_registrar('consultas_bigmac', [10_000, 100_000, 1_000_000], 'filas')
+def _bench_bigmac(n, directorio):
+    """Las cuatro consultas get_* del Ejercicio 5 sobre un DataFrame de n filas."""
+    tarea3 = cargar_tarea3()
+    df = generar_bigmac(n)
+
+    def consultas():
+        tarea3.get_number_unique_countries(df)
+        tarea3.get_top10_local_price(df)
+        tarea3.get_median(df)
+        tarea3.get_mean_adj_price(df, 'Pais 007')
+    return consultas
+
+
+@_registrar('bigmac_dataset', [10_000, 100_000, 1_000_000], 'filas')
+def _bench_bigmac_dataset(n, directorio):
+    """Construcción de BigMacDataset más las cuatro consultas sobre n filas."""
+    tarea3 = cargar_tarea3()
+    df = generar_bigmac(n)
+
+    def consultas():
+        datos = tarea3.BigMacDataset(df)
+        tarea3.get_number_unique_countries(datos)
+        tarea3.get_top10_local_price(datos)
+        tarea3.get_median(datos)
+        tarea3.get_mean_adj_price(datos, 'Pais 007')
+    return consultas
+
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 4: MEDICIÓN
+# ------------------------------------------------------------------------------
+def cronometrar(funcion, repeticiones=5, presupuesto_s=2.0):
+    """
+    Ejecuta 'funcion' una vez de calentamiento y luego hasta 'repeticiones'
+    veces (menos si se agota 'presupuesto_s'; siempre al menos una).
+
+    Returns:
+        list: Tiempos en segundos de las ejecuciones medidas.
+    """
+    funcion()
+    tiempos = []
+    limite = time.perf_counter() + presupuesto_s
+    while len(tiempos) < repeticiones and (not tiempos or time.perf_counter() < limite):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return tiempos
+
+
+def ejecutar(nombres=None, rapido=False, repeticiones=5, presupuesto_s=2.0, mostrar=print):
+    """
+    Corre los benchmarks indicados (todos por defecto).
+
+    Returns:
+        dict: clave 'nombre[tamano]' -> {'nombre', 'tamano', 'unidad',
+              'mediana_s', 'minimo_s', 'repeticiones', 'por_segundo'}. Los
+              benchmarks cuyas dependencias no están instaladas se omiten.
+    """
+    resultados = {}
+    with tempfile.TemporaryDirectory() as directorio:
+        for nombre in nombres or BENCHMARKS:
+            bench = BENCHMARKS[nombre]
+            tamanos = bench['tamanos'][:2] if rapido else bench['tamanos']
+            for tamano in tamanos:
+                try:
+                    funcion = bench['preparar'](tamano, directorio)
+                except ImportError as error:
+                    mostrar(f"{nombre:<24} omitido ({error})")
+                    break
+                tiempos = cronometrar(funcion, repeticiones, presupuesto_s)
+                mediana = statistics.median(tiempos)
+                por_segundo = (tamano if bench['escala'] else 1) / mediana
+                clave = f'{nombre}[{tamano}]'
+                resultados[clave] = {
+                    'nombre': nombre, 'tamano': tamano, 'unidad': bench['unidad'],
+                    'mediana_s': mediana, 'minimo_s': min(tiempos),
+                    'repeticiones': len(tiempos), 'por_segundo': por_segundo,
+                }
+                mostrar(f"{clave:<38} mediana {mediana * 1000:10.2f} ms   "
+                        f"{por_segundo:14,.0f} {bench['unidad']}/s")
+    return resultados
+
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 5: HISTORIAL Y LÍNEA BASE
+# ------------------------------------------------------------------------------
+def _commit():
+    try:
+        salida = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=RAIZ,
+                                capture_output=True, text=True, check=True)
+        return salida.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def registro(resultados):
+    """Ejecución completa con la información del entorno en que se midió."""
+    return {
+        'fecha': datetime.datetime.now().isoformat(timespec='seconds'),
+        'commit': _commit(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'plataforma': platform.platform(),
+        'cpus': os.cpu_count(),
+        'resultados': resultados,
+    }
+
+
+def agregar_historial(ruta, ejecucion):
+    """Agrega una ejecución como una línea JSON al final del historial."""
+    with open(ruta, 'a', encoding='utf-8') as archivo:
+        archivo.write(json.dumps(ejecucion, ensure_ascii=False) + '\n')
+
+
+def comparar(resultados, linea_base, tolerancia=0.25):
+    """
+    Compara las medianas con las de la línea base.
+
+    Returns:
+        list: Tuplas (clave, mediana_base_s, mediana_actual_s, razón) de los
+              benchmarks más lentos que la base en más de 'tolerancia'.
+    """
+    regresiones = []
+    for clave, actual in resultados.items():
+        base = linea_base.get('resultados', {}).get(clave)
+        if base is None:
+            continue
+        razon = actual['mediana_s'] / base['mediana_s']
+        if razon > 1 + tolerancia:
+            regresiones.append((clave, base['mediana_s'], actual['mediana_s'], razon))
+    return regresiones
+
+
+# ------------------------------------------------------------------------------
+# SECCIÓN 6: EJECUCIÓN
+# ------------------------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--solo', nargs='+', choices=sorted(BENCHMARKS), metavar='NOMBRE',
+                        help="Benchmarks a correr (ver '--listar').")
+    parser.add_argument('--listar', action='store_true', help="Muestra los benchmarks y sale.")
+    parser.add_argument('--rapido', action='store_true', help="Solo los dos tamaños más pequeños.")
+    parser.add_argument('--repeticiones', type=int, default=5)
+    parser.add_argument('--presupuesto', type=float, default=2.0,
+                        help="Segundos máximos de repeticiones por tamaño.")
+    parser.add_argument('--tolerancia', type=float, default=0.25,
+                        help="Aumento relativo de la mediana que cuenta como regresión.")
+    parser.add_argument('--historial', default=HISTORIAL)
+    parser.add_argument('--linea-base', default=LINEA_BASE)
+    parser.add_argument('--guardar-linea-base', action='store_true',
+                        help="Guarda esta ejecución como nueva línea base.")
+    parser.add_argument('--sin-historial', action='store_true')
+    args = parser.parse_args(argv)
+
+    if args.listar:
+        for nombre, bench in BENCHMARKS.items():
+            print(f"{nombre:<24} {bench['descripcion']} Tamaños: {bench['tamanos']}")
+        return 0
+
+    resultados = ejecutar(args.solo, args.rapido, args.repeticiones, args.presupuesto)
+    ejecucion = registro(resultados)
+    if not args.sin_historial:
+        agregar_historial(args.historial, ejecucion)
+
+    codigo = 0
+    if args.guardar_linea_base:
+        with open(args.linea_base, 'w', encoding='utf-8') as archivo:
+            json.dump(ejecucion, archivo, ensure_ascii=False, indent=1)
+        print(f"Línea base guardada en {args.linea_base}")
+    elif os.path.exists(args.linea_base):
+        with open(args.linea_base, encoding='utf-8') as archivo:
+            linea_base = json.load(archivo)
+        regresiones = comparar(resultados, linea_base, args.tolerancia)
+        for clave, base, actual, razon in regresiones:
+            print(f"REGRESIÓN: {clave}: {base * 1000:.2f} ms -> {actual * 1000:.2f} ms ({razon:.2f}x)")
+        if regresiones:
+            codigo = 1
+        else:
+            print(f"Sin regresiones respecto de la línea base ({linea_base.get('commit')}).")
+    return codigo
+
+
+if __name__ == '__main__':
+    sys.exit(main())
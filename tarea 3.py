@@ -3,6 +3,8 @@
 #   HW3: coloque las funciones utilizadas en los ejercicios. No
 #   defina otras variables o valores en este módulo.
 #   ----------------------------------------------------------------------------
+import json
+
 import numpy as np
 import pandas as pd 
 #Importando librerías 
@@ -10,64 +12,261 @@ import pandas as pd
 # ----------------------------------------------
 # Ejercicio 1
 # ----------------------------------------------
+def _resumen_bloque(bloque):
+    # Estadísticos de un bloque en float64. 'np.sum' usa suma por pares, así
+    # que el error de redondeo crece como O(log n) y no como O(n).
+    bloque = np.asarray(bloque, dtype=np.float64)
+    n = bloque.size
+    if n == 0:
+        return {'n': 0, 'media': 0.0, 'm2': 0.0, 'minimo': np.inf, 'maximo': -np.inf}
+    media = bloque.sum() / n
+    return {'n': n, 'media': media, 'm2': np.sum((bloque - media) ** 2),
+            'minimo': bloque.min(), 'maximo': bloque.max()}
+
+
+def _combinar_resumenes(a, b):
+    # Combinación de medias y sumas de cuadrados de Chan et al.: estable aunque
+    # los bloques tengan medias muy distintas.
+    n = a['n'] + b['n']
+    if n == 0:
+        return a
+    delta = b['media'] - a['media']
+    return {
+        'n': n,
+        'media': a['media'] + delta * b['n'] / n,
+        'm2': a['m2'] + b['m2'] + delta ** 2 * a['n'] * b['n'] / n,
+        'minimo': min(a['minimo'], b['minimo']),
+        'maximo': max(a['maximo'], b['maximo']),
+    }
+
+
+def resumen_archivo(filename: str, tam_bloque=4_000_000):
+    """
+    Calcula en una sola pasada la media, la varianza, el mínimo, el máximo y
+    el conteo de todos los elementos de un archivo .npy.
+
+    El archivo se abre con 'mmap_mode' y se reduce en bloques de
+    'tam_bloque' elementos, de modo que la memoria usada no depende del
+    tamaño del archivo.
+
+    Returns:
+        dict: 'n', 'media', 'varianza' (poblacional, como np.var), 'minimo'
+              y 'maximo'.
+    """
+    datos = np.load(filename, mmap_mode='r')
+    # Los estadísticos no dependen del orden de los elementos: con order='A' el
+    # aplanado sigue el orden en memoria, así que también es una vista (sin
+    # copiar a RAM) para archivos .npy en orden Fortran.
+    plano = datos.reshape(-1, order='A')
+    total = _resumen_bloque(plano[:0])
+    for inicio in range(0, plano.size, tam_bloque):
+        total = _combinar_resumenes(total, _resumen_bloque(plano[inicio:inicio + tam_bloque]))
+    n = total['n']
+    return {
+        'n': n,
+        'media': float(total['media']) if n else float('nan'),
+        'varianza': float(total['m2'] / n) if n else float('nan'),
+        'minimo': float(total['minimo']) if n else float('nan'),
+        'maximo': float(total['maximo']) if n else float('nan'),
+    }
+
+
+def resumen_archivos(filenames, tam_bloque=4_000_000, n_hilos=4):
+    """
+    Aplica 'resumen_archivo' a una lista de archivos con un pool de hilos,
+    de modo que la lectura de un archivo se superpone con el cálculo de
+    otro. La memoria máxima es de unos 'n_hilos' bloques.
+
+    Returns:
+        dict: nombre de archivo -> estadísticos.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    # Se recorre dos veces (pool y resultado): un iterador se materializa.
+    filenames = list(filenames)
+    with ThreadPoolExecutor(max_workers=n_hilos) as pool:
+        resumenes = pool.map(lambda f: resumen_archivo(f, tam_bloque), filenames)
+        return dict(zip(filenames, resumenes))
+
+
 def load_mean(filename: str):
-    # Cargar el archivo .npy
-    data = np.load(filename)
-    #Calcular el promedio general del arreglo
-    promedio = np.mean(data)
-    return promedio
+    # Promedio general del arreglo, leído por bloques desde el archivo
+    # mapeado en memoria (ver 'resumen_archivo').
+    return resumen_archivo(filename)['media']
 
-assert abs(load_mean("data.npy") - 316.8075) < 1e-4
+if __name__ == "__main__":
+    assert abs(load_mean("data.npy") - 316.8075) < 1e-4
 
 # ----------------------------------------------
 # Ejercicio 2
 # ----------------------------------------------
+def _cargar_mmap(datos):
+    # Acepta un arreglo (o memmap) o la ruta de un .npy, que se abre mapeado
+    # en memoria para no leerlo completo a RAM.
+    if isinstance(datos, str):
+        return np.load(datos, mmap_mode='r')
+    return datos
+
+
+def _r_bloque(X, Y, inicio, fin):
+    # Factor R de la descomposición QR del bloque [1 | X | Y]. Solo se arma la
+    # matriz aumentada del bloque, nunca la del conjunto completo.
+    k, m = X.shape[1], Y.shape[1]
+    Z = np.empty((fin - inicio, 1 + k + m))
+    Z[:, 0] = 1.0
+    Z[:, 1:1 + k] = X[inicio:fin]
+    Z[:, 1 + k:] = Y[inicio:fin]
+    return np.linalg.qr(Z, mode='r')
+
+
+def _combinar_r(factores):
+    # Combina los factores R en orden: R <- qr([R; R_bloque]).
+    R = None
+    for R_bloque in factores:
+        R = R_bloque if R is None else np.linalg.qr(np.vstack((R, R_bloque)), mode='r')
+    return R
+
+
+def ols_streaming(X, y, tam_bloque=500_000, n_hilos=1):
+    """
+    Estimador OLS por bloques (QR incremental) con memoria acotada.
+
+    Recorre las filas en bloques de 'tam_bloque', calcula el factor R de cada
+    bloque [1 | X | Y] y los combina apilándolos y volviendo a factorizar
+    (TSQR). Al incluir las columnas de Y en la factorización, R contiene
+    también Q'Y, así que los coeficientes salen de resolver el sistema
+    triangular R_xx·beta = R_xy, sin formar X'X ni invertir matrices.
+
+    Args:
+        X: Matriz (n, k) o ruta a un .npy (se abre con mmap_mode='r').
+        y: Vector (n,) o matriz (n, m) con varias variables dependientes, o
+           ruta a un .npy.
+        tam_bloque (int): Filas por bloque.
+        n_hilos (int): Bloques factorizados en paralelo (LAPACK libera el GIL).
+
+    Returns:
+        np.ndarray: Coeficientes (k + 1,) o (k + 1, m); el primero es el
+                    intercepto.
+    """
+    X, y = _cargar_mmap(X), _cargar_mmap(y)
+    if X.ndim == 1:
+        X = X[:, None]
+    Y = y[:, None] if y.ndim == 1 else y
+    n, k = X.shape
+    if Y.shape[0] != n:
+        raise ValueError("X e y deben tener la misma cantidad de observaciones.")
+
+    bloques = [(inicio, min(inicio + tam_bloque, n)) for inicio in range(0, n, tam_bloque)]
+    if n_hilos > 1:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=n_hilos) as pool:
+            factores = pool.map(lambda b: _r_bloque(X, Y, *b), bloques)
+            R = _combinar_r(factores)
+    else:
+        R = _combinar_r(_r_bloque(X, Y, *b) for b in bloques)
+
+    beta = np.linalg.solve(R[:k + 1, :k + 1], R[:k + 1, k + 1:])
+    return beta[:, 0] if y.ndim == 1 else beta
+
+
 # Recibe una matriz X con las variables en las columnas y observaciones en las
 # filas. El vector columna "y" debe tener la misma cantidad de observaciones  
 def ols_estimation(X: np.ndarray, y: np.ndarray):
-    # Agregar columna de unos para el intercepto
-    n = X.shape[0]
-    ones = np.ones((n, 1))
-    X_design = np.hstack((ones, X))
-    
-    # Calcular coeficientes OLS
-    X_transpose = X_design.T
-    XtX = X_transpose @ X_design
-    XtX_inv = np.linalg.inv(XtX)
-    Xty = X_transpose @ y
-    beta_hat = XtX_inv @ Xty
-    
-    return beta_hat
+    # Coeficientes OLS (intercepto primero) mediante la QR por bloques de
+    # 'ols_streaming': no se copia X para agregar la columna de unos ni se
+    # invierte X'X.
+    return ols_streaming(X, y)
 
 # Probar la función con los datos de admission
-admission = np.load("admission.npy")
-X = admission[:, :-1]
-y = admission[:, -1][:, None]
+if __name__ == "__main__":
+    admission = np.load("admission.npy")
+    X = admission[:, :-1]
+    y = admission[:, -1][:, None]
 
-betahat = ols_estimation(X, y)
-print(betahat)
+    betahat = ols_estimation(X, y)
+    print(betahat)
 # ----------------------------------------------
 # Ejercicio 3
 # ----------------------------------------------
+def _bloque_curry(args):
+    """
+    Simula un bloque de cuartos de juego y devuelve el conteo de cada puntaje.
+
+    En cada uno de los 'num_intervalos' Curry anota un triple con probabilidad
+    'p_triple' y un doble con probabilidad 'p_doble' (independientes), así que
+    los puntos de un cuarto son 3·Binomial(n, p_triple) + 2·Binomial(n, p_doble):
+    el bloque completo se genera con dos sorteos vectorizados.
+    """
+    semilla, tam, num_intervalos, p_triple, p_doble = args
+    rng = np.random.default_rng(semilla)
+    puntos = (3 * rng.binomial(num_intervalos, p_triple, size=tam)
+              + 2 * rng.binomial(num_intervalos, p_doble, size=tam))
+    return np.bincount(puntos, minlength=5 * num_intervalos + 1)
+
+
+def simular_puntos_curry(num_simulaciones=10000, num_intervalos=20, p_triple=0.45, p_doble=0.55,
+                         semilla=None, tam_bloque=1_000_000, n_procesos=1,
+                         cuantiles=(0.05, 0.25, 0.5, 0.75, 0.95)):
+    """
+    Motor Monte Carlo para los puntos de Curry en un cuarto de juego.
+
+    Las simulaciones se procesan en bloques de tamaño fijo, así que la memoria
+    no depende de 'num_simulaciones'. Cada bloque recibe su propia semilla
+    derivada de 'semilla' con 'SeedSequence.spawn', de modo que el resultado
+    es el mismo con cualquier número de procesos.
+
+    Args:
+        num_simulaciones (int): Número de cuartos simulados.
+        num_intervalos (int): Intervalos de 30 segundos por cuarto.
+        p_triple, p_doble (float): Probabilidades de anotar en cada intervalo.
+        semilla (int): Semilla para resultados reproducibles (None = aleatoria).
+        tam_bloque (int): Simulaciones por bloque.
+        n_procesos (int): Procesos en paralelo (1 = en el proceso actual).
+        cuantiles (tuple): Cuantiles a reportar.
+
+    Returns:
+        dict: 'media', 'desviacion', 'cuantiles' (dict cuantil -> puntos),
+              'puntos' (valores posibles), 'histograma' (conteo de cada valor)
+              y 'n' (simulaciones realizadas).
+    """
+    if num_simulaciones < 1:
+        raise ValueError("'num_simulaciones' debe ser al menos 1.")
+    if tam_bloque < 1:
+        raise ValueError("'tam_bloque' debe ser al menos 1.")
+    n_bloques = -(-num_simulaciones // tam_bloque)
+    semillas = np.random.SeedSequence(semilla).spawn(n_bloques)
+    tamanos = [tam_bloque] * (n_bloques - 1) + [num_simulaciones - tam_bloque * (n_bloques - 1)]
+    tareas = [(s, t, num_intervalos, p_triple, p_doble) for s, t in zip(semillas, tamanos)]
+
+    if n_procesos > 1 and n_bloques > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=n_procesos) as pool:
+            histograma = sum(pool.map(_bloque_curry, tareas))
+    else:
+        histograma = sum(_bloque_curry(tarea) for tarea in tareas)
+
+    # Los puntos son enteros acotados, así que el histograma es la
+    # distribución exacta de la muestra y de él salen todos los estadísticos.
+    puntos = np.arange(histograma.size)
+    media = histograma @ puntos / num_simulaciones
+    varianza = histograma @ (puntos - media) ** 2 / num_simulaciones
+    acumulada = np.cumsum(histograma) / num_simulaciones
+    return {
+        'media': float(media),
+        'desviacion': float(np.sqrt(varianza)),
+        'cuantiles': {q: int(puntos[np.searchsorted(acumulada, q)]) for q in cuantiles},
+        'puntos': puntos,
+        'histograma': histograma,
+        'n': num_simulaciones,
+    }
+
+
 # Devuelve los puntos que anotaría Curry en un cuarto de juego (1 realización)
 def curry_one_quarter():
-    # Parámetros de la simulación
-    num_simulaciones = 10000
-    num_intervalos = 20  #20 intervalos de 30 segundos en un cuarto de juego
-
-    resultados_finales = []
-    for i in range(num_simulaciones):
-        puntos = 0
-        for j in range(num_intervalos):
-            # Simular si Curry anota un triple (probabilidad 0.45)
-            if np.random.rand() < 0.45:
-                puntos += 3
-            # Simular si Curry anota un doble (probabilidad 0.55)
-            if np.random.rand() < 0.55:
-                puntos += 2
-        resultados_finales.append(puntos)
-    return np.mean(resultados_finales)
-print(curry_one_quarter())
+    # Parámetros de la simulación: 10000 cuartos de 20 intervalos de 30 segundos
+    return simular_puntos_curry(num_simulaciones=10000, num_intervalos=20)['media']
+
+if __name__ == "__main__":
+    print(curry_one_quarter())
 
 # ----------------------------------------------
 # Ejercicio 4
@@ -102,42 +301,292 @@ def stable_values(r, x0=0.25, n=500):
     """
     Encuentra los valores estables de la secuencia logística para un 'r' dado.
 
-    Primero genera una secuencia larga, descarta los valores iniciales
-    (fase transitoria) y luego identifica los valores únicos a los que
-    converge la secuencia.
+    Si la secuencia converge a un ciclo se devuelven exactamente los puntos
+    del ciclo; si no (caos), se usan los valores de la secuencia después de
+    la fase transitoria (los primeros 200). Con 'r' y 'x0' escalares se
+    itera un solo carril; si alguno es un arreglo, todos los carriles se
+    resuelven a la vez con el motor 'atractores_logisticos'.
 
     Args:
-        r (float): El parámetro de crecimiento.
-        x0 (float): El valor inicial de la secuencia.
+        r (float | array): El parámetro de crecimiento.
+        x0 (float | array): El valor inicial de la secuencia.
         n (int): El número total de iteraciones a generar.
 
     Returns:
         np.ndarray: Un arreglo de NumPy ordenado con los valores estables
-                    (redondeados a 3 decimales).
+                    (redondeados a 3 decimales). Si 'r' o 'x0' son arreglos,
+                    una lista con un arreglo así por cada par (r, x0).
     """
-    # 1. Se genera la secuencia completa usando la función anterior
-    sequence = logistic(x0, r, n=n)
-    
-    # 2. Se descartan los primeros 200 valores (la fase transitoria)
-    transient_removed = sequence[200:]
-    
-    # 3. Se redondean los valores restantes a 3 decimales
-    rounded_values = np.round(transient_removed, 3)
-    
-    # 4. Se obtienen los valores únicos y se devuelven (np.unique también ordena)
-    stable = np.unique(rounded_values)
-    
-    return stable
+    if np.ndim(r) == 0 and np.ndim(x0) == 0:
+        return _valores_estables(float(r), float(x0), n)
+    # Con n <= 200 no queda nada después del transitorio: cada carril sale vacío.
+    resultado = atractores_logisticos(r, x0=x0, transitorio=200, max_iter=max(n, 200),
+                                      muestras=max(n - 200, 0), decimales=3)
+    desplazamientos, valores = resultado['desplazamientos'], np.round(resultado['valores'], 3)
+    return [np.unique(valores[desplazamientos[j]:desplazamientos[j + 1]])
+            for j in range(len(desplazamientos) - 1)]
+
+
+def _valores_estables(r, x0, n, transitorio=200, periodo_max=64, tol=1e-9):
+    # Un solo carril: iteración con floats de Python, sin la preparación por
+    # lotes del motor, y la misma detección de ciclo al final.
+    if n <= transitorio:
+        return np.array([])
+    cola = np.empty(n - transitorio)
+    x = x0
+    for i in range(1, n):
+        x = r * x * (1 - x)
+        if i >= transitorio:
+            cola[i - transitorio] = x
+    if transitorio == 0:
+        cola[0] = x0
+    # Solo se revisan los periodos p cuyo último valor ya se repite p pasos antes.
+    periodos = np.arange(1, min(periodo_max, cola.size // 2) + 1)
+    for p in periodos[np.abs(cola[-1] - cola[-1 - periodos]) < tol]:
+        if np.all(np.abs(cola[-p:] - cola[-2 * p:-p]) < tol):
+            return np.unique(np.round(cola[-p:], 3))
+    return np.unique(np.round(cola, 3))
+
+
+def _ragged(indices, conteos, valores, n):
+    # Reordena segmentos (uno por carril) al orden original de los carriles
+    # y construye los desplazamientos de la estructura comprimida.
+    inicios = np.concatenate(([0], np.cumsum(conteos)[:-1])).astype(np.int64)
+    orden = np.argsort(indices, kind='stable')
+    conteos_orden = np.zeros(n, dtype=np.int64)
+    conteos_orden[indices[orden]] = conteos[orden]
+    desplazamientos = np.concatenate(([0], np.cumsum(conteos_orden))).astype(np.int64)
+    total = int(desplazamientos[-1])
+    salto = np.repeat(inicios[orden] - desplazamientos[:-1][indices[orden]], conteos[orden])
+    return desplazamientos, valores[np.arange(total) + salto]
+
+
+def _lote_atractores(r, x0, transitorio, max_iter, periodo_max, tol, muestras, decimales):
+    # Resuelve un lote de carriles (r, x0) simultáneamente.
+    n = r.size
+    x = np.array(np.broadcast_to(x0, r.shape), dtype=float)
+    tmp = np.empty_like(x)
+    for _ in range(transitorio):
+        # x <- r·x·(1 - x), en el lugar (mismo orden de operaciones que 'logistic')
+        np.subtract(1.0, x, out=tmp)
+        x *= r
+        x *= tmp
+
+    ancho = max(2 * periodo_max, muestras)
+    historia = np.empty((n, ancho))
+    activos = np.arange(n)
+    r_activos = r.copy()
+    periodo = np.zeros(n, dtype=np.int64)
+    segmentos = []  # (indices, conteos, valores)
+
+    for paso in range(max_iter - transitorio):
+        if paso > 0:
+            np.subtract(1.0, x, out=tmp)
+            x *= r_activos
+            x *= tmp
+        historia[:, paso % ancho] = x
+
+        llenos = paso + 1
+        if llenos < 2 * periodo_max or llenos % periodo_max or activos.size == 0:
+            continue
+        # Últimos 2·periodo_max valores de cada carril, en orden temporal.
+        columnas = (paso - 2 * periodo_max + 1 + np.arange(2 * periodo_max)) % ancho
+        ventana = historia[:, columnas]
+        encontrado = np.zeros(activos.size, dtype=np.int64)
+        for p in range(1, periodo_max + 1):
+            candidato = encontrado == 0
+            if not candidato.any():
+                break
+            ciclo = np.all(np.abs(ventana[candidato, -p:] - ventana[candidato, -2 * p:-p]) < tol, axis=1)
+            encontrado[np.flatnonzero(candidato)[ciclo]] = p
+        asentados = encontrado > 0
+        if not asentados.any():
+            continue
+
+        # Los carriles que ya encontraron su ciclo se retiran del cálculo.
+        p_asentados = encontrado[asentados]
+        ultimos = ventana[asentados, -periodo_max:]
+        validos = np.arange(periodo_max) >= periodo_max - p_asentados[:, None]
+        ordenados = np.sort(np.where(validos, ultimos, np.inf), axis=1)
+        segmentos.append((activos[asentados], p_asentados,
+                          ordenados[np.arange(periodo_max) < p_asentados[:, None]]))
+        periodo[activos[asentados]] = p_asentados
+
+        activos, r_activos = activos[~asentados], r_activos[~asentados]
+        x, historia = x[~asentados], historia[~asentados]
+        tmp = np.empty_like(x)
+
+    if activos.size:
+        # Carriles sin ciclo detectado (p. ej. caos): últimos 'muestras' valores.
+        ultimo = max_iter - transitorio - 1
+        columnas = (ultimo - muestras + 1 + np.arange(muestras)) % ancho
+        restantes = np.sort(historia[:, columnas], axis=1)
+        if decimales is not None:
+            restantes = np.round(restantes, decimales)
+        nuevos = np.ones_like(restantes, dtype=bool)
+        nuevos[:, 1:] = restantes[:, 1:] != restantes[:, :-1]
+        segmentos.append((activos, nuevos.sum(axis=1), restantes[nuevos]))
+
+    indices = np.concatenate([s[0] for s in segmentos])
+    conteos = np.concatenate([s[1] for s in segmentos])
+    valores = np.concatenate([s[2] for s in segmentos])
+    desplazamientos, valores = _ragged(indices, conteos, valores, n)
+    return {'r': r, 'periodo': periodo, 'desplazamientos': desplazamientos, 'valores': valores}
+
+
+def iterar_atractores_logisticos(r, x0=0.25, transitorio=200, max_iter=1000, periodo_max=64,
+                                 tol=1e-9, muestras=300, decimales=None, tam_lote=100_000):
+    """
+    Generador que resuelve los atractores del mapa logístico por lotes de 'r'.
+
+    Cada lote itera todos sus pares (r, x0) a la vez con operaciones en el
+    lugar. Cada 'periodo_max' pasos se busca, para cada carril, el menor
+    periodo p tal que los últimos p valores repiten a los p anteriores (con
+    tolerancia 'tol'); esos carriles se retiran y el resto sigue iterando.
+    Los que no se asientan antes de 'max_iter' (caos) reportan sus últimos
+    'muestras' valores ordenados (redondeados y sin repetir si se indica
+    'decimales').
+
+    Yields:
+        dict: Estructura comprimida por lote: 'r', 'periodo' (0 si no se
+              detectó ciclo), 'desplazamientos' (n + 1) y 'valores'; los
+              valores del carril j son valores[desplazamientos[j]:desplazamientos[j + 1]].
+    """
+    if muestras > max_iter - transitorio:
+        raise ValueError("'muestras' no puede superar max_iter - transitorio.")
+    # 'r' y 'x0' se combinan con broadcasting (p. ej. un solo r con varios x0).
+    r, x0 = (np.ravel(v) for v in np.broadcast_arrays(np.atleast_1d(np.asarray(r, dtype=float)),
+                                                       np.asarray(x0, dtype=float)))
+    for inicio in range(0, r.size, tam_lote):
+        fin = inicio + tam_lote
+        yield _lote_atractores(r[inicio:fin], x0[inicio:fin], transitorio, max_iter,
+                               periodo_max, tol, muestras, decimales)
+
+
+def atractores_logisticos(r, x0=0.25, **kwargs):
+    """
+    Igual que 'iterar_atractores_logisticos', pero une todos los lotes en una
+    sola estructura comprimida.
+    """
+    lotes = list(iterar_atractores_logisticos(r, x0, **kwargs))
+    desplazamientos, base = [np.zeros(1, dtype=np.int64)], 0
+    for lote in lotes:
+        desplazamientos.append(lote['desplazamientos'][1:] + base)
+        base += lote['desplazamientos'][-1]
+    return {
+        'r': np.concatenate([lote['r'] for lote in lotes]),
+        'periodo': np.concatenate([lote['periodo'] for lote in lotes]),
+        'desplazamientos': np.concatenate(desplazamientos),
+        'valores': np.concatenate([lote['valores'] for lote in lotes]),
+    }
+
+
+def puntos_bifurcacion(resultado):
+    """Pares (r, x) listos para un diagrama de dispersión de la bifurcación."""
+    conteos = np.diff(resultado['desplazamientos'])
+    return np.repeat(resultado['r'], conteos), resultado['valores']
 
 # ----------------------------------------------
 # Ejercicio 5
 # ----------------------------------------------
 
+class BigMacDataset:
+    """
+    Datos del índice Big Mac preprocesados una sola vez para las consultas
+    del Ejercicio 5.
+
+    Al construirse: convierte 'date' a fecha una única vez, guarda 'name'
+    como categoría, agrega la columna 'mes' (periodo mensual), arma un
+    índice (país, mes) y precalcula los agregados que usan las consultas.
+    Las funciones get_* aceptan tanto un DataFrame como un BigMacDataset;
+    con este último responden con búsquedas en lugar de recorrer la tabla.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        datos = df.copy()
+        datos['date'] = pd.to_datetime(datos['date'])
+        datos['name'] = datos['name'].astype('category')
+        datos['mes'] = datos['date'].dt.to_period('M')
+        self.df = datos
+
+        # Índice (país, mes) ordenado para búsquedas por etiqueta.
+        self.por_pais_mes = datos.set_index(['name', 'mes']).sort_index()
+
+        # Agregados precalculados.
+        self.n_paises = int(datos['name'].nunique())
+        self.media_adj_por_pais = datos.groupby('name', observed=True)['adj_price'].mean()
+        self.mediana_dolar_por_mes = datos.groupby('mes')['dollar_price'].median()
+
+    def filas(self, pais: str, mes: str) -> pd.DataFrame:
+        """Observaciones de un país en un mes ('AAAA-MM')."""
+        return self.por_pais_mes.loc[(pais, pd.Period(mes, freq='M'))]
+
+    def mediana_dolar(self, mes: str) -> float:
+        """Mediana de 'dollar_price' en un mes ('AAAA-MM'); NaN si no hay datos."""
+        return float(self.mediana_dolar_por_mes.get(pd.Period(mes, freq='M'), np.nan))
+
+    def guardar(self, ruta: str):
+        """
+        Guarda el conjunto ya procesado en un archivo columnar Parquet
+        (requiere 'pyarrow').
+
+        Se guarda todo lo derivado: la fecha, la categoría y la columna 'mes'
+        con su tipo, la permutación que ordena el índice (país, mes) y, en
+        los metadatos del archivo, los agregados precalculados. Así 'cargar'
+        no vuelve a interpretar, ordenar ni agregar nada.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        # Filas de 'df' en el orden del índice (país, mes); es el mismo
+        # ordenamiento de '__init__', aplicado a las posiciones.
+        orden = (self.df[['name', 'mes']].assign(_fila=np.arange(len(self.df)))
+                 .set_index(['name', 'mes']).sort_index()['_fila'].to_numpy())
+        # Se guarda como una columna más: la fila j del índice es la fila orden[j] de 'df'.
+        tabla = pa.Table.from_pandas(self.df.assign(_orden=orden), preserve_index=False)
+        agregados = {
+            'n_paises': self.n_paises,
+            'media_adj_por_pais': {str(k): float(v) for k, v in self.media_adj_por_pais.items()},
+            'mediana_dolar_por_mes': {str(k): float(v) for k, v in self.mediana_dolar_por_mes.items()},
+        }
+        metadatos = dict(tabla.schema.metadata or {}, bigmac=json.dumps(agregados))
+        pq.write_table(tabla.replace_schema_metadata(metadatos), ruta)
+
+    @classmethod
+    def cargar(cls, ruta: str) -> "BigMacDataset":
+        """Reconstruye el conjunto desde un archivo creado con 'guardar', sin recalcularlo."""
+        import pyarrow.parquet as pq
+        tabla = pq.read_table(ruta)
+        agregados = json.loads(tabla.schema.metadata[b'bigmac'])
+        datos = tabla.to_pandas()
+        orden = datos.pop('_orden').to_numpy()
+
+        conjunto = cls.__new__(cls)
+        conjunto.df = datos
+        conjunto.por_pais_mes = datos.take(orden).set_index(['name', 'mes'])
+        conjunto.n_paises = agregados['n_paises']
+        media = agregados['media_adj_por_pais']
+        conjunto.media_adj_por_pais = pd.Series(
+            list(media.values()), index=pd.CategoricalIndex(list(media), dtype=datos['name'].dtype,
+                                                            name='name'), name='adj_price')
+        mediana = agregados['mediana_dolar_por_mes']
+        conjunto.mediana_dolar_por_mes = pd.Series(
+            list(mediana.values()), index=pd.PeriodIndex(list(mediana), freq='M', name='mes'),
+            name='dollar_price')
+        return conjunto
+
+
+def _tabla(df):
+    # Las consultas aceptan un DataFrame o un BigMacDataset.
+    return df.df if isinstance(df, BigMacDataset) else df
+
+
 # Number of unique countries
 def get_number_unique_countries(df: pd.DataFrame) -> int:
     """
     Calculates the number of unique countries in the DataFrame.
     """
+    if isinstance(df, BigMacDataset):
+        return df.n_paises
     return df['name'].nunique()
 
 # Top 10 countries with highest local price
@@ -145,8 +594,8 @@ def get_top10_local_price(df: pd.DataFrame) -> set:
     """
     Finds the top 10 countries with the highest local_price.
     """
-    # Ordena el DataFrame por 'local_price' de mayor a menor
-    top_10 = df.sort_values(by='local_price', ascending=False).head(10)
+    # Selecciona las 10 filas con mayor 'local_price' sin ordenar toda la tabla
+    top_10 = _tabla(df).nlargest(10, 'local_price')
     
     # Extrae los nombres de los países y los convierte a un conjunto
     return set(top_10['name'])
@@ -156,23 +605,30 @@ def get_median(df: pd.DataFrame) -> float:
     """
     Calculates the median dollar_price for entries from July 2024.
     """
-    # Copia para evitar SettingWithCopyWarning
-    df_copy = df.copy()
-    
-    # Convierte la columna 'date' a formato de fecha para poder filtrar
-    df_copy['date'] = pd.to_datetime(df_copy['date'])
-    
-    # Filtra las filas para quedarte solo con las de julio de 2024
-    july_2024_df = df_copy[df_copy['date'].dt.strftime('%Y-%m') == '2024-07']
+    # Con el conjunto preprocesado, la mediana mensual ya está calculada
+    if isinstance(df, BigMacDataset):
+        return df.mediana_dolar('2024-07')
+
+    # Filtra julio de 2024 comparando fechas, sin formatear cada fila como
+    # texto; 'date' solo se convierte si todavía no es de tipo fecha
+    tabla = _tabla(df)
+    fechas = tabla['date']
+    if not pd.api.types.is_datetime64_any_dtype(fechas):
+        fechas = pd.to_datetime(fechas)
+    julio_2024 = (fechas >= '2024-07-01') & (fechas < '2024-08-01')
     
     # Calcula la mediana de la columna 'dollar_price' de los datos filtrados
-    return july_2024_df['dollar_price'].median()
+    return tabla.loc[julio_2024, 'dollar_price'].median()
 
 # Mean adjusted prices for a given country
 def get_mean_adj_price(df: pd.DataFrame, country: str) -> float:
     """
     Calculates the mean adjusted price for a specific country.
     """
+    # Con el conjunto preprocesado, la media por país ya está calculada
+    if isinstance(df, BigMacDataset):
+        return float(df.media_adj_por_pais.get(country, np.nan))
+
     # Filtra el DataFrame para obtener solo las filas del país especificado
     country_df = df[df['name'] == country]
     
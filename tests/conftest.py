@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+"""
+Configuración común de las pruebas: la raíz del repositorio en 'sys.path',
+matplotlib sin pantalla y 'tarea 3.py' (su nombre tiene un espacio) cargado
+como módulo.
+"""
+import importlib.util
+import os
+import sys
+
+import matplotlib
+import pytest
+
+matplotlib.use('Agg')
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+
+
+@pytest.fixture(scope='session')
+def tarea3():
+    spec = importlib.util.spec_from_file_location('tarea3', os.path.join(RAIZ, 'tarea 3.py'))
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return modulo
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""Pruebas de la caché de escenarios de 'CacheCode.py'."""
+from ModelCode import DOMINIOS_BIENES, equilibrio_mercado_bienes
+from CacheCode import (CacheEscenarios, CacheLRU, cuantizar, opciones_imagen,
+                       precalcular_equilibrios, precalcular_imagenes)
+
+
+def test_cuantizar():
+    assert cuantizar((100, 0.1, 50, -50), DOMINIOS_BIENES) == (0, 0, 0, 0)
+    assert cuantizar((210, 0.25, 150, 100), DOMINIOS_BIENES) == (11, 3, 10, 15)
+    assert cuantizar((205, 0.25, 150, 100), DOMINIOS_BIENES) is None   # fuera de paso
+    assert cuantizar((310, 0.25, 150, 100), DOMINIOS_BIENES) is None   # fuera de rango
+
+
+def test_lru_respeta_el_presupuesto():
+    lru = CacheLRU(max_bytes=250)
+    for j in range(5):
+        lru.guardar(j, b'x' * 100)
+    assert lru.obtener(0) is None and lru.obtener(4) == b'x' * 100
+    assert lru.estadisticas()['bytes'] <= 250
+
+
+def test_equilibrio_en_memoria():
+    cache = CacheEscenarios('bienes')
+    estado = (210, 0.25, 150, 100)
+    esperado = {v: float(a) for v, a in equilibrio_mercado_bienes(*estado).items()}
+    assert cache.equilibrio(estado) == esperado
+    assert cache.equilibrio(estado) == esperado
+    assert cache.calculos == 1
+    # Un estado fuera de la malla se calcula siempre.
+    cache.equilibrio((205, 0.25, 150, 100))
+    cache.equilibrio((205, 0.25, 150, 100))
+    assert cache.calculos == 3
+
+
+def test_imagenes_separadas_por_opciones():
+    cache = CacheEscenarios('dinero')
+    estado = (150, 800, 1.0)
+    a, b = opciones_imagen(dpi=100), opciones_imagen(dpi=150)
+    cache.guardar_imagen(estado, b'png-100', a)
+    assert cache.obtener_imagen(estado, a) == b'png-100'
+    assert cache.obtener_imagen(estado, b) is None
+    assert cache.obtener_imagen(estado, opciones_imagen(dpi=100, formato='svg')) is None
+
+
+def test_almacen_en_disco(tmp_path):
+    opciones = opciones_imagen(dpi=72)
+    estados = [(150, 800, 1.0), (160, 800, 1.0)]
+    precalcular_equilibrios(tmp_path, 'dinero')
+    precalcular_imagenes(tmp_path, 'dinero', lambda e: repr(e).encode(), opciones, estados)
+
+    cache = CacheEscenarios('dinero', directorio=str(tmp_path))
+    assert cache.equilibrio((160, 800, 1.0))['i_eq'] == (0.5 * 800 - 160) / 10
+    assert cache.calculos == 0 and cache.aciertos_disco == 1
+    assert cache.obtener_imagen((160, 800, 1.0), opciones) == repr((160, 800, 1.0)).encode()
+    assert cache.obtener_imagen((170, 800, 1.0), opciones) is None
+    assert cache.obtener_imagen((160, 800, 1.0), opciones_imagen(dpi=100)) is None
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""Pruebas del motor sin interfaz de 'ModelCode.py'."""
+import numpy as np
+import pytest
+
+from ModelCode import (MODELO_PARAMS, C0_BASE, C1_BASE, calcular_modelo, crear_grafo_is_lm,
+                       equilibrio_is_lm, equilibrio_mercado_bienes, equilibrio_mercado_dinero,
+                       guardar_trayectoria, simular_ajuste)
+
+
+def test_equilibrio_bienes_cumple_y_igual_da():
+    g0, t1, i0, nx0 = np.array([100.0, 200, 300]), 0.25, 150.0, np.array([-50.0, 0, 200])
+    eq = equilibrio_mercado_bienes(g0, t1, i0, nx0)
+    A = C0_BASE + g0 + i0 + nx0
+    # En el equilibrio, Y = A + c1·(1 - t1)·Y.
+    np.testing.assert_allclose(eq['Y_eq'], A + C1_BASE * (1 - t1) * eq['Y_eq'])
+    np.testing.assert_allclose(eq['alpha'], 1 / (1 - C1_BASE * (1 - t1)))
+
+
+def test_equilibrio_dinero_cumple_lm():
+    Ms, Y, P = np.array([50.0, 150, 250]), 1000.0, np.array([[0.5], [2.0]])
+    eq = equilibrio_mercado_dinero(Ms, Y, P)
+    assert eq['i_eq'].shape == (2, 3)
+    np.testing.assert_allclose(0.5 * Y - 10 * eq['i_eq'], Ms / P)
+
+
+def test_calcular_modelo_vectorizado_igual_al_escalar():
+    rng = np.random.default_rng(0)
+    shock_demanda, shock_monetario = rng.uniform(-100, 100, 20), rng.uniform(-50, 50, 20)
+    i_star = rng.uniform(2, 8, 20)
+    lote = calcular_modelo(shock_demanda, shock_monetario, i_star)
+    for j in range(20):
+        uno = calcular_modelo(shock_demanda[j], shock_monetario[j], i_star[j])
+        for variable in ('Y', 'i', 'e', 'NX'):
+            assert lote[variable][j] == pytest.approx(float(uno[variable]), rel=1e-12)
+
+
+def test_calcular_modelo_con_parametros_arreglo():
+    # Cada escenario con su propia 'c1': matrices distintas por escenario.
+    c1 = np.array([0.5, 0.6, 0.7])
+    lote = calcular_modelo(10.0, 5.0, params={'c1': c1})
+    for j, valor in enumerate(c1):
+        uno = calcular_modelo(10.0, 5.0, params={'c1': valor})
+        assert lote['Y'][j] == pytest.approx(float(uno['Y']), rel=1e-12)
+
+
+def test_calcular_modelo_cumple_las_tres_ecuaciones():
+    p = MODELO_PARAMS
+    r = calcular_modelo(30.0, -20.0, 6.0)
+    Y, i, e = float(r['Y']), float(r['i']), float(r['e'])
+    DA = (p['c0'] + p['c1'] * (1 - p['t1']) * Y + p['I0'] - p['b'] * i + p['G'] + 30.0
+          + p['nx0'] + p['n'] * e - p['m'] * Y)
+    assert Y == pytest.approx(DA)
+    assert (p['Ms'] - 20.0) / p['P'] == pytest.approx(p['k'] * Y - p['h'] * i)
+    assert e == pytest.approx(p['e_esperado'] - (i - 6.0) / p['phi'])
+
+
+def test_calcular_modelo_rechaza_parametros_desconocidos():
+    with pytest.raises(KeyError):
+        calcular_modelo(params={'no_existe': 1.0})
+
+
+def test_simular_ajuste_converge_al_equilibrio():
+    shock_demanda, shock_monetario = np.array([50.0, 0.0, -30.0]), np.array([0.0, 50.0, 20.0])
+    final = calcular_modelo(shock_demanda, shock_monetario)
+    for estado in simular_ajuste(shock_demanda, shock_monetario, pasos=5000, tolerancia=1e-10):
+        pass
+    np.testing.assert_allclose(estado['Y'], final['Y'], rtol=1e-6)
+    np.testing.assert_allclose(estado['e'], final['e'], rtol=1e-6)
+    np.testing.assert_allclose(estado['i'], final['i'], atol=1e-6)
+
+
+def test_simular_ajuste_paso_cero_es_el_punto_a():
+    base = calcular_modelo()
+    inicial = next(simular_ajuste(shock_monetario=50.0, i_star=7.0))
+    assert inicial['t'] == 0
+    assert float(inicial['Y']) == pytest.approx(float(base['Y']))
+    assert float(inicial['i']) == pytest.approx(float(base['i']))
+    assert float(inicial['diferencial']) == pytest.approx(float(base['i']) - MODELO_PARAMS['i_star'])
+
+
+def test_simular_ajuste_con_parametros_arreglo():
+    c1 = np.array([0.5, 0.7])
+    for estado in simular_ajuste(20.0, params={'c1': c1}, pasos=5000, tolerancia=1e-10):
+        pass
+    assert estado['Y'].shape == (2,)
+    np.testing.assert_allclose(estado['Y'], calcular_modelo(20.0, params={'c1': c1})['Y'], rtol=1e-6)
+
+
+def test_guardar_trayectoria_rellena_con_nan_tras_la_parada(tmp_path):
+    escritos = guardar_trayectoria(tmp_path, simular_ajuste(10.0, pasos=500, tolerancia=1e-3), 500)
+    Y = np.load(tmp_path / 'Y.npy')
+    assert Y.shape == (501,)
+    assert np.isfinite(Y[:escritos]).all() and np.isnan(Y[escritos:]).all()
+
+
+def test_grafo_is_lm_recalcula_solo_lo_afectado():
+    grafo = crear_grafo_is_lm()
+    eq = equilibrio_is_lm(200, 0.2, 150, 100, 150, 1.0)
+    assert grafo['Y_eq'] == pytest.approx(float(eq['Y_eq']))
+    for nodo in ('curva_IS', 'curva_LM', 'curva_DA', 'curva_Md'):
+        grafo[nodo]
+    antes = dict(grafo.evaluaciones)
+
+    afectados = grafo.asignar(P=2.0)
+    assert 'alpha' not in afectados and 'curva_IS' not in afectados
+    for nodo in ('curva_IS', 'curva_LM', 'curva_DA', 'curva_Md'):
+        grafo[nodo]
+    recalculados = {n for n, veces in grafo.evaluaciones.items() if veces > antes[n]}
+    assert recalculados == afectados - {'P'}
+    assert grafo['i_eq'] == pytest.approx(float(equilibrio_is_lm(200, 0.2, 150, 100, 150, 2.0)['i_eq']))
+    # Asignar el mismo valor no invalida nada.
+    assert grafo.asignar(P=2.0) == set()
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas del despacho HTTP de 'ServerCode.py'. Las rutas de equilibrios no
+usan el pool de render, así que se prueban sin abrir el socket.
+"""
+import asyncio
+import json
+
+import numpy as np
+import pytest
+
+from ModelCode import equilibrio_mercado_bienes, equilibrio_mercado_dinero
+from ServerCode import CUERPO_EN_HILO, ServidorEquilibrios, _estado
+
+
+def _despachar(servidor, metodo, objetivo, cuerpo=b''):
+    return asyncio.run(servidor._despachar(metodo, objetivo, cuerpo))
+
+
+def test_estado_completa_con_los_valores_iniciales():
+    assert _estado('dinero', {'Ms': 100}) == (100.0, 800.0, 1.0)
+    assert _estado('dinero', [100, 900, 2]) == (100.0, 900.0, 2.0)
+    with pytest.raises(ValueError):
+        _estado('dinero', {'G': 1})
+    with pytest.raises(ValueError):
+        _estado('dinero', [1, 2])
+    with pytest.raises(ValueError):
+        _estado('dinero', {'P': float('nan')})
+
+
+def test_get_json_y_binario():
+    servidor = ServidorEquilibrios()
+    codigo, tipo, datos, _ = _despachar(servidor, 'GET', '/equilibrio/dinero?Ms=100&Y=900')
+    assert codigo == 200 and tipo == 'application/json'
+    assert json.loads(datos)['i_eq'] == pytest.approx(float(equilibrio_mercado_dinero(100, 900, 1)['i_eq']))
+
+    codigo, _, datos, cabeceras = _despachar(servidor, 'GET', '/equilibrio/bienes?g0=250&formato=binario&dtype=float32')
+    assert codigo == 200 and cabeceras['X-Variables'] == 'alpha,A,Y_eq'
+    valores = np.frombuffer(datos, dtype='<f4').reshape(1, 3)
+    assert valores[0, 2] == pytest.approx(float(equilibrio_mercado_bienes(250, 0.2, 150, 100)['Y_eq']), rel=1e-6)
+
+
+def test_post_lote():
+    servidor = ServidorEquilibrios()
+    cuerpo = json.dumps({'estados': [{'g0': 200}, [210, 0.2, 150, 100]]}).encode()
+    codigo, _, datos, _ = _despachar(servidor, 'POST', '/equilibrio/bienes', cuerpo)
+    assert codigo == 200
+    respuesta = json.loads(datos)
+    esperado = equilibrio_mercado_bienes(np.array([200, 210]), 0.2, 150, 100)['Y_eq']
+    np.testing.assert_allclose(np.array(respuesta['valores'])[:, 2], esperado)
+
+
+def test_lote_grande_se_coalesce_y_resuelve_fuera_del_loop():
+    servidor = ServidorEquilibrios()
+    estados = [[100 + j % 200, 800, 1.0] for j in range(20_000)]
+    cuerpo = json.dumps(estados).encode()
+    assert len(cuerpo) >= CUERPO_EN_HILO
+
+    async def dos_iguales():
+        return await asyncio.gather(*(servidor._despachar('POST', '/equilibrio/dinero?formato=binario', cuerpo)
+                                      for _ in range(2)))
+
+    (codigo, _, datos, cabeceras), segundo = asyncio.run(dos_iguales())
+    assert codigo == 200 and segundo[2] == datos
+    assert servidor.contadores['coalescidas'] == 1
+    valores = np.frombuffer(datos, dtype='<f8').reshape(len(estados), 2)
+    Ms = np.array([e[0] for e in estados], dtype=float)
+    np.testing.assert_allclose(valores[:, 1], equilibrio_mercado_dinero(Ms, 800, 1.0)['i_eq'])
+
+
+@pytest.mark.filterwarnings('ignore:divide by zero')
+@pytest.mark.parametrize('metodo, objetivo, cuerpo', [
+    ('GET', '/equilibrio/dinero?P=0', b''),
+    ('GET', '/equilibrio/dinero?P=inf', b''),
+    ('POST', '/equilibrio/dinero', b'[[100, 800, 1], [100, 800, 0]]'),
+    ('POST', '/equilibrio/dinero', b'{"estados": [[100, 800, NaN]]}'),
+    ('POST', '/equilibrio/dinero', b'{no es json'),
+    ('GET', '/equilibrio/dinero?G=1', b''),
+])
+def test_entradas_invalidas_o_no_finitas_devuelven_400(metodo, objetivo, cuerpo):
+    codigo, tipo, datos, _ = _despachar(ServidorEquilibrios(), metodo, objetivo, cuerpo)
+    assert codigo == 400 and tipo == 'application/json'
+    assert 'error' in json.loads(datos)
+
+
+def test_rutas_y_metodos():
+    servidor = ServidorEquilibrios()
+    assert _despachar(servidor, 'GET', '/otra/cosa')[0] == 404
+    assert _despachar(servidor, 'DELETE', '/equilibrio/bienes')[0] == 405
+    assert _despachar(servidor, 'POST', '/imagen/bienes')[0] == 405
+    codigo, _, datos, _ = _despachar(servidor, 'GET', '/estadisticas')
+    assert codigo == 200 and json.loads(datos)['contadores']['solicitudes'] == 4
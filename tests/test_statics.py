@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""Pruebas de la estática comparativa de 'StaticsCode.py'."""
+import numpy as np
+import pytest
+
+from ModelCode import B_BASE, H_BASE, K_BASE, equilibrio_is_lm
+from StaticsCode import (cargar_sensibilidades, corte, estatica_comparativa,
+                         guardar_sensibilidades)
+
+
+@pytest.mark.parametrize('modelo, ejes', [('bienes', ['g0', 't1']), ('dinero', ['Ms', 'P'])])
+def test_derivadas_analiticas_igual_a_diferencias_finitas(modelo, ejes):
+    analitico = estatica_comparativa(modelo, ejes=ejes, metodo='analitico')
+    numerico = estatica_comparativa(modelo, ejes=ejes, metodo='numerico')
+    for variable, por_parametro in analitico['derivadas'].items():
+        for parametro, derivada in por_parametro.items():
+            escala = np.max(np.abs(derivada)) + 1.0
+            np.testing.assert_allclose(numerico['derivadas'][variable][parametro], derivada,
+                                       atol=1e-6 * escala, err_msg=f"d{variable}/d{parametro}")
+
+
+def test_is_lm_numerico_igual_a_la_formula_cerrada():
+    r = estatica_comparativa('is_lm', ejes=['g0'])
+    alpha = float(equilibrio_is_lm(200, 0.2, 150, 100, 150, 1.0)['alpha'])
+    esperado = alpha / (1 + alpha * B_BASE * K_BASE / H_BASE)
+    np.testing.assert_allclose(r['derivadas']['Y_eq']['g0'], esperado, rtol=1e-6)
+
+
+def test_niveles_y_forma_de_la_malla():
+    r = estatica_comparativa('dinero', ejes={'Ms': [100, 200], 'Y': [800, 1000, 1200]}, P=2.0)
+    assert r['niveles']['i_eq'].shape == (2, 3)
+    assert r['fijos']['P'] == 2.0
+    np.testing.assert_allclose(r['niveles']['Ms_real'][:, 0], [50, 100])
+    # Elasticidad = (dv/dx)·x/v.
+    np.testing.assert_allclose(r['elasticidades']['Ms_real']['Ms'], 1.0)
+    assert corte(r, r['niveles']['i_eq'], Ms=200).shape == (3,)
+
+
+def test_valores_fijos_no_escalares():
+    with pytest.raises(ValueError, match='ejes'):
+        estatica_comparativa('dinero', ejes=['Ms'], Y=np.array([1.0, 2.0]))
+
+
+def test_parametros_invalidos():
+    with pytest.raises(KeyError):
+        estatica_comparativa('dinero', ejes=['Ms'], no_existe=1.0)
+    with pytest.raises(ValueError):
+        estatica_comparativa('dinero', ejes=['Ms'], Ms=100.0)
+    with pytest.raises(ValueError):
+        estatica_comparativa('is_lm', metodo='analitico')
+
+
+def test_guardar_y_cargar_sensibilidades(tmp_path):
+    r = estatica_comparativa('bienes', ejes=['g0', 't1'])
+    ruta = tmp_path / 'bienes.npz'
+    guardar_sensibilidades(r, ruta)
+    leido = cargar_sensibilidades(ruta)
+    assert list(leido['ejes']) == ['g0', 't1'] and leido['fijos'] == r['fijos']
+    np.testing.assert_allclose(leido['niveles']['Y_eq'], r['niveles']['Y_eq'], rtol=1e-6)
+    np.testing.assert_allclose(leido['derivadas']['Y_eq']['t1'], r['derivadas']['Y_eq']['t1'], rtol=1e-6)
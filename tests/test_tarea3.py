@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""Pruebas de las rutinas de 'tarea 3.py' (fixture 'tarea3' en conftest.py)."""
+import numpy as np
+import pytest
+
+
+# ----------------------------------------------
+# Ejercicio 1: reducciones por bloques
+# ----------------------------------------------
+@pytest.mark.parametrize('orden', ['C', 'F'])
+def test_resumen_archivo_igual_a_numpy(tarea3, tmp_path, orden):
+    rng = np.random.default_rng(0)
+    datos = np.asarray(rng.normal(316.8, 50.0, size=(301, 7)), order=orden)
+    ruta = str(tmp_path / 'datos.npy')
+    np.save(ruta, datos)
+    resumen = tarea3.resumen_archivo(ruta, tam_bloque=100)
+    assert resumen['n'] == datos.size
+    assert resumen['media'] == pytest.approx(datos.mean(), rel=1e-13)
+    assert resumen['varianza'] == pytest.approx(datos.var(), rel=1e-12)
+    assert (resumen['minimo'], resumen['maximo']) == (datos.min(), datos.max())
+    assert tarea3.load_mean(ruta) == pytest.approx(datos.mean(), rel=1e-13)
+
+
+def test_resumen_archivo_vacio(tarea3, tmp_path):
+    ruta = str(tmp_path / 'vacio.npy')
+    np.save(ruta, np.zeros(0))
+    resumen = tarea3.resumen_archivo(ruta)
+    assert resumen['n'] == 0 and np.isnan(resumen['media'])
+
+
+def test_resumen_archivos_acepta_iteradores(tarea3, tmp_path):
+    rutas = []
+    for j in range(3):
+        rutas.append(str(tmp_path / f'd{j}.npy'))
+        np.save(rutas[-1], np.arange(10.0) + j)
+    resumenes = tarea3.resumen_archivos(iter(rutas), n_hilos=2)
+    assert list(resumenes) == rutas
+    assert [r['media'] for r in resumenes.values()] == [4.5, 5.5, 6.5]
+
+
+# ----------------------------------------------
+# Ejercicio 2: OLS por bloques
+# ----------------------------------------------
+def _regresion(n=1003, k=4, m=None, semilla=0):
+    rng = np.random.default_rng(semilla)
+    X = rng.normal(size=(n, k))
+    columnas = 1 if m is None else m
+    beta = rng.normal(size=(k + 1, columnas))
+    Y = beta[0] + X @ beta[1:] + rng.normal(scale=0.5, size=(n, columnas))
+    return X, (Y[:, 0] if m is None else Y)
+
+
+def _lstsq(X, y):
+    return np.linalg.lstsq(np.column_stack((np.ones(len(X)), X)), y, rcond=None)[0]
+
+
+@pytest.mark.parametrize('tam_bloque', [1003, 100, 17, 5000])   # divide o no a n
+@pytest.mark.parametrize('n_hilos', [1, 3])
+def test_ols_streaming_igual_a_lstsq(tarea3, tam_bloque, n_hilos):
+    X, y = _regresion()
+    beta = tarea3.ols_streaming(X, y, tam_bloque=tam_bloque, n_hilos=n_hilos)
+    assert beta.shape == (5,)
+    np.testing.assert_allclose(beta, _lstsq(X, y), rtol=1e-10, atol=1e-12)
+
+
+@pytest.mark.parametrize('n_hilos', [1, 2])
+def test_ols_streaming_varias_dependientes(tarea3, n_hilos):
+    X, Y = _regresion(n=500, k=3, m=3)
+    beta = tarea3.ols_streaming(X, Y, tam_bloque=64, n_hilos=n_hilos)
+    assert beta.shape == (4, 3)
+    np.testing.assert_allclose(beta, _lstsq(X, Y), rtol=1e-10, atol=1e-12)
+    # Cada columna coincide con su regresión por separado.
+    np.testing.assert_allclose(beta[:, 1], tarea3.ols_streaming(X, Y[:, 1], tam_bloque=64),
+                               rtol=1e-10, atol=1e-12)
+
+
+def test_ols_streaming_desde_archivos(tarea3, tmp_path):
+    X, y = _regresion(n=300, k=2)
+    np.save(tmp_path / 'X.npy', X)
+    np.save(tmp_path / 'y.npy', y)
+    beta = tarea3.ols_streaming(str(tmp_path / 'X.npy'), str(tmp_path / 'y.npy'), tam_bloque=64)
+    np.testing.assert_allclose(beta, _lstsq(X, y), rtol=1e-10, atol=1e-12)
+
+
+def test_ols_estimation_mantiene_la_forma_de_y(tarea3):
+    X, y = _regresion(n=200, k=3)
+    beta = tarea3.ols_estimation(X, y[:, None])
+    assert beta.shape == (4, 1)
+    np.testing.assert_allclose(beta[:, 0], _lstsq(X, y), rtol=1e-10, atol=1e-12)
+
+
+def test_ols_streaming_rechaza_tamanos_distintos(tarea3):
+    X, y = _regresion(n=100, k=2)
+    with pytest.raises(ValueError):
+        tarea3.ols_streaming(X, y[:-1])
+
+
+# ----------------------------------------------
+# Ejercicio 3: Monte Carlo de Curry
+# ----------------------------------------------
+def test_simular_puntos_curry_valida_argumentos(tarea3):
+    with pytest.raises(ValueError):
+        tarea3.simular_puntos_curry(num_simulaciones=0)
+
+
+# ----------------------------------------------
+# Ejercicio 4: mapa logístico
+# ----------------------------------------------
+def test_stable_values_punto_fijo_y_ciclos(tarea3):
+    np.testing.assert_array_equal(tarea3.stable_values(2.5), [0.6])
+    assert len(tarea3.stable_values(3.2)) == 2
+    assert len(tarea3.stable_values(3.5)) == 4
+    assert len(tarea3.stable_values(3.9)) > 50   # caos: la cola completa
+
+
+def test_stable_values_escalar_igual_al_lote(tarea3):
+    r = np.linspace(2.5, 4.0, 61)
+    lote = tarea3.stable_values(r)
+    for r_j, valores in zip(r, lote):
+        np.testing.assert_array_equal(tarea3.stable_values(float(r_j)), valores)
+
+
+def test_stable_values_sin_valores_tras_el_transitorio(tarea3):
+    assert tarea3.stable_values(3.2, n=100).size == 0
+    assert all(v.size == 0 for v in tarea3.stable_values([3.2, 3.9], n=150))
+
+
+def test_atractores_logisticos_periodos(tarea3):
+    resultado = tarea3.atractores_logisticos([2.5, 3.2, 3.5, 3.9], max_iter=2000)
+    np.testing.assert_array_equal(resultado['periodo'], [1, 2, 4, 0])
+    conteos = np.diff(resultado['desplazamientos'])
+    np.testing.assert_array_equal(conteos[:3], [1, 2, 4])
+    r, x = tarea3.puntos_bifurcacion(resultado)
+    assert r.shape == x.shape == (conteos.sum(),)
+    # Los puntos del ciclo de periodo 2 se mapean entre sí.
+    ciclo = resultado['valores'][resultado['desplazamientos'][1]:resultado['desplazamientos'][2]]
+    np.testing.assert_allclose(np.sort(3.2 * ciclo * (1 - ciclo)), np.sort(ciclo), atol=1e-8)
+
+
+# ----------------------------------------------
+# Ejercicio 5: índice Big Mac
+# ----------------------------------------------
+def _bigmac():
+    import pandas as pd
+    return pd.DataFrame({
+        'name': ['Chile', 'Perú', 'Chile', 'Argentina', 'Chile', 'Perú', 'Argentina', 'Brasil'],
+        # Chile repite el mes 2024-07 (dos observaciones el mismo mes).
+        'date': ['2024-07-01', '2024-07-01', '2024-07-15', '2024-01-01',
+                 '2024-01-01', '2024-01-01', '2024-07-01', '2024-07-01'],
+        'local_price': [4200.0, 14.5, 4300.0, 3000.0, np.nan, 13.9, 6500.0, 22.9],
+        'dollar_price': [4.5, 3.9, np.nan, 3.3, 4.4, 3.7, 4.9, 4.2],
+        'adj_price': [4.1, 3.5, 4.2, np.nan, 4.0, 3.6, np.nan, 4.3],
+    })
+
+
+def _consultas(tarea3, datos):
+    return (tarea3.get_number_unique_countries(datos), tarea3.get_top10_local_price(datos),
+            tarea3.get_median(datos),
+            [tarea3.get_mean_adj_price(datos, pais) for pais in ('Chile', 'Perú', 'Argentina', 'Uruguay')])
+
+
+def _iguales(a, b):
+    # Compara las respuestas de las consultas tratando NaN como igual a NaN.
+    n_a, top_a, mediana_a, medias_a = a
+    n_b, top_b, mediana_b, medias_b = b
+    assert n_a == n_b and top_a == top_b
+    np.testing.assert_allclose([mediana_a] + medias_a, [mediana_b] + medias_b, equal_nan=True)
+
+
+def test_bigmac_consultas_igual_en_dataframe_y_conjunto(tarea3):
+    import pandas as pd
+    df = _bigmac()
+    conjunto = tarea3.BigMacDataset(df)
+    _iguales(_consultas(tarea3, df), _consultas(tarea3, conjunto))
+    # El conjunto no modifica el DataFrame original.
+    pd.testing.assert_frame_equal(df, _bigmac())
+    assert len(conjunto.filas('Chile', '2024-07')) == 2
+
+
+def test_bigmac_guardar_y_cargar(tarea3, tmp_path):
+    import pandas as pd
+    pytest.importorskip('pyarrow')
+    original = tarea3.BigMacDataset(_bigmac())
+    ruta = str(tmp_path / 'bigmac.parquet')
+    original.guardar(ruta)
+    cargado = tarea3.BigMacDataset.cargar(ruta)
+
+    pd.testing.assert_frame_equal(cargado.df, original.df)
+    pd.testing.assert_frame_equal(cargado.por_pais_mes, original.por_pais_mes)
+    pd.testing.assert_series_equal(cargado.media_adj_por_pais, original.media_adj_por_pais)
+    pd.testing.assert_series_equal(cargado.mediana_dolar_por_mes, original.mediana_dolar_por_mes)
+    assert cargado.n_paises == original.n_paises
+    pd.testing.assert_frame_equal(cargado.filas('Chile', '2024-07'), original.filas('Chile', '2024-07'))
+    _iguales(_consultas(tarea3, cargado), _consultas(tarea3, _bigmac()))